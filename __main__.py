@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Flaches Layout: domain/, application/, infrastructure/ liegen direkt neben
+# dieser Datei und werden absolut importiert (wie in main.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main  # noqa: E402
+
+sys.exit(main())
@@ -1,13 +1,48 @@
-from typing import List
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from itertools import islice
+from typing import AsyncIterator, Callable, Deque, Iterable, Iterator, List, Optional, Set
 from application.interfaces import (
+    IAsyncAnredeGenerator,
+    IAsyncContactEnricher,
+    IAsyncGenderDetector,
+    IAsyncLanguageDetector,
+    IContactEnricher,
     INameParser,
     IGenderDetector,
     ILanguageDetector,
     IAnredeGenerator,
     IHistoryRepository,
     IContactService,
+    ITracer,
 )
+from application.metrics import MetricsRegistry
+from application.tracing import NULL_TRACER
 from domain.contact import Contact
+from domain.contact_batch import ContactBatch
+
+# Parse-Funktion des aktuellen Worker-Prozesses (über den Initializer gesetzt)
+_worker_parse: Optional[Callable[[str], Contact]] = None
+
+
+def _init_parse_worker(parse_fn: Callable[[str], Contact]) -> None:
+    """Wird einmal pro Worker-Prozess ausgeführt und merkt sich die Parse-Funktion."""
+    global _worker_parse
+    _worker_parse = parse_fn
+
+
+def _parse_chunk(chunk: List[str]) -> List[Contact]:
+    return [_worker_parse(raw) for raw in chunk]
+
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 class ContactService(IContactService):
@@ -19,31 +54,272 @@ class ContactService(IContactService):
         anrede_generator: IAnredeGenerator,
         history_repo: IHistoryRepository,
         history_size: int = 10,
+        enricher: Optional[IContactEnricher] = None,
+        async_gender_detector: Optional[IAsyncGenderDetector] = None,
+        async_language_detector: Optional[IAsyncLanguageDetector] = None,
+        async_anrede_generator: Optional[IAsyncAnredeGenerator] = None,
+        async_enricher: Optional[IAsyncContactEnricher] = None,
+        tracer: Optional[ITracer] = None,
+        metrics: Optional[MetricsRegistry] = None,
     ):
+        """
+        :param enricher: optionaler Kombi-Erkenner; wird genutzt, sobald
+            mehr als eines der Felder Geschlecht/Sprache/Briefanrede fehlt.
+        :param async_*: optionale async-Varianten für aprocess_many; fehlt
+            eine, läuft das synchrone Gegenstück in einem Worker-Thread.
+        :param tracer: misst die Schritte als Spans "process.parse",
+            "process.enrich", "process.gender", "process.language",
+            "process.briefanrede", "process.validate" (Standard: aus)
+        :param metrics: zählt verarbeitete Kontakte, Kontakte mit
+            Parser-Hinweisen und needs_review (Standard: keine Zählung)
+        """
         self.name_parser = name_parser
         self.gender_detector = gender_detector
         self.language_detector = language_detector
         self.anrede_generator = anrede_generator
         self.history_repo = history_repo
         self.history_size = history_size
+        self.enricher = enricher
+        self.async_gender_detector = async_gender_detector
+        self.async_language_detector = async_language_detector
+        self.async_anrede_generator = async_anrede_generator
+        self.async_enricher = async_enricher
+        self.tracer = tracer or NULL_TRACER
+        self.metrics = metrics
+        if metrics is not None:
+            self._contacts_total = metrics.counter(
+                "kontaktsplitter_contacts_total", "Verarbeitete Kontakte"
+            )
+            self._parse_warnings_total = metrics.counter(
+                "kontaktsplitter_contacts_parse_warnings_total",
+                "Kontakte mit Hinweisen des Parsers (z. B. Titel im Namen)",
+            )
+            self._needs_review_total = metrics.counter(
+                "kontaktsplitter_contacts_needs_review_total",
+                "Kontakte, die manuell geprüft werden müssen",
+            )
 
     def process(self, raw_input: str) -> Contact:
-        # 1) Parsing
-        contact = self.name_parser.parse(raw_input)
+        with self.tracer.span("process"):
+            # 1) Parsing
+            with self.tracer.span("process.parse"):
+                contact = self.name_parser.parse(raw_input)
+            return self._enrich(contact)
 
-        # 2) Geschlecht
+    def process_many(
+        self,
+        raw_inputs: Iterable[str],
+        workers: int | None = None,
+        chunksize: int = 256,
+        ordered: bool = True,
+    ) -> Iterator[Contact]:
+        """
+        Verarbeitet viele Roh-Strings als Stream.
+        - Das reine Parsing läuft in Chunks auf einem ProcessPoolExecutor;
+          die Parse-Funktion (inkl. kompilierter Titel) wird einmal pro
+          Worker übertragen, nicht pro Eintrag.
+        - Erkennung/Briefanrede laufen im aufrufenden Prozess.
+        - ordered=False liefert Ergebnisse in Fertigstellungs-Reihenfolge.
+        - workers=1 verarbeitet ohne Prozesspool.
+        Mit Prozesspool wird das Parsing in den Workern nicht als Span
+        gemessen, die übrigen Schritte schon.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            for raw in raw_inputs:
+                yield self.process(raw)
+            return
+
+        # Prozesspool nur bei Bedarf importieren (Startzeit des Einzelbetriebs)
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = _chunked(raw_inputs, max(1, chunksize))
+        # Begrenzte Anzahl offener Chunks hält den Speicherbedarf konstant
+        max_pending = workers * 2
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_parse_worker,
+            initargs=(self.name_parser.parse_function(),),
+        ) as pool:
+            if ordered:
+                queue: Deque[Future] = deque()
+                for chunk in chunks:
+                    queue.append(pool.submit(_parse_chunk, chunk))
+                    if len(queue) >= max_pending:
+                        yield from self._enrich_all(queue.popleft().result())
+                while queue:
+                    yield from self._enrich_all(queue.popleft().result())
+            else:
+                pending: Set[Future] = set()
+                for chunk in chunks:
+                    pending.add(pool.submit(_parse_chunk, chunk))
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in done:
+                            yield from self._enrich_all(fut.result())
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        yield from self._enrich_all(fut.result())
+
+    def process_batch(
+        self,
+        raw_inputs: Iterable[str],
+        workers: int | None = None,
+        chunksize: int = 256,
+    ) -> ContactBatch:
+        """
+        Wie process_many, sammelt die Kontakte aber spaltenweise in einem
+        ContactBatch; die einzelnen Contact-Objekte werden sofort wieder frei.
+        """
+        return ContactBatch.from_contacts(
+            self.process_many(raw_inputs, workers=workers, chunksize=chunksize)
+        )
+
+    async def aprocess_many(
+        self,
+        raw_inputs: Iterable[str],
+        concurrency: int = 8,
+        ordered: bool = True,
+    ) -> AsyncIterator[Contact]:
+        """
+        Verarbeitet viele Roh-Strings mit nebenläufiger KI-Anreicherung.
+        Höchstens `concurrency` Kontakte sind gleichzeitig in Arbeit
+        (Semaphore); die Eingabe wird nur so weit gelesen, wie Ergebnisse
+        abgeholt werden.
+        """
+        import asyncio  # erst hier: synchrone Aufrufer zahlen den Import nicht
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(raw: str) -> Contact:
+            async with semaphore:
+                with self.tracer.span("process.parse"):
+                    contact = self.name_parser.parse(raw)
+                return await self._aenrich(contact)
+
+        max_pending = concurrency * 2
+        pending: Deque["asyncio.Task"] = deque()
+        try:
+            for raw in raw_inputs:
+                pending.append(asyncio.ensure_future(run(raw)))
+                if len(pending) < max_pending:
+                    continue
+                if ordered:
+                    yield await pending.popleft()
+                else:
+                    done, rest = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    pending = deque(rest)
+                    for task in done:
+                        yield task.result()
+            if ordered:
+                while pending:
+                    yield await pending.popleft()
+            else:
+                for task in asyncio.as_completed(pending):
+                    yield await task
+                pending.clear()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _enrich_all(self, contacts: List[Contact]) -> Iterator[Contact]:
+        for contact in contacts:
+            yield self._enrich(contact)
+
+    def _missing_fields(self, contact: Contact) -> List[str]:
+        missing = []
         if contact.geschlecht == "-" and contact.vorname:
-            contact.geschlecht = self.gender_detector.detect(contact)
+            missing.append("geschlecht")
+        if not contact.sprache:
+            missing.append("sprache")
+        if not contact.briefanrede:
+            missing.append("briefanrede")
+        return missing
+
+    def _enrich(self, contact: Contact) -> Contact:
+        tracer = self.tracer
+        # 1b) Kombinierte Erkennung, wenn mehrere Felder fehlen;
+        #     nicht gelieferte Felder fallen auf die Einzelschritte zurück
+        missing = self._missing_fields(contact)
+        if self.enricher is not None and len(missing) > 1:
+            with tracer.span("process.enrich"):
+                combined = self.enricher.enrich(contact)
+            for name in missing:
+                if name in combined:
+                    setattr(contact, name, combined[name])
+            missing = [name for name in missing if name not in combined]
+
+        # 2) Geschlecht
+        if "geschlecht" in missing:
+            with tracer.span("process.gender"):
+                contact.geschlecht = self.gender_detector.detect(contact)
 
         # 3) Sprache
-        if not contact.sprache:
-            contact.sprache = self.language_detector.detect(contact)
+        if "sprache" in missing:
+            with tracer.span("process.language"):
+                contact.sprache = self.language_detector.detect(contact)
 
         # 4) Briefanrede
-        if not contact.briefanrede:
-            contact.briefanrede = self.anrede_generator.generate(contact)
+        if "briefanrede" in missing:
+            with tracer.span("process.briefanrede"):
+                contact.briefanrede = self.anrede_generator.generate(contact)
+
+        with tracer.span("process.validate"):
+            return self._validate(contact)
+
+    async def _aenrich(self, contact: Contact) -> Contact:
+        # async-Gegenstück zu _enrich; gleiche Reihenfolge, Fallbacks und Spans
+        # (gemessen wird die Wanduhrzeit inkl. Warten auf andere Tasks)
+        import asyncio
+        tracer = self.tracer
+        missing = self._missing_fields(contact)
+        if len(missing) > 1 and (self.async_enricher or self.enricher):
+            with tracer.span("process.enrich"):
+                if self.async_enricher is not None:
+                    combined = await self.async_enricher.enrich(contact)
+                else:
+                    combined = await asyncio.to_thread(self.enricher.enrich, contact)
+            for name in missing:
+                if name in combined:
+                    setattr(contact, name, combined[name])
+            missing = [name for name in missing if name not in combined]
 
-        # 5) Feld-Validierung
+        if "geschlecht" in missing:
+            with tracer.span("process.gender"):
+                if self.async_gender_detector is not None:
+                    contact.geschlecht = await self.async_gender_detector.detect(contact)
+                else:
+                    contact.geschlecht = await asyncio.to_thread(
+                        self.gender_detector.detect, contact
+                    )
+
+        if "sprache" in missing:
+            with tracer.span("process.language"):
+                if self.async_language_detector is not None:
+                    contact.sprache = await self.async_language_detector.detect(contact)
+                else:
+                    contact.sprache = await asyncio.to_thread(
+                        self.language_detector.detect, contact
+                    )
+
+        if "briefanrede" in missing:
+            with tracer.span("process.briefanrede"):
+                if self.async_anrede_generator is not None:
+                    contact.briefanrede = await self.async_anrede_generator.generate(contact)
+                else:
+                    contact.briefanrede = await asyncio.to_thread(
+                        self.anrede_generator.generate, contact
+                    )
+
+        with tracer.span("process.validate"):
+            return self._validate(contact)
+
+    def _validate(self, contact: Contact) -> Contact:
+        # 5) Feld-Validierung; bis hier stammen Hinweise nur vom Parser
+        parse_warnings = bool(contact.inaccuracies)
         contact.review_fields.clear()
         if not contact.vorname:
             contact.inaccuracies.append("Vorname fehlt")
@@ -54,20 +330,42 @@ class ContactService(IContactService):
             contact.review_fields.append("nachname")
             contact.needs_review = True
 
+        if self.metrics is not None:
+            self._contacts_total.inc()
+            if parse_warnings:
+                self._parse_warnings_total.inc()
+            if contact.needs_review:
+                self._needs_review_total.inc()
         return contact
 
     def save_contact(self, contact: Contact) -> None:
+        # Aus der Historie geladene Kontakte werden überschrieben, nicht dupliziert
+        if self.update_contact(contact):
+            return
         self.history_repo.save(contact)
-        # Trimm auf max. history_size
-        hist = self.history_repo.list()
-        if len(hist) > self.history_size:
-            # älteste Einträge entfernen
-            excess = len(hist) - self.history_size
-            for _ in range(excess):
-                hist.pop(0)
-
-    def get_history(self) -> List[Contact]:
-        return self.history_repo.list()
+        # Trimm auf max. history_size (älteste Einträge entfernen)
+        self.history_repo.trim(self.history_size)
+
+    def update_contact(self, contact: Contact) -> bool:
+        """
+        Schreibt einen Kontakt aus der Historie zurück (über history_id).
+        Rückgabe False, wenn er nicht (mehr) gespeichert ist.
+        """
+        return contact.history_id is not None and self.history_repo.update(contact)
+
+    def save_contacts(self, contacts: Iterable[Contact]) -> None:
+        """Legt viele Kontakte gesammelt ab (z. B. nach einem Massenimport)."""
+        self.history_repo.save_many(contacts)
+        self.history_repo.trim(self.history_size)
+
+    def get_history(self, offset: int = 0, limit: Optional[int] = None) -> List[Contact]:
+        return self.history_repo.list(offset, limit)
+
+    def search_history(self, prefix: str, limit: int = 50) -> List[Contact]:
+        return self.history_repo.search(prefix, limit)
+
+    def history_count(self) -> int:
+        return self.history_repo.count()
 
     def regenerate_briefanrede(self, contact: Contact) -> None:
         contact.briefanrede = self.anrede_generator.generate(contact)
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
 from domain.contact import Contact
+from domain.contact_batch import ContactBatch
 
 
 class INameParser(ABC):
@@ -9,6 +10,13 @@ class INameParser(ABC):
         """Zerlegt den Roh-String in ein Contact-Objekt."""
         pass
 
+    def parse_function(self) -> Callable[[str], Contact]:
+        """
+        Liefert eine picklebare Parse-Funktion für Worker-Prozesse.
+        Standard: die gebundene parse-Methode (pickelt den ganzen Parser).
+        """
+        return self.parse
+
 
 class IGenderDetector(ABC):
     @abstractmethod
@@ -31,6 +39,44 @@ class IAnredeGenerator(ABC):
         pass
 
 
+class IContactEnricher(ABC):
+    @abstractmethod
+    def enrich(self, contact: Contact) -> Dict[str, str]:
+        """
+        Ermittelt 'geschlecht', 'sprache' und 'briefanrede' gemeinsam.
+        Nicht zuverlässig ermittelte Felder fehlen im Ergebnis.
+        """
+        pass
+
+
+class IAsyncGenderDetector(ABC):
+    @abstractmethod
+    async def detect(self, contact: Contact) -> str:
+        """async-Variante von IGenderDetector.detect."""
+        pass
+
+
+class IAsyncLanguageDetector(ABC):
+    @abstractmethod
+    async def detect(self, contact: Contact) -> str:
+        """async-Variante von ILanguageDetector.detect."""
+        pass
+
+
+class IAsyncAnredeGenerator(ABC):
+    @abstractmethod
+    async def generate(self, contact: Contact) -> str:
+        """async-Variante von IAnredeGenerator.generate."""
+        pass
+
+
+class IAsyncContactEnricher(ABC):
+    @abstractmethod
+    async def enrich(self, contact: Contact) -> Dict[str, str]:
+        """async-Variante von IContactEnricher.enrich."""
+        pass
+
+
 class IHistoryRepository(ABC):
     @abstractmethod
     def save(self, contact: Contact) -> None:
@@ -38,10 +84,44 @@ class IHistoryRepository(ABC):
         pass
 
     @abstractmethod
-    def list(self) -> List[Contact]:
-        """Gibt alle gespeicherten Kontakte zurück."""
+    def list(self, offset: int = 0, limit: Optional[int] = None) -> List[Contact]:
+        """Gibt gespeicherte Kontakte (älteste zuerst) seitenweise zurück."""
+        pass
+
+    @abstractmethod
+    def update(self, contact: Contact) -> bool:
+        """
+        Überschreibt den gespeicherten Eintrag mit contact.history_id.
+        Rückgabe False, wenn es ihn nicht (mehr) gibt.
+        """
+        pass
+
+    @abstractmethod
+    def trim(self, max_size: int) -> None:
+        """Entfernt die ältesten Einträge, bis höchstens max_size übrig sind."""
         pass
 
+    def save_many(self, contacts: Iterable[Contact]) -> None:
+        """Speichert mehrere Kontakte; Standard: einzeln über save()."""
+        for contact in contacts:
+            self.save(contact)
+
+    def search(self, prefix: str, limit: int = 50) -> List[Contact]:
+        """
+        Kontakte, deren Nach- oder Vorname mit `prefix` beginnt.
+        Standard: lineare Suche über list(); Repositories mit Index überschreiben das.
+        """
+        key = prefix.casefold()
+        hits = [
+            c
+            for c in self.list()
+            if c.nachname.casefold().startswith(key) or c.vorname.casefold().startswith(key)
+        ]
+        return hits[:limit]
+
+    def count(self) -> int:
+        return len(self.list())
+
 
 class IContactService(ABC):
     @abstractmethod
@@ -49,14 +129,55 @@ class IContactService(ABC):
         """Zerlegt und erkennt alle Felder eines Kontakts."""
         pass
 
+    @abstractmethod
+    def process_many(
+        self,
+        raw_inputs: Iterable[str],
+        workers: int | None = None,
+        chunksize: int = 256,
+        ordered: bool = True,
+    ) -> Iterator[Contact]:
+        """Verarbeitet viele Roh-Strings und liefert die Kontakte als Stream."""
+        pass
+
+    @abstractmethod
+    def process_batch(
+        self,
+        raw_inputs: Iterable[str],
+        workers: int | None = None,
+        chunksize: int = 256,
+    ) -> ContactBatch:
+        """Verarbeitet viele Roh-Strings in einen kompakten ContactBatch."""
+        pass
+
     @abstractmethod
     def save_contact(self, contact: Contact) -> None:
         """Legt den Kontakt in der Historie ab."""
         pass
 
     @abstractmethod
-    def get_history(self) -> List[Contact]:
-        """Listet alle historisch gespeicherten Kontakte."""
+    def update_contact(self, contact: Contact) -> bool:
+        """Schreibt Änderungen an einem Kontakt aus der Historie zurück."""
+        pass
+
+    @abstractmethod
+    def save_contacts(self, contacts: Iterable[Contact]) -> None:
+        """Legt mehrere Kontakte gesammelt in der Historie ab."""
+        pass
+
+    @abstractmethod
+    def get_history(self, offset: int = 0, limit: Optional[int] = None) -> List[Contact]:
+        """Listet historisch gespeicherte Kontakte (seitenweise)."""
+        pass
+
+    @abstractmethod
+    def search_history(self, prefix: str, limit: int = 50) -> List[Contact]:
+        """Sucht in der Historie nach Vor-/Nachnamen-Präfix."""
+        pass
+
+    @abstractmethod
+    def history_count(self) -> int:
+        """Anzahl der Kontakte in der Historie."""
         pass
 
     @abstractmethod
@@ -91,7 +212,42 @@ class ITitleRepository(ABC):
         """Entfernt einen Titel; Rückgabe True, wenn vorhanden."""
         pass
 
+    def add_many(self, titles: Iterable[Tuple[str, str]]) -> int:
+        """Fügt mehrere Titel hinzu; Rückgabe: Anzahl geänderter Einträge."""
+        return sum(self.add(langform, kurzform) for langform, kurzform in titles)
+
     @abstractmethod
     def reset_to_defaults(self) -> None:
         """Setzt alle Titel auf die Standardwerte zurück."""
         pass
+
+
+class ITracer(ABC):
+    """Zeitmessung einzelner Verarbeitungsschritte (siehe application.tracing)."""
+
+    enabled: bool = False
+
+    @abstractmethod
+    def span(self, name: str) -> ContextManager:
+        """Kontextmanager, der die Dauer des with-Blocks unter `name` misst."""
+        pass
+
+    @abstractmethod
+    def record(self, name: str, seconds: float) -> None:
+        """Verbucht eine extern gemessene Dauer."""
+        pass
+
+    def flush(self) -> None:
+        """Gibt gepufferte Messwerte an die Sinks weiter."""
+        pass
+
+
+class ITraceSink(ABC):
+    @abstractmethod
+    def record(self, name: str, seconds: float) -> None:
+        """Nimmt die Dauer eines abgeschlossenen Spans entgegen."""
+        pass
+
+    def flush(self) -> None:
+        """Schreibt gepufferte Messwerte (z. B. in eine Datei)."""
+        pass
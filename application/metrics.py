@@ -0,0 +1,131 @@
+"""
+Laufende Kennzahlen (Zähler und Messwerte) im Stil von Prometheus.
+
+    contacts = registry.counter("kontaktsplitter_contacts_total", "Verarbeitete Kontakte")
+    contacts.inc()
+
+Zähler sind pro Thread aufgeteilt: inc() schreibt nur in die Zelle des
+aufrufenden Threads und braucht daher keine Sperre; value() summiert die
+Zellen aller Threads. Messwerte (Gauges) werden erst beim Auslesen über
+eine Funktion ermittelt, z. B. aus vorhandenen stats() der Caches.
+Die Ausgabe (HTTP-Endpunkt, Textdatei) liegt in
+infrastructure.metrics_exporter.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, NamedTuple, Union
+
+logger = logging.getLogger(__name__)
+
+Number = Union[int, float]
+
+
+class Counter:
+    """Monoton steigender Zähler mit einer Zelle je schreibendem Thread."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._local = threading.local()
+        # Zellen beendeter Threads bleiben erhalten, ihr Stand zählt weiter mit
+        self._cells: List[List[Number]] = []
+        self._lock = threading.Lock()
+
+    def _cell(self) -> List[Number]:
+        cell: List[Number] = [0]
+        self._local.cell = cell
+        with self._lock:
+            self._cells.append(cell)
+        return cell
+
+    def inc(self, amount: Number = 1) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._cell()
+        # Nur dieser Thread schreibt in die Zelle
+        cell[0] += amount
+
+    def value(self) -> Number:
+        with self._lock:
+            cells = list(self._cells)
+        return sum(cell[0] for cell in cells)
+
+
+class Gauge:
+    """Messwert, der beim Auslesen über `fn` ermittelt wird."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], Number], kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self._fn = fn
+
+    def value(self) -> Number:
+        return self._fn()
+
+
+class Sample(NamedTuple):
+    name: str
+    help: str
+    kind: str  # "counter" oder "gauge"
+    value: Number
+
+
+class MetricsRegistry:
+    """
+    Sammlung benannter Kennzahlen. counter() liefert für denselben Namen
+    stets denselben Zähler, sodass mehrere Komponenten (oder Instanzen)
+    gemeinsam zählen können.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Gauge]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str) -> Counter:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Counter(name, help)
+            elif not isinstance(metric, Counter):
+                raise ValueError(f"Kennzahl {name!r} ist bereits als {metric.kind} registriert")
+            return metric
+
+    def gauge(
+        self, name: str, help: str, fn: Callable[[], Number], kind: str = "gauge"
+    ) -> Gauge:
+        """
+        Registriert (oder ersetzt) einen ausgelesenen Messwert.
+        kind="counter" für Stände, die anderswo monoton gezählt werden
+        (z. B. Cache-Treffer).
+        """
+        gauge = Gauge(name, help, fn, kind)
+        with self._lock:
+            if isinstance(self._metrics.get(name), Counter):
+                raise ValueError(f"Kennzahl {name!r} ist bereits als counter registriert")
+            self._metrics[name] = gauge
+        return gauge
+
+    def collect(self) -> List[Sample]:
+        """
+        Aktueller Stand aller Kennzahlen, nach Namen sortiert. Messwerte,
+        deren Funktion fehlschlägt (z. B. geschlossener Cache), fehlen.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        samples = []
+        for metric in metrics:
+            try:
+                value = metric.value()
+            except Exception:
+                logger.exception(f"Kennzahl {metric.name} nicht lesbar")
+                continue
+            samples.append(Sample(metric.name, metric.help, metric.kind, value))
+        return samples
+
+    def values(self) -> Dict[str, Number]:
+        return {sample.name: sample.value for sample in self.collect()}
@@ -0,0 +1,84 @@
+"""
+Zeitmessung einzelner Verarbeitungsschritte (Spans).
+
+    with tracer.span("process.parse"):
+        ...
+
+Tracer misst per perf_counter und gibt die Dauer an seine Sinks
+(ITraceSink) weiter. NULL_TRACER ist der Standard: span() liefert immer
+dasselbe leere Kontextobjekt, abgeschaltet kostet ein Span also nur einen
+Methodenaufruf und ein leeres with.
+"""
+
+import time
+from typing import Iterable, List
+
+from application.interfaces import ITraceSink, ITracer
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer(ITracer):
+    """Abgeschaltete Messung."""
+
+    enabled = False
+
+    def span(self, name: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def record(self, name: str, seconds: float) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self._tracer = tracer
+        self._name = name
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        # Auch fehlgeschlagene Schritte werden gemessen
+        self._tracer.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Tracer(ITracer):
+    """Misst Spans und reicht die Dauer an alle Sinks weiter (threadsicher, sofern die Sinks es sind)."""
+
+    enabled = True
+
+    def __init__(self, sinks: Iterable[ITraceSink] = ()):
+        self.sinks: List[ITraceSink] = list(sinks)
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        for sink in self.sinks:
+            sink.record(name, seconds)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
@@ -0,0 +1,44 @@
+"""
+Generator für realistische Namens-Eingaben (deterministisch per Seed).
+
+Deckt die Fälle ab, die der Parser unterscheidet: Anreden, ein- und
+mehrwortige Titel, Komma-Formen ("Nachname, Vorname"), Namenspartikel
+(von, van der, de la, ...), Doppelnamen mit Bindestrich und Sonderzeichen.
+"""
+
+import random
+from typing import List
+
+SALUTATIONS = ["Herr", "Frau", "Mr.", "Mrs.", "Ms", "Madame", "Monsieur", "Signor", "Signora", "Señor", "Señora", "Sr.", "Pan", "Mevrouw"]
+TITLES = ["Dr.", "Prof.", "Prof. Dr.", "Dr. rer. nat.", "Dipl. Ing.", "Graf", "Freiherr", "Baron", "Ir.", "Dott."]
+FIRST_NAMES = ["Max", "Anna", "Karl-Heinz", "Maria", "José Ángel", "Jean-Pierre", "William", "Sophie", "Giuseppe", "Fabian", "Ursula", "Johann Georg", "Lucía", "Jürgen", "Zoë"]
+LAST_NAMES = ["Mustermann", "Schmidt", "Müller-Lüdenscheidt", "Shakespeare", "García", "Rossi", "Curie", "Schlüter", "Henrisson-Ford", "Nowak", "Jansen", "Öztürk"]
+CONNECTORS = ["von", "van der", "de la", "zu", "van", "di", "del", "von der"]
+
+
+def _name(rng: random.Random, connector_rate: float) -> str:
+    parts = []
+    if rng.random() < 0.55:
+        parts.append(rng.choice(SALUTATIONS))
+    if rng.random() < 0.35:
+        parts.append(rng.choice(TITLES))
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    if rng.random() < connector_rate:
+        last = f"{rng.choice(CONNECTORS)} {last}"
+    if rng.random() < 0.15:
+        # Komma-Form: "Herr Dr. Nachname, Vorname"
+        return " ".join(parts + [f"{last}, {first}"])
+    name = " ".join(parts + [first, last])
+    if rng.random() < 0.05:
+        name = f"  {name.lower()}  "
+    return name
+
+
+def generate_corpus(size: int = 10_000, seed: int = 42, connector_rate: float = 0.2) -> List[str]:
+    """
+    Liefert `size` Namens-Strings; gleicher Seed → gleicher Korpus.
+    :param connector_rate: Anteil der Nachnamen mit Partikel ("von", "van der", ...)
+    """
+    rng = random.Random(seed)
+    return [_name(rng, connector_rate) for _ in range(size)]
@@ -0,0 +1,118 @@
+"""
+Import-Zeit-Budget für den Start ohne GUI.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 120 --output startup.json
+
+Startet je Szenario einen frischen Interpreter mit `-X importtime`, wertet
+die kumulierten Zeiten aus und schlägt fehl (Exit-Code 1), wenn das Budget
+überschritten oder ein schweres Paket (openai, httpx, tkinter) geladen wird.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Jeder Lauf startet in einem leeren temporären Verzeichnis; relative Pfade
+# (titles.json, Cache) landen dort und nicht im Arbeitsbaum
+SCENARIOS: Dict[str, str] = {
+    "cli_import": "import cli",
+    "cli_no_ai": (
+        "import cli; "
+        "cli.build_service('titles.json', True)[1]"
+        ".process('Herr Dr. Max Mustermann')"
+    ),
+    "providers_ai": (
+        "import os, providers; os.environ.setdefault('OPENAI_API_KEY', 'x'); "
+        "providers.Providers("
+        "titles_path='titles.json', cache_path='classification_cache.sqlite3'"
+        ").contact_service"
+    ),
+}
+FORBIDDEN = ("openai", "httpx", "tkinter")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Zeilen von -X importtime → [(Modul, Tiefe, self_us, cumulative_us)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(code: str) -> Tuple[int, List[Tuple[str, int, int, int]]]:
+    """Ein Lauf: Summe der Top-Level-Importe (µs) und alle Modulzeilen."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (BASE_DIR, env.get("PYTHONPATH"))))
+    with tempfile.TemporaryDirectory(prefix="import_time.") as cwd:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    rows = parse_importtime(proc.stderr)
+    return sum(cum for _, depth, _, cum in rows if depth == 0), rows
+
+
+def run(runs: int) -> Dict:
+    results = {}
+    for name, code in SCENARIOS.items():
+        totals = []
+        rows: List[Tuple[str, int, int, int]] = []
+        for _ in range(runs):
+            total, rows = measure(code)
+            totals.append(total)
+        modules = {m for m, _, _, _ in rows}
+        slowest = sorted(rows, key=lambda r: r[2], reverse=True)[:10]
+        results[name] = {
+            "median_ms": round(statistics.median(totals) / 1000, 2),
+            "min_ms": round(min(totals) / 1000, 2),
+            "modules": len(modules),
+            "forbidden": sorted(
+                m for m in modules if m.split(".")[0] in FORBIDDEN
+            ),
+            "slowest_self_us": [[m, s] for m, _, s, _ in slowest],
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Budget je Szenario (Median)")
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    for name, result in results.items():
+        if result["forbidden"]:
+            print(f"{name}: unerwünschte Importe {result['forbidden']}", file=sys.stderr)
+            failed = True
+        if result["median_ms"] > args.budget_ms:
+            print(f"{name}: {result['median_ms']} ms > Budget {args.budget_ms} ms", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Micro-Benchmarks für Namensparser und Anreicherungs-Pipeline.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json
+
+Gemessen werden Latenz pro Parse (Mittel/Perzentile), Durchsatz,
+Allokationen pro Parse (tracemalloc) sowie ContactService.process
+end-to-end gegen einen lokalen KI-Stub. Die Ergebnisse werden als JSON
+abgelegt, damit sie zwischen Commits verglichen werden können.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from application.contact_service import ContactService
+from benchmarks.corpus import generate_corpus
+from domain.contact import Contact
+from domain.name_parser import _split_first_last, parse_name_to_contact
+from infrastructure.ai_adapters import (
+    OpenAIGenderDetector,
+    OpenAILanguageDetector,
+    OpenAIAnredeGenerator,
+)
+from infrastructure.history_repository import InMemoryHistoryRepository
+from infrastructure.name_parser_adapter import DomainNameParser
+from infrastructure.title_repository import TitleRepository
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StubAIService:
+    """Ersetzt OpenAIService: feste Antworten, optional mit künstlicher Latenz."""
+
+    model = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def prompt_version(self, kind: str) -> str:
+        return "stub"
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def detect_gender(self, name: str) -> str:
+        self._wait()
+        return "w" if name.split()[0].endswith("a") else "m"
+
+    def detect_language(self, name: str) -> str:
+        self._wait()
+        return "de"
+
+    def generate_briefanrede(self, contact: Contact) -> str:
+        self._wait()
+        return "Sehr geehrte Damen und Herren"
+
+
+def _latency_stats(samples_ns: List[int]) -> Dict[str, float]:
+    samples_us = sorted(ns / 1000 for ns in samples_ns)
+    n = len(samples_us)
+    total_s = sum(samples_ns) / 1e9
+    return {
+        "n": n,
+        "mean_us": round(statistics.fmean(samples_us), 3),
+        "p50_us": round(samples_us[n // 2], 3),
+        "p95_us": round(samples_us[int(n * 0.95)], 3),
+        "p99_us": round(samples_us[int(n * 0.99)], 3),
+        "ops_per_s": round(n / total_s, 1) if total_s else 0.0,
+    }
+
+
+def _time_each(fn: Callable[[str], object], inputs: List[str]) -> List[int]:
+    clock = time.perf_counter_ns
+    samples = []
+    gc.disable()
+    try:
+        for item in inputs:
+            start = clock()
+            fn(item)
+            samples.append(clock() - start)
+    finally:
+        gc.enable()
+    return samples
+
+
+def _allocations(fn: Callable[[str], object], inputs: List[str]) -> Dict[str, float]:
+    """Mittlere Spitzen-Allokation und Anzahl Speicherblöcke pro Aufruf."""
+    peaks = []
+    blocks = []
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            result = fn(item)
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            peaks.append(peak - base)
+            blocks.append(sum(s.count_diff for s in after.compare_to(before, "filename") if s.count_diff > 0))
+            del result
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_per_call": round(statistics.fmean(peaks), 1),
+        "blocks_per_call": round(statistics.fmean(blocks), 2),
+    }
+
+
+def _make_title_repo() -> TitleRepository:
+    repo = TitleRepository(os.path.join(BASE_DIR, "titles.json"))
+    repo.load()
+    return repo
+
+
+def _make_service(title_repo: TitleRepository, ai_latency: float) -> ContactService:
+    ai = StubAIService(ai_latency)
+    return ContactService(
+        DomainNameParser(title_repo),
+        OpenAIGenderDetector(ai),
+        OpenAILanguageDetector(ai),
+        OpenAIAnredeGenerator(ai),
+        InMemoryHistoryRepository(),
+    )
+
+
+def bench_parse(corpus: List[str], title_repo: TitleRepository, alloc_sample: int) -> Dict:
+    fn = lambda raw: parse_name_to_contact(raw, title_repo)  # noqa: E731
+    for raw in corpus[:200]:  # Aufwärmen
+        fn(raw)
+    result = _latency_stats(_time_each(fn, corpus))
+    result.update(_allocations(fn, corpus[:alloc_sample]))
+    return result
+
+
+def bench_split_first_last(corpus: List[str]) -> Dict:
+    token_lists = [raw.replace(",", "").split() for raw in corpus if raw.split()]
+    clock = time.perf_counter_ns
+    samples = []
+    for tokens in token_lists:
+        start = clock()
+        _split_first_last(tokens)
+        samples.append(clock() - start)
+    return _latency_stats(samples)
+
+
+def bench_process(corpus: List[str], title_repo: TitleRepository, ai_latency: float) -> Dict:
+    service = _make_service(title_repo, ai_latency)
+    return _latency_stats(_time_each(service.process, corpus))
+
+
+def bench_process_many(corpus: List[str], title_repo: TitleRepository, workers: int) -> Dict:
+    service = _make_service(title_repo, 0.0)
+    start = time.perf_counter()
+    count = sum(1 for _ in service.process_many(corpus, workers=workers))
+    elapsed = time.perf_counter() - start
+    return {"n": count, "workers": workers, "seconds": round(elapsed, 3), "ops_per_s": round(count / elapsed, 1)}
+
+
+def bench_memory(corpus: List[str], title_repo: TitleRepository) -> Dict:
+    """Speicher pro gehaltenem Kontakt: Liste von Contact-Objekten vs. ContactBatch."""
+    service = _make_service(title_repo, 0.0)
+    result = {"n": len(corpus)}
+    for name, build in (
+        ("list", lambda: list(service.process_many(corpus, workers=1))),
+        ("batch", lambda: service.process_batch(corpus, workers=1)),
+    ):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            held = build()
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result[f"{name}_bytes_per_contact"] = round(size / len(corpus), 1)
+        del held
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True
+        )
+        return out.stdout.strip()
+    except OSError:
+        return ""
+
+
+def run(size: int, seed: int, alloc_sample: int, ai_latency: float, workers: int) -> Dict:
+    corpus = generate_corpus(size, seed)
+    title_repo = _make_title_repo()
+    results = {
+        "parse": bench_parse(corpus, title_repo, alloc_sample),
+        "parse_connectors": bench_parse(
+            generate_corpus(size, seed, connector_rate=1.0), title_repo, alloc_sample
+        ),
+        "split_first_last": bench_split_first_last(corpus),
+        "process": bench_process(corpus, title_repo, ai_latency),
+        "memory": bench_memory(corpus, title_repo),
+    }
+    if workers > 1:
+        results["process_many"] = bench_process_many(corpus, title_repo, workers)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "corpus_size": size,
+            "seed": seed,
+            "ai_latency_s": ai_latency,
+        },
+        "results": results,
+    }
+
+
+def compare(old: Dict, new: Dict) -> List[str]:
+    """Gegenüberstellung zweier Läufe (relative Änderung je Kennzahl)."""
+    lines = [f"{old['meta'].get('commit', '?')} → {new['meta'].get('commit', '?')}"]
+    for bench, metrics in new["results"].items():
+        before = old["results"].get(bench, {})
+        for key, value in metrics.items():
+            if key in before and isinstance(value, (int, float)) and before[key]:
+                delta = (value - before[key]) / before[key] * 100
+                lines.append(f"  {bench}.{key}: {before[key]} → {value} ({delta:+.1f}%)")
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10_000, help="Anzahl Namen im Korpus")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--alloc-sample", type=int, default=500, help="Aufrufe mit tracemalloc")
+    parser.add_argument("--ai-latency", type=float, default=0.0, help="künstliche Stub-Latenz (s)")
+    parser.add_argument("--workers", type=int, default=0, help=">1: zusätzlich process_many messen")
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", help="mit früherem JSON-Ergebnis vergleichen")
+    args = parser.parse_args(argv)
+
+    report = run(args.size, args.seed, args.alloc_sample, args.ai_latency, args.workers)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print("\n".join(compare(json.load(f), report)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
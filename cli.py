@@ -0,0 +1,301 @@
+"""
+Kommandozeilen-Einstieg für die Stapelverarbeitung (ohne GUI).
+
+    python -m contactsplitter split namen.csv -o kontakte.jsonl
+    cat namen.txt | python cli.py split - --no-ai > kontakte.jsonl
+
+Die Eingabe wird zeilenweise gelesen, verarbeitet und sofort geschrieben;
+der Speicherbedarf hängt damit nicht von der Dateigröße ab.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Iterator, List, Optional, TextIO, Tuple
+
+from domain.contact import Contact
+from providers import Providers
+
+if TYPE_CHECKING:
+    from application.contact_service import ContactService
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_FIELDS = list(Contact().to_dict().keys())
+
+
+def _detect_format(path: str, explicit: Optional[str]) -> str:
+    if explicit:
+        return explicit
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "txt"
+
+
+def read_names(
+    stream: TextIO, fmt: str, column: Optional[str], header: Optional[bool] = None
+) -> Iterator[str]:
+    """
+    Liefert die Roh-Namen zeilenweise.
+    - txt: jede nicht-leere Zeile
+    - csv: Spalte `column` (Name oder 0-basierter Index), sonst erste Spalte;
+      eine Kopfzeile wird nur bei Spaltennamen erwartet, `header` legt es fest
+    - jsonl: Feld `column` (Standard "name")
+    """
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        by_name = column is not None and not column.isdigit()
+        if header is None:
+            header = by_name
+        names: List[str] = []
+        if header:
+            names = next(reader, None)
+            if names is None:
+                return
+        if column is None:
+            index = 0
+        elif column.isdigit():
+            index = int(column)
+        elif column in names:
+            index = names.index(column)
+        else:
+            raise SystemExit(f"Spalte „{column}“ nicht in {names}")
+        for row in reader:
+            if index < len(row):
+                yield row[index]
+    elif fmt == "jsonl":
+        key = column or "name"
+        for line in stream:
+            if line.strip():
+                yield str(json.loads(line).get(key, ""))
+    else:
+        for line in stream:
+            if line.strip():
+                yield line.rstrip("\r\n")
+
+
+class ContactWriter:
+    """Schreibt Kontakte inkrementell als JSONL oder CSV."""
+
+    def __init__(self, stream: TextIO, fmt: str):
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, contact: Contact) -> None:
+        row = contact.to_dict()
+        if self._csv is not None:
+            row["inaccuracies"] = "; ".join(row["inaccuracies"])
+            row["review_fields"] = "; ".join(row["review_fields"])
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def build_service(
+    titles_path: str,
+    no_ai: bool,
+    rpm: Optional[float] = None,
+    tpm: Optional[float] = None,
+    rate_limit_db: Optional[str] = None,
+    token_budget: Optional[int] = None,
+    watch_titles: bool = False,
+    tracer=None,
+    metrics=None,
+) -> Tuple[Providers, "ContactService"]:
+    """
+    Baut den ContactService für den Stapelbetrieb; zurück kommen auch die
+    Providers, deren close() der Aufrufer nach dem Lauf aufruft.
+    Mit no_ai=True wird ausschließlich lokal erkannt (Lexikon + Regeln),
+    OpenAI wird dann gar nicht erst importiert.
+    rpm/tpm begrenzen die OpenAI-Nutzung clientseitig; mit rate_limit_db
+    teilen sich mehrere parallel laufende Jobs dieses Limit.
+    Mit watch_titles übernehmen auch die Worker Änderungen an titles.json.
+    tracer misst die einzelnen Verarbeitungsschritte (siehe --profile),
+    metrics zählt Durchsatz, Prüffälle und OpenAI-Verbrauch (--metrics-*).
+    """
+    providers = Providers(
+        titles_path=titles_path,
+        use_ai=not no_ai,
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm,
+        rate_limit_path=rate_limit_db,
+        token_budget=token_budget,
+        titles_reload_interval=1.0 if watch_titles else None,
+        tracer=tracer,
+        metrics=metrics,
+    )
+    return providers, providers.contact_service
+
+
+def _open_input(path: str) -> TextIO:
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def _open_output(path: str) -> TextIO:
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _build_tracer(args: argparse.Namespace):
+    """Tracer mit Histogramm (--profile) bzw. Prometheus-Datei (--profile-prom)."""
+    if not (args.profile or args.profile_prom):
+        return None, None
+    from application.tracing import Tracer
+    from infrastructure.trace_sinks import HistogramTraceSink, PrometheusTextFileSink
+
+    if args.profile_prom:
+        histogram = PrometheusTextFileSink(args.profile_prom, flush_interval=10.0)
+    else:
+        histogram = HistogramTraceSink()
+    return Tracer([histogram]), histogram
+
+
+def _start_metrics(args: argparse.Namespace):
+    """Registry mit HTTP-Endpunkt (--metrics-port) bzw. Textdatei (--metrics-file)."""
+    if args.metrics_port is None and not args.metrics_file:
+        return None, []
+    from application.metrics import MetricsRegistry
+    from infrastructure.metrics_exporter import MetricsHTTPServer, TextFileExporter
+
+    metrics = MetricsRegistry()
+    contacts = metrics.counter("kontaktsplitter_contacts_total", "Verarbeitete Kontakte")
+    started = time.monotonic()
+    metrics.gauge(
+        "kontaktsplitter_run_contacts_per_second",
+        "Durchschnittlicher Durchsatz des laufenden Stapellaufs",
+        lambda: contacts.value() / max(time.monotonic() - started, 1e-9),
+    )
+    exporters = []
+    if args.metrics_port is not None:
+        exporters.append(MetricsHTTPServer(metrics, port=args.metrics_port).start())
+    if args.metrics_file:
+        exporters.append(TextFileExporter(metrics, args.metrics_file, interval=10.0).start())
+    return metrics, exporters
+
+
+def cmd_split(args: argparse.Namespace) -> int:
+    tracer, histogram = _build_tracer(args)
+    metrics, exporters = _start_metrics(args)
+    providers, service = build_service(
+        args.titles,
+        args.no_ai,
+        args.rpm,
+        args.tpm,
+        args.rate_limit_db,
+        args.token_budget,
+        args.watch_titles,
+        tracer,
+        metrics,
+    )
+    in_fmt = _detect_format(args.input, args.input_format)
+    out_fmt = args.output_format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+
+    source = _open_input(args.input)
+    target = _open_output(args.output)
+    count = 0
+    try:
+        writer = ContactWriter(target, out_fmt)
+        names = read_names(source, in_fmt, args.column, args.header)
+        for contact in service.process_many(names, workers=args.workers, ordered=True):
+            writer.write(contact)
+            count += 1
+        target.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        for exporter in exporters:
+            exporter.stop()
+        providers.close()
+    print(f"{count} Kontakte verarbeitet.", file=sys.stderr)
+    if tracer is not None:
+        tracer.flush()
+        if args.profile:
+            print(histogram.report(), file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="contactsplitter",
+        description="Zerlegt Namen in strukturierte Kontakte (Stapelbetrieb).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    split = sub.add_parser("split", help="Namen aus Datei/stdin zerlegen")
+    split.add_argument("input", nargs="?", default="-", help="Eingabedatei oder '-' für stdin")
+    split.add_argument("-o", "--output", default="-", help="Ausgabedatei oder '-' für stdout")
+    split.add_argument("-c", "--column", help="CSV-Spalte (Name/Index) bzw. JSONL-Feld")
+    header = split.add_mutually_exclusive_group()
+    header.add_argument(
+        "--header",
+        action="store_true",
+        default=None,
+        help="CSV hat eine Kopfzeile (Standard: nur bei --column mit Spaltenname)",
+    )
+    header.add_argument(
+        "--no-header", dest="header", action="store_false", help="CSV ohne Kopfzeile"
+    )
+    split.add_argument("--input-format", choices=["txt", "csv", "jsonl"])
+    split.add_argument("--output-format", choices=["jsonl", "csv"])
+    split.add_argument("--no-ai", action="store_true", help="nur lokale Erkennung, kein OpenAI")
+    split.add_argument(
+        "-w", "--workers", type=int, default=1, help="Parser-Prozesse (Standard: 1)"
+    )
+    split.add_argument("--rpm", type=float, help="max. OpenAI-Requests pro Minute")
+    split.add_argument("--tpm", type=float, help="max. OpenAI-Tokens pro Minute")
+    split.add_argument(
+        "--rate-limit-db", help="SQLite-Datei, über die parallele Jobs das Limit teilen"
+    )
+    split.add_argument(
+        "--token-budget", type=int, help="Token-Budget des Laufs, danach nur lokale Erkennung"
+    )
+    split.add_argument(
+        "--profile", action="store_true", help="Zeiten je Verarbeitungsschritt auf stderr ausgeben"
+    )
+    split.add_argument(
+        "--profile-prom", metavar="PFAD", help="Zeiten als Prometheus-Textdatei schreiben"
+    )
+    split.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Kennzahlen während des Laufs unter http://127.0.0.1:PORT/metrics anbieten",
+    )
+    split.add_argument(
+        "--metrics-file",
+        metavar="PFAD",
+        help="Kennzahlen alle 10 s und am Ende als Prometheus-Textdatei schreiben",
+    )
+    split.add_argument(
+        "--watch-titles",
+        action="store_true",
+        help="Änderungen an titles.json während des Laufs übernehmen",
+    )
+    split.add_argument(
+        "--titles", default=os.path.join(BASE_DIR, "titles.json"), help="Pfad zur titles.json"
+    )
+    split.set_defaults(func=cmd_split)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
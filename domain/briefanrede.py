@@ -2,18 +2,28 @@
 
 from domain.contact import Contact
 
+# Languages with predefined salutation patterns (all languages known in SALUTATIONS).
+SUPPORTED_LANGUAGES = frozenset(
+    {"de", "en", "it", "fr", "es", "pt", "pl", "nl", "sv", "tr", "id"}
+)
+
+
+def supports(contact: Contact) -> bool:
+    """True if generate_briefanrede has a pattern for the contact's language."""
+    return bool(contact.sprache) and contact.sprache.lower() in SUPPORTED_LANGUAGES
+
 
 def generate_briefanrede(contact: Contact) -> str:
     """
     Generate a brief salutation string based on the contact's language, gender, title, and last name.
-    Uses predefined patterns for supported languages (de, en, it, fr, es).
+    Uses predefined patterns for supported languages (de, en, it, fr, es, pt, pl, nl, sv, tr, id).
     """
     lang = contact.sprache.lower() if contact.sprache else ""
     gender = contact.geschlecht.lower() if contact.geschlecht else "-"
     last_name = contact.nachname.strip()
     title = contact.titel.strip()
     # Default to generic output if no info
-    if not lang or lang not in {"de", "en", "it", "fr", "es"}:
+    if not lang or lang not in SUPPORTED_LANGUAGES:
         # If unknown language, default to German generic as fallback.
         lang = "de"
     # Determine salutation based on language and gender
@@ -77,5 +87,48 @@ def generate_briefanrede(contact: Contact) -> str:
             return f"Estimado Señor {last_name}"
         else:
             return "Estimados Señores y Señoras"
+    elif lang == "pt":
+        if gender == "w":
+            return f"Prezada Senhora {last_name}"
+        elif gender == "m":
+            return f"Prezado Senhor {last_name}"
+        else:
+            return "Prezados Senhores"
+    elif lang == "pl":
+        # Polish addresses use the vocative without the last name
+        if gender == "w":
+            return "Szanowna Pani"
+        elif gender == "m":
+            return "Szanowny Panie"
+        else:
+            return "Szanowni Państwo"
+    elif lang == "nl":
+        if gender == "w":
+            return f"Geachte mevrouw {last_name}"
+        elif gender == "m":
+            return f"Geachte heer {last_name}"
+        else:
+            return "Geachte dames en heren"
+    elif lang == "sv":
+        if gender == "w":
+            return f"Bästa fru {last_name}"
+        elif gender == "m":
+            return f"Bäste herr {last_name}"
+        else:
+            return "Till berörda"
+    elif lang == "tr":
+        if gender == "w":
+            return f"Sayın {last_name} Hanım"
+        elif gender == "m":
+            return f"Sayın {last_name} Bey"
+        else:
+            return "Sayın Yetkili"
+    elif lang == "id":
+        if gender == "w":
+            return f"Yth. Ibu {last_name}"
+        elif gender == "m":
+            return f"Yth. Bapak {last_name}"
+        else:
+            return "Dengan hormat"
     # Fallback (should not happen due to earlier default)
     return f"Dear {last_name}"
@@ -0,0 +1,66 @@
+"""
+Vorkompilierte Namenspartikel (constants.SURNAME_CONNECTORS).
+
+ConnectorTrie:
+    Token-Trie über die kleingeschriebenen Partikel ("von", "van der", ...).
+    Wird einmal beim Import gebaut und von parse_name_to_contact und
+    _split_first_last gemeinsam genutzt; pro Aufruf wird die Tokenliste
+    nur noch einmal durchlaufen statt je Partikel ein Schiebefenster.
+"""
+
+from __future__ import annotations
+from typing import Iterable, Optional, Sequence
+
+from domain import constants
+
+# Marker-Schlüssel für "hier endet ein Partikel" (wie in title_trie)
+_END = ""
+
+
+class ConnectorTrie:
+    """Unveränderlicher Token-Trie über Namenspartikel."""
+
+    def __init__(self, connectors: Iterable[str]):
+        self._root: dict = {}
+        self.max_words = 0
+        phrases = set()
+        for connector in connectors:
+            words = connector.lower().split()
+            if not words:
+                continue
+            phrases.add(tuple(words))
+            node = self._root
+            for word in words:
+                node = node.setdefault(word, {})
+            node[_END] = len(words)
+            self.max_words = max(self.max_words, len(words))
+        # Exakte Wortfolgen für die direkte Prüfung (_split_first_last)
+        self.phrases = frozenset(phrases)
+
+    def contains(self, words: Sequence[str]) -> bool:
+        """True, wenn die (kleingeschriebene) Wortfolge exakt ein Partikel ist."""
+        return tuple(words) in self.phrases
+
+    def find(self, low_tokens: Sequence[str]) -> Optional[int]:
+        """
+        Startposition des Partikels, an dem der Nachname beginnt, oder None.
+        Längere Partikel haben Vorrang ("van der" vor "van"), bei gleicher
+        Länge gewinnt das früheste Vorkommen.
+        """
+        best_pos: Optional[int] = None
+        best_len = 0
+        for start in range(len(low_tokens)):
+            node = self._root
+            for pos in range(start, len(low_tokens)):
+                node = node.get(low_tokens[pos])
+                if node is None:
+                    break
+                length = node.get(_END, 0)
+                if length > best_len:
+                    best_pos, best_len = start, length
+            if best_len == self.max_words:
+                break
+        return best_pos
+
+
+CONNECTORS = ConnectorTrie(constants.SURNAME_CONNECTORS)
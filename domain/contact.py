@@ -1,9 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class Contact:
     """Repräsentiert einen geparsten Kontakt."""
 
@@ -17,6 +17,8 @@ class Contact:
     needs_review: bool = False
     inaccuracies: List[str] = field(default_factory=list)
     review_fields: List[str] = field(default_factory=list)
+    # Schlüssel in der Historie (von IHistoryRepository.save vergeben); kein Inhaltsfeld
+    history_id: Optional[int] = field(default=None, compare=False, repr=False)
 
     def __post_init__(self):
         if not self.geschlecht:
@@ -0,0 +1,151 @@
+"""
+Spaltenorientierte Ablage vieler Kontakte (Massenverarbeitung, Deduplizierung).
+
+ContactBatch:
+    Jedes Textfeld wird als Index in eine gemeinsame String-Tabelle
+    gespeichert (array('I') je Feld); gleiche Werte – "Herr", "de",
+    häufige Vor-/Nachnamen, Briefanreden – liegen damit nur einmal im
+    Speicher. needs_review ist ein Bitfeld, Hinweise/Prüffelder werden
+    nur für die (wenigen) betroffenen Zeilen abgelegt.
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from domain.contact import Contact
+
+TEXT_FIELDS: Tuple[str, ...] = (
+    "anrede",
+    "titel",
+    "vorname",
+    "nachname",
+    "geschlecht",
+    "sprache",
+    "briefanrede",
+)
+
+
+class ContactRow:
+    """Leichtgewichtige Zeilen-Sicht auf einen ContactBatch (keine Kopie)."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "ContactBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getattr__(self, name: str):
+        return self._batch.value(self._index, name)
+
+    def to_dict(self) -> Dict[str, Union[str, bool, List[str]]]:
+        """Gleiches Format wie Contact.to_dict()."""
+        return self._batch.row_dict(self._index)
+
+    def to_contact(self) -> Contact:
+        return Contact(**self.to_dict())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ContactRow, Contact)):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ContactRow({self._index}, {self.to_dict()!r})"
+
+
+class ContactBatch:
+    """Kompakter, nur anhängbarer Container für viele Kontakte."""
+
+    def __init__(self):
+        self._strings: List[str] = [""]
+        self._string_ids: Dict[str, int] = {"": 0}
+        self._columns: Dict[str, array] = {f: array("I") for f in TEXT_FIELDS}
+        self._review_bits = bytearray()
+        self._inaccuracies: Dict[int, Tuple[str, ...]] = {}
+        self._review_fields: Dict[int, Tuple[str, ...]] = {}
+        self._len = 0
+
+    @classmethod
+    def from_contacts(cls, contacts: Iterable[Contact]) -> "ContactBatch":
+        batch = cls()
+        batch.extend(contacts)
+        return batch
+
+    def _intern(self, value: str) -> int:
+        code = self._string_ids.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = code
+        return code
+
+    def append(self, contact: Contact) -> None:
+        index = self._len
+        for name, column in self._columns.items():
+            column.append(self._intern(getattr(contact, name)))
+        if index % 8 == 0:
+            self._review_bits.append(0)
+        if contact.needs_review:
+            self._review_bits[index >> 3] |= 1 << (index & 7)
+        if contact.inaccuracies:
+            self._inaccuracies[index] = tuple(contact.inaccuracies)
+        if contact.review_fields:
+            self._review_fields[index] = tuple(contact.review_fields)
+        self._len += 1
+
+    def extend(self, contacts: Iterable[Contact]) -> None:
+        for contact in contacts:
+            self.append(contact)
+
+    def value(self, index: int, name: str):
+        """Einzelnes Feld einer Zeile, ohne die Zeile zu materialisieren."""
+        if name in self._columns:
+            return self._strings[self._columns[name][index]]
+        if name == "needs_review":
+            return self.needs_review(index)
+        if name == "inaccuracies":
+            return list(self._inaccuracies.get(index, ()))
+        if name == "review_fields":
+            return list(self._review_fields.get(index, ()))
+        raise AttributeError(name)
+
+    def needs_review(self, index: int) -> bool:
+        return bool(self._review_bits[index >> 3] & (1 << (index & 7)))
+
+    def row_dict(self, index: int) -> Dict[str, Union[str, bool, List[str]]]:
+        if not 0 <= index < self._len:
+            raise IndexError(index)
+        row: Dict[str, Union[str, bool, List[str]]] = {
+            name: self._strings[column[index]] for name, column in self._columns.items()
+        }
+        row["needs_review"] = self.needs_review(index)
+        row["inaccuracies"] = list(self._inaccuracies.get(index, ()))
+        row["review_fields"] = list(self._review_fields.get(index, ()))
+        return row
+
+    def review_indices(self) -> Iterator[int]:
+        """Zeilennummern mit needs_review (über das Bitfeld)."""
+        for byte_index, byte in enumerate(self._review_bits):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield (byte_index << 3) | bit
+
+    def __getitem__(self, index: int) -> ContactRow:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError(index)
+        return ContactRow(self, index)
+
+    def __iter__(self) -> Iterator[ContactRow]:
+        for index in range(self._len):
+            yield ContactRow(self, index)
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def distinct_strings(self) -> int:
+        return len(self._strings)
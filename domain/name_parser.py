@@ -4,6 +4,8 @@ import unicodedata
 
 from domain.contact import Contact
 from domain import constants
+from domain.connector_trie import CONNECTORS
+from domain.title_trie import TitleTable, TitleTrie
 
 
 def _split_first_last(name_tokens: List[str]) -> Tuple[str, str]:
@@ -16,20 +18,17 @@ def _split_first_last(name_tokens: List[str]) -> Tuple[str, str]:
     """
     if not name_tokens:
         return "", ""
+    phrases = CONNECTORS.phrases
     idx_last = len(name_tokens) - 1
     last = [name_tokens[idx_last]]
+    following = name_tokens[idx_last].lower()
     j = idx_last - 1
     while j >= 0:
-        t = name_tokens[j].rstrip(".").lower()
-        # Zwei-Wort-Connector prüfen
-        if j < idx_last:
-            two = f"{name_tokens[j].lower()} {name_tokens[j+1].lower()}"
-            if two in constants.SURNAME_CONNECTORS:
-                last.insert(0, name_tokens[j])
-                j -= 1
-                continue
-        if t in constants.SURNAME_CONNECTORS:
+        t = name_tokens[j].lower()
+        # Zwei-Wort-Connector prüfen, dann Ein-Wort (ohne Punkt)
+        if (t, following) in phrases or (t.rstrip("."),) in phrases:
             last.insert(0, name_tokens[j])
+            following = t
             j -= 1
             continue
         break
@@ -37,11 +36,25 @@ def _split_first_last(name_tokens: List[str]) -> Tuple[str, str]:
     return " ".join(vor), " ".join(last)
 
 
+def compile_titles(title_repo) -> TitleTable:
+    """
+    Liefert die kompilierte Titeltabelle des Repositories (Trie oder Snapshot).
+    Repositories ohne eigene Tabelle (z. B. Mocks) werden einmalig über
+    get_titles()/lookup() in einen TitleTrie übersetzt.
+    """
+    if isinstance(title_repo, TitleTable):
+        return title_repo
+    compiled = getattr(title_repo, "compiled_titles", None)
+    if isinstance(compiled, TitleTable):
+        return compiled
+    return TitleTrie.from_repository(title_repo)
+
+
 def parse_name_to_contact(input_str: str, title_repo) -> Contact:
     """
     Zerlegt Freitext in ein Contact-Objekt.
     - Unicode-Normalisierung
-    - dynamische Titel aus title_repo.lookup()
+    - dynamische Titel aus title_repo (kompilierter Trie bzw. lookup())
     - Title-Casing von Vor- und Nachname
     """
     contact = Contact()
@@ -86,53 +99,40 @@ def parse_name_to_contact(input_str: str, title_repo) -> Contact:
             contact.geschlecht = sal["gender"]
             contact.sprache = sal["language"]
 
-    # Mehrwortige Titel-Erkennung (inkl. Abkürzungen)
-    # Build map: key→short_form and normalized short_form→short_form
-    known_map: dict[str, str] = {}
-    for key in title_repo.get_titles():
-        short = title_repo.lookup(key) or key
-        known_map[key] = short
-        norm = short.replace(".", "").replace("-", " ").strip().lower()
-        known_map[norm] = short
-
+    # Mehrwortige Titel-Erkennung (inkl. Abkürzungen) per Longest-Match im Trie
+    trie = compile_titles(title_repo)
     titles: List[str] = []
     i = 0
-    max_seq = max(len(k.split()) for k in known_map.keys())
     while i < len(tokens):
-        matched = False
-        # try longest possible sequences first
-        for seq_len in range(min(max_seq, len(tokens) - i), 0, -1):
-            candidate = " ".join(tokens[i : i + seq_len])
-            clean = candidate.replace(".", "").replace("-", " ").strip().lower()
-            if clean in known_map:
-                titles.append(known_map[clean])
-                i += seq_len
-                matched = True
-                break
-        if not matched:
+        short, consumed = trie.longest_match(tokens, i)
+        if not consumed:
             break
+        titles.append(short)
+        i += consumed
     tokens = tokens[i:]
     contact.titel = " ".join(titles)
 
     # Extra-Titel im Rest erkennen
     remaining = [t.rstrip(".").lower() for t in tokens]
     for tok in remaining:
-        if tok in known_map:
+        if trie.contains(tok):
             contact.inaccuracies.append(f"Titel im Namen gefunden: „{tok}“")
             break
 
     low_tokens = [t.lower() for t in tokens]
-    for part in sorted(constants.SURNAME_CONNECTORS, key=lambda p: len(p.split()), reverse=True):
-        part_toks = part.split()
-        for i in range(len(tokens) - len(part_toks) + 1):
-            if low_tokens[i : i + len(part_toks)] == part_toks:
-                # z.B. ["von","hallo-mia"] → Vorname="", Nachname="von hallo-mia"
-                contact.vorname = " ".join(tokens[:i])
-                contact.nachname = " ".join(tokens[i:])
-                # direkt raus, nicht weiter splitten
-                contact.vorname = unicodedata.normalize("NFC", contact.vorname).title()
-                contact.nachname = unicodedata.normalize("NFC", contact.nachname).title()
-                return contact
+    i = CONNECTORS.find(low_tokens)
+    if i is not None:
+        # z.B. ["von","hallo-mia"] → Vorname="", Nachname="von hallo-mia"
+        contact.vorname = " ".join(tokens[:i])
+        contact.nachname = " ".join(tokens[i:])
+        # direkt raus, nicht weiter splitten
+        contact.vorname = unicodedata.normalize("NFC", contact.vorname).title()
+        contact.nachname = unicodedata.normalize("NFC", contact.nachname).title()
+        return contact
+
+    # Nur Anrede/Titel, kein Name übrig (z. B. "Herr Dr.")
+    if not tokens:
+        return contact
 
     # Explizite Hyphen-Regel: ab erstem Bindestrich des letzten Tokens (Weil es ja auch Vornamen mit Bindestrich geben kann)
     last_tok = tokens[-1]
@@ -0,0 +1,148 @@
+"""
+Kompilierte Titeltabelle für die Namensparsing-Logik.
+
+TitleTable:
+    Lese-Schnittstelle, die der Parser von einer kompilierten Titeltabelle
+    braucht (lookup, contains, longest_match).
+
+TitleTrie:
+    Token-Trie über normalisierte Titel-Schlüssel (klein, ohne Punkt,
+    Bindestrich als Leerzeichen) → kanonische Kurzform. Wird einmalig
+    aus dem Titel-Repository erzeugt und danach nur noch gelesen, sodass
+    der Parser pro Aufruf lediglich einen Longest-Match-Lauf durchführt.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Marker-Schlüssel für "hier endet ein Titel" innerhalb eines Trie-Knotens.
+# Tokens sind nie leer, daher kollidiert "" mit keinem echten Kind.
+_END = ""
+
+
+def normalize_title_token(token: str) -> List[str]:
+    """
+    Normalisiert ein Eingabe-Token wie der Titelvergleich:
+    Punkte entfernen, Bindestriche als Worttrenner, Kleinschreibung.
+    "Dipl.-Ing." → ["dipl", "ing"]
+    """
+    return token.replace(".", "").replace("-", " ").lower().split()
+
+
+class TitleTable(ABC):
+    """Unveränderliche, kompilierte Titeltabelle (nur lesen)."""
+
+    version: int = 0
+
+    @abstractmethod
+    def lookup(self, token: str) -> Optional[str]:
+        """Liefert die Kurzform zu einer Langform oder None."""
+
+    @abstractmethod
+    def contains(self, token: str) -> bool:
+        """True, wenn das (bereits kleingeschriebene) Token ein bekannter Titel ist."""
+
+    @abstractmethod
+    def longest_match(
+        self, tokens: Sequence[str], start: int = 0
+    ) -> Tuple[Optional[str], int]:
+        """
+        Sucht den längsten Titel ab Position ``start`` in ``tokens``.
+        Rückgabe: (Kurzform, Anzahl verbrauchter Tokens) bzw. (None, 0).
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Anzahl der Titel (Langformen)."""
+
+
+class TitleTrie(TitleTable):
+    """Unveränderlicher Token-Trie: Wortfolge → Kurzform."""
+
+    def __init__(self, titles: Dict[str, str], version: int = 0):
+        """
+        :param titles: Langform (klein) → Kurzform, wie in titles.json
+        :param version: Versionszähler des erzeugenden Repositories
+        """
+        self.version = version
+        self._titles = dict(titles)
+        # Alle Vergleichsschlüssel (Langform + normalisierte Kurzform),
+        # für die Einzel-Token-Prüfung "Titel im Namen gefunden".
+        known: Dict[str, str] = {}
+        for key, short in self._titles.items():
+            short = short or key
+            known[key] = short
+            norm = short.replace(".", "").replace("-", " ").strip().lower()
+            known[norm] = short
+        self._keys = frozenset(known)
+
+        self._root: dict = {}
+        for key, short in known.items():
+            # Schlüssel mit Punkt/Bindestrich können nie auf eine
+            # normalisierte Token-Folge passen.
+            if "." in key or "-" in key:
+                continue
+            words = key.split()
+            if not words:
+                continue
+            node = self._root
+            for word in words:
+                node = node.setdefault(word, {})
+            node[_END] = short
+
+    @classmethod
+    def from_repository(cls, title_repo) -> "TitleTrie":
+        """Baut den Trie über die öffentliche ITitleRepository-Schnittstelle."""
+        titles = {}
+        for key in title_repo.get_titles():
+            titles[key] = title_repo.lookup(key) or key
+        return cls(titles, version=getattr(title_repo, "version", 0))
+
+    def lookup(self, token: str) -> Optional[str]:
+        """Liefert die Kurzform zu einer Langform oder None."""
+        return self._titles.get(token.lower())
+
+    def titles(self) -> Dict[str, str]:
+        """Langform → Kurzform, wie beim Erzeugen übergeben (Kopie)."""
+        return dict(self._titles)
+
+    def keys(self) -> frozenset:
+        """Alle Vergleichsschlüssel für contains()."""
+        return self._keys
+
+    def phrases(self) -> Iterator[Tuple[Tuple[str, ...], str]]:
+        """Alle Wortfolgen des Tries mit ihrer Kurzform (für Snapshots)."""
+        stack: List[Tuple[Tuple[str, ...], dict]] = [((), self._root)]
+        while stack:
+            words, node = stack.pop()
+            for word, child in node.items():
+                if word == _END:
+                    yield words, child
+                else:
+                    stack.append((words + (word,), child))
+
+    def contains(self, token: str) -> bool:
+        """True, wenn das (bereits kleingeschriebene) Token ein bekannter Titel ist."""
+        return token in self._keys
+
+    def longest_match(
+        self, tokens: Sequence[str], start: int = 0
+    ) -> Tuple[Optional[str], int]:
+        """
+        Sucht den längsten Titel ab Position ``start`` in ``tokens``.
+        Rückgabe: (Kurzform, Anzahl verbrauchter Tokens) bzw. (None, 0).
+        """
+        node = self._root
+        best: Tuple[Optional[str], int] = (None, 0)
+        for pos in range(start, len(tokens)):
+            for word in normalize_title_token(tokens[pos]):
+                node = node.get(word)
+                if node is None:
+                    return best
+            if _END in node:
+                best = (node[_END], pos - start + 1)
+        return best
+
+    def __len__(self) -> int:
+        return len(self._titles)
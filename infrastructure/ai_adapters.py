@@ -1,24 +1,149 @@
-from application.interfaces import IGenderDetector, ILanguageDetector, IAnredeGenerator
+from typing import Dict, List, Optional
+
+from application.interfaces import (
+    IGenderDetector,
+    ILanguageDetector,
+    IAnredeGenerator,
+    IContactEnricher,
+    IAsyncGenderDetector,
+    IAsyncLanguageDetector,
+    IAsyncAnredeGenerator,
+    IAsyncContactEnricher,
+)
 from domain.contact import Contact
+from infrastructure.classification_cache import ClassificationCache
 from infrastructure.openai_service import OpenAIService
 
 
+def _full_name(contact: Contact) -> str:
+    return f"{contact.vorname} {contact.nachname}".strip()
+
+
+def _cache_name(contact: Contact) -> str:
+    """
+    Name im Cache-Schlüssel: der Vorname, denn Vornamen wiederholen sich
+    stark (wenige tausend decken den Großteil ab); ohne Vorname der volle Name.
+    """
+    return contact.vorname.strip() or _full_name(contact)
+
+
+def _cached(
+    cache: Optional[ClassificationCache],
+    ai: OpenAIService,
+    kind: str,
+    contact: Contact,
+    classify,
+    unknown: str,
+) -> str:
+    """
+    Fragt zuerst den Cache (Schlüssel: Vorname), erst bei einem Miss die API
+    (mit vollem Namen). "Unbekannt"-Ergebnisse werden nicht gecacht, da sie
+    auch von fehlgeschlagenen API-Aufrufen stammen können.
+    """
+    name = _full_name(contact)
+    if cache is None or not name:
+        return classify(name)
+    key = cache.make_key(kind, _cache_name(contact), ai.model, ai.prompt_version(kind))
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    result = classify(name)
+    if result != unknown:
+        cache.put(key, result)
+    return result
+
+
+async def _acached(
+    cache: Optional[ClassificationCache],
+    ai: OpenAIService,
+    kind: str,
+    contact: Contact,
+    classify,
+    unknown: str,
+) -> str:
+    """async-Variante von _cached; classify ist eine Coroutine-Funktion."""
+    name = _full_name(contact)
+    if cache is None or not name:
+        return await classify(name)
+    key = cache.make_key(kind, _cache_name(contact), ai.model, ai.prompt_version(kind))
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    result = await classify(name)
+    if result != unknown:
+        cache.put(key, result)
+    return result
+
+
+# Felder des kombinierten Aufrufs, die auch einzeln gecacht werden:
+# (Kontaktfeld, Cache-Art, "unbekannt"-Wert)
+_CACHED_FIELDS = (("geschlecht", "gender", "-"), ("sprache", "language", ""))
+
+
+def _open_fields(contact: Contact) -> List[str]:
+    """Felder, die der kombinierte Aufruf ermitteln soll (wie im ContactService)."""
+    return [
+        name
+        for name, missing in (
+            ("geschlecht", contact.geschlecht == "-" and bool(contact.vorname)),
+            ("sprache", not contact.sprache),
+            ("briefanrede", not contact.briefanrede),
+        )
+        if missing
+    ]
+
+
+def _cached_fields(
+    cache: Optional[ClassificationCache],
+    ai: OpenAIService,
+    contact: Contact,
+    fields: List[str],
+) -> Dict[str, str]:
+    """Geschlecht und Sprache aus dem Cache der Einzel-Erkenner, soweit vorhanden."""
+    result: Dict[str, str] = {}
+    name = _cache_name(contact)
+    if cache is None or not name:
+        return result
+    for field, kind, _ in _CACHED_FIELDS:
+        if field in fields:
+            hit = cache.get(cache.make_key(kind, name, ai.model, ai.prompt_version(kind)))
+            if hit is not None:
+                result[field] = hit
+    return result
+
+
+def _store_fields(
+    cache: Optional[ClassificationCache],
+    ai: OpenAIService,
+    contact: Contact,
+    combined: Dict[str, str],
+) -> None:
+    """Legt Geschlecht und Sprache aus dem kombinierten Aufruf im Cache ab."""
+    name = _cache_name(contact)
+    if cache is None or not name:
+        return
+    for field, kind, unknown in _CACHED_FIELDS:
+        value = combined.get(field)
+        if value is not None and value != unknown:
+            cache.put(cache.make_key(kind, name, ai.model, ai.prompt_version(kind)), value)
+
+
 class OpenAIGenderDetector(IGenderDetector):
-    def __init__(self, ai_service: OpenAIService):
+    def __init__(self, ai_service: OpenAIService, cache: Optional[ClassificationCache] = None):
         self.ai = ai_service
+        self.cache = cache
 
     def detect(self, contact: Contact) -> str:
-        name = f"{contact.vorname} {contact.nachname}".strip()
-        return self.ai.detect_gender(name)
+        return _cached(self.cache, self.ai, "gender", contact, self.ai.detect_gender, "-")
 
 
 class OpenAILanguageDetector(ILanguageDetector):
-    def __init__(self, ai_service: OpenAIService):
+    def __init__(self, ai_service: OpenAIService, cache: Optional[ClassificationCache] = None):
         self.ai = ai_service
+        self.cache = cache
 
     def detect(self, contact: Contact) -> str:
-        name = f"{contact.vorname} {contact.nachname}".strip()
-        return self.ai.detect_language(name)
+        return _cached(self.cache, self.ai, "language", contact, self.ai.detect_language, "")
 
 
 class OpenAIAnredeGenerator(IAnredeGenerator):
@@ -27,3 +152,71 @@ class OpenAIAnredeGenerator(IAnredeGenerator):
 
     def generate(self, contact: Contact) -> str:
         return self.ai.generate_briefanrede(contact)
+
+
+class OpenAIContactEnricher(IContactEnricher):
+    """
+    Kombinierter KI-Aufruf mit demselben Cache wie die Einzel-Erkenner:
+    gecachte Felder werden übernommen, angefragt wird nur, wenn danach noch
+    mehr als ein Feld offen ist (sonst greifen die Einzelschritte).
+    """
+
+    def __init__(self, ai_service: OpenAIService, cache: Optional[ClassificationCache] = None):
+        self.ai = ai_service
+        self.cache = cache
+
+    def enrich(self, contact: Contact) -> Dict[str, str]:
+        fields = _open_fields(contact)
+        result = _cached_fields(self.cache, self.ai, contact, fields)
+        fields = [name for name in fields if name not in result]
+        if len(fields) > 1:
+            combined = self.ai.enrich_contact(contact)
+            _store_fields(self.cache, self.ai, contact, combined)
+            result.update((name, combined[name]) for name in fields if name in combined)
+        return result
+
+
+class AsyncOpenAIGenderDetector(IAsyncGenderDetector):
+    def __init__(self, ai_service: OpenAIService, cache: Optional[ClassificationCache] = None):
+        self.ai = ai_service
+        self.cache = cache
+
+    async def detect(self, contact: Contact) -> str:
+        return await _acached(
+            self.cache, self.ai, "gender", contact, self.ai.adetect_gender, "-"
+        )
+
+
+class AsyncOpenAILanguageDetector(IAsyncLanguageDetector):
+    def __init__(self, ai_service: OpenAIService, cache: Optional[ClassificationCache] = None):
+        self.ai = ai_service
+        self.cache = cache
+
+    async def detect(self, contact: Contact) -> str:
+        return await _acached(
+            self.cache, self.ai, "language", contact, self.ai.adetect_language, ""
+        )
+
+
+class AsyncOpenAIAnredeGenerator(IAsyncAnredeGenerator):
+    def __init__(self, ai_service: OpenAIService):
+        self.ai = ai_service
+
+    async def generate(self, contact: Contact) -> str:
+        return await self.ai.agenerate_briefanrede(contact)
+
+
+class AsyncOpenAIContactEnricher(IAsyncContactEnricher):
+    def __init__(self, ai_service: OpenAIService, cache: Optional[ClassificationCache] = None):
+        self.ai = ai_service
+        self.cache = cache
+
+    async def enrich(self, contact: Contact) -> Dict[str, str]:
+        fields = _open_fields(contact)
+        result = _cached_fields(self.cache, self.ai, contact, fields)
+        fields = [name for name in fields if name not in result]
+        if len(fields) > 1:
+            combined = await self.ai.aenrich_contact(contact)
+            _store_fields(self.cache, self.ai, contact, combined)
+            result.update((name, combined[name]) for name in fields if name in combined)
+        return result
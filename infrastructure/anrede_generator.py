@@ -0,0 +1,23 @@
+from typing import Optional
+
+from application.interfaces import IAnredeGenerator
+from domain.briefanrede import generate_briefanrede, supports
+from domain.contact import Contact
+
+
+class RuleBasedAnredeGenerator(IAnredeGenerator):
+    """
+    Briefanrede aus den Regeln in domain.briefanrede (ohne Netzwerk).
+    Nur für Sprachen ohne hinterlegtes Muster wird an `fallback`
+    (z. B. OpenAIAnredeGenerator) eskaliert; `escalations` zählt diese Fälle.
+    """
+
+    def __init__(self, fallback: Optional[IAnredeGenerator] = None):
+        self.fallback = fallback
+        self.escalations = 0
+
+    def generate(self, contact: Contact) -> str:
+        if supports(contact) or self.fallback is None:
+            return generate_briefanrede(contact)
+        self.escalations += 1
+        return self.fallback.generate(contact)
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict
+
+
+class CircuitBreaker:
+    """
+    Schutzschalter für externe Aufrufe (OpenAI).
+
+    closed:    Aufrufe laufen durch; Erfolg/Fehler der letzten `window`
+               Aufrufe werden mitgeschrieben.
+    open:      Fehlerquote über `failure_threshold` (bei mindestens
+               `min_calls` Aufrufen) → Aufrufe werden für `open_seconds`
+               sofort abgewiesen, der Aufrufer nutzt seinen lokalen Fallback.
+    half_open: Nach Ablauf darf ein Probeaufruf durch; Erfolg schließt den
+               Schalter wieder, ein Fehler öffnet ihn erneut.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._metrics: Dict[str, int] = {
+            "successes": 0,
+            "failures": 0,
+            "ignored": 0,
+            "short_circuits": 0,
+            "opened": 0,
+            "half_opened": 0,
+            "closed": 0,
+        }
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance()
+            return self._state
+
+    def _advance(self) -> None:
+        # open → half_open, sobald die Sperrzeit abgelaufen ist
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+            self._metrics["half_opened"] += 1
+
+    def allow(self) -> bool:
+        """True, wenn ein Aufruf stattfinden darf; sonst Fallback verwenden."""
+        with self._lock:
+            self._advance()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._metrics["short_circuits"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._metrics["successes"] += 1
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                self._metrics["closed"] += 1
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._metrics["failures"] += 1
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            calls = len(self._outcomes)
+            failures = calls - sum(self._outcomes)
+            if (
+                self._state == self.CLOSED
+                and calls >= self.min_calls
+                and failures / calls >= self.failure_threshold
+            ):
+                self._open()
+
+    def record_ignored(self) -> None:
+        """
+        Aufruf ohne Aussage über die Gegenstelle (z. B. ungültige Anfrage):
+        zählt weder als Erfolg noch als Fehler, gibt aber einen Probeaufruf frei.
+        """
+        with self._lock:
+            self._metrics["ignored"] += 1
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self._metrics["opened"] += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Zähler je Zustandswechsel plus aktueller Zustand und Fehlerquote."""
+        with self._lock:
+            self._advance()
+            calls = len(self._outcomes)
+            stats: Dict[str, object] = dict(self._metrics)
+            stats["state"] = self._state
+            stats["failure_rate"] = (calls - sum(self._outcomes)) / calls if calls else 0.0
+            return stats
@@ -0,0 +1,132 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normiert einen Namen für den Cache-Schlüssel:
+    NFC, Groß-/Kleinschreibung ignoriert, Mehrfach-Leerzeichen zusammengefasst.
+    """
+    return " ".join(unicodedata.normalize("NFC", name).casefold().split())
+
+
+class ClassificationCache:
+    """
+    Persistenter Cache für KI-Klassifikationen (Geschlecht, Sprache) in SQLite.
+
+    Schlüssel ist ein Hash aus Art, normalisiertem Namen, Modell und
+    Prompt-Version; eine Prompt-Änderung macht alte Einträge damit
+    automatisch unerreichbar. Einträge verfallen nach `ttl` Sekunden,
+    über `max_entries` hinaus wird nach LRU (letzter Zugriff) verdrängt.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        ttl: Optional[float] = 30 * 24 * 3600,
+        max_entries: int = 100_000,
+    ):
+        """
+        :param path: Pfad zur SQLite-Datei (":memory:" für flüchtig)
+        :param ttl: Lebensdauer eines Eintrags in Sekunden (None = unbegrenzt)
+        :param max_entries: Obergrenze der Einträge, danach LRU-Verdrängung
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS classifications ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_classifications_accessed"
+            " ON classifications(accessed)"
+        )
+        self._conn.commit()
+        (self._size,) = self._conn.execute(
+            "SELECT COUNT(*) FROM classifications"
+        ).fetchone()
+
+    @staticmethod
+    def make_key(kind: str, name: str, model: str, prompt_version: str) -> str:
+        """Inhaltsadressierter Schlüssel für eine Klassifikation."""
+        raw = "\x1f".join((kind, normalize_name(name), model, prompt_version))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Liefert den gecachten Wert oder None (abgelaufen/nicht vorhanden)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM classifications WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM classifications WHERE key = ?", (key,))
+                self._conn.commit()
+                self._size -= 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE classifications SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Legt einen Wert ab und verdrängt bei Bedarf die ältesten Einträge."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO classifications (key, value, created, accessed)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if cur.rowcount == 1:
+                self._size += 1
+            else:
+                self._conn.execute(
+                    "UPDATE classifications SET value = ?, created = ?, accessed = ?"
+                    " WHERE key = ?",
+                    (value, now, now, key),
+                )
+            excess = self._size - self.max_entries
+            if excess > 0:
+                cur = self._conn.execute(
+                    "DELETE FROM classifications WHERE key IN ("
+                    " SELECT key FROM classifications ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                )
+                self._size -= cur.rowcount
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Trefferzähler für Monitoring/Reporting."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "size": self._size,
+            }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
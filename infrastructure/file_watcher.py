@@ -0,0 +1,94 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (mtime_ns, Größe, Inode) bzw. None, wenn die Datei fehlt
+Signature = Optional[Tuple[int, int, int]]
+
+
+def _signature(path: str) -> Signature:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class FileWatcher:
+    """
+    Beobachtet Dateien per mtime-Polling (plattformunabhängig, ohne inotify).
+
+    Eine Änderung löst `callback` erst aus, wenn sich die Dateien
+    `debounce` Sekunden lang nicht mehr verändert haben; mehrere schnell
+    aufeinanderfolgende Schreibvorgänge (Editor, Journal + Verdichtung)
+    führen so zu genau einem Aufruf. Der Callback läuft im Watcher-Thread.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        callback: Callable[[], None],
+        interval: float = 1.0,
+        debounce: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param paths: zu beobachtende Dateien (dürfen fehlen)
+        :param interval: Abstand zwischen zwei Prüfungen in Sekunden
+        :param debounce: Ruhezeit nach der letzten Änderung in Sekunden
+        """
+        self.paths = list(paths)
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self._clock = clock
+        self._seen: Dict[str, Signature] = {p: _signature(p) for p in self.paths}
+        self._pending: Optional[Dict[str, Signature]] = None
+        self._changed_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """Eine Prüfung; True, wenn der Callback dabei ausgelöst wurde."""
+        current = {p: _signature(p) for p in self.paths}
+        now = self._clock()
+        if current == self._seen:
+            self._pending = None
+            return False
+        if current != self._pending:
+            # Neue (oder weitere) Änderung: Ruhezeit beginnt von vorn
+            self._pending = current
+            self._changed_at = now
+            if self.debounce > 0:
+                return False
+        if now - self._changed_at < self.debounce:
+            return False
+        self._seen = current
+        self._pending = None
+        try:
+            self.callback()
+        except Exception:
+            logger.exception("Callback des FileWatchers fehlgeschlagen")
+        return True
+
+    def start(self) -> "FileWatcher":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="file-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
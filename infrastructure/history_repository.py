@@ -1,14 +1,296 @@
-from typing import List
+import json
+import sqlite3
+import threading
+from collections import deque
+from collections.abc import Sequence
+from itertools import count, islice
+from typing import Deque, Iterable, Iterator, List, Optional
 from application.interfaces import IHistoryRepository
 from domain.contact import Contact
 
 
+def _replace_by_id(entries, contact: Contact) -> bool:
+    """Ersetzt den Eintrag mit derselben history_id (lineare Suche)."""
+    if contact.history_id is None:
+        return False
+    for index, stored in enumerate(entries):
+        if stored.history_id == contact.history_id:
+            entries[index] = contact
+            return True
+    return False
+
+
 class InMemoryHistoryRepository(IHistoryRepository):
     def __init__(self):
         self._store: List[Contact] = []
+        self._ids = count(1)
 
     def save(self, contact: Contact) -> None:
+        contact.history_id = next(self._ids)
         self._store.append(contact)
 
-    def list(self) -> List[Contact]:
-        return list(self._store)
+    def update(self, contact: Contact) -> bool:
+        return _replace_by_id(self._store, contact)
+
+    def list(self, offset: int = 0, limit: Optional[int] = None) -> List[Contact]:
+        end = None if limit is None else offset + limit
+        return self._store[offset:end]
+
+    def trim(self, max_size: int) -> None:
+        excess = len(self._store) - max_size
+        if excess > 0:
+            del self._store[:excess]
+
+    def count(self) -> int:
+        return len(self._store)
+
+
+class HistoryView(Sequence):
+    """
+    Schreibgeschützte, nicht kopierende Sicht auf einen Ringpuffer.
+    Die Sicht ist live: spätere Speicherungen/Verdrängungen sind sofort sichtbar.
+    """
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, buffer: Deque[Contact]):
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._buffer[i] for i in range(*index.indices(len(self._buffer)))]
+        return self._buffer[index]
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self._buffer)
+
+
+class RingBufferHistoryRepository(IHistoryRepository):
+    """
+    Begrenzte In-Memory-Historie auf Basis von deque(maxlen).
+    save() verdrängt bei voller Kapazität den ältesten Eintrag in O(1);
+    der Speicherbedarf ist damit unabhängig von der Anzahl der Speicherungen.
+    """
+
+    def __init__(self, max_size: int = 10):
+        self._buffer: Deque[Contact] = deque(maxlen=max_size)
+        self._ids = count(1)
+
+    @property
+    def max_size(self) -> int:
+        return self._buffer.maxlen
+
+    def save(self, contact: Contact) -> None:
+        contact.history_id = next(self._ids)
+        self._buffer.append(contact)
+
+    def save_many(self, contacts: Iterable[Contact]) -> None:
+        ids = self._ids
+
+        def numbered():
+            for contact in contacts:
+                contact.history_id = next(ids)
+                yield contact
+
+        self._buffer.extend(numbered())
+
+    def update(self, contact: Contact) -> bool:
+        return _replace_by_id(self._buffer, contact)
+
+    def list(self, offset: int = 0, limit: Optional[int] = None) -> List[Contact]:
+        end = None if limit is None else offset + limit
+        return list(islice(self._buffer, offset, end))
+
+    def view(self) -> HistoryView:
+        """Live-Sicht ohne Kopie (z. B. für die Anzeige)."""
+        return HistoryView(self._buffer)
+
+    def trim(self, max_size: int) -> None:
+        # Im Normalfall (max_size == Kapazität) ist nichts zu tun
+        while len(self._buffer) > max_size:
+            self._buffer.popleft()
+
+    def count(self) -> int:
+        return len(self._buffer)
+
+
+_COLUMNS = (
+    "anrede",
+    "titel",
+    "vorname",
+    "nachname",
+    "geschlecht",
+    "sprache",
+    "briefanrede",
+    "needs_review",
+    "inaccuracies",
+    "review_fields",
+)
+_SELECT = f"SELECT {', '.join(_COLUMNS)}, id FROM history"
+_INSERT = (
+    f"INSERT INTO history ({', '.join(_COLUMNS)})"
+    f" VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+_UPDATE = f"UPDATE history SET {', '.join(c + ' = ?' for c in _COLUMNS)} WHERE id = ?"
+
+
+def _to_row(contact: Contact) -> tuple:
+    return (
+        contact.anrede,
+        contact.titel,
+        contact.vorname,
+        contact.nachname,
+        contact.geschlecht,
+        contact.sprache,
+        contact.briefanrede,
+        int(contact.needs_review),
+        json.dumps(contact.inaccuracies, ensure_ascii=False),
+        json.dumps(contact.review_fields, ensure_ascii=False),
+    )
+
+
+def _from_row(row: tuple) -> Contact:
+    return Contact(
+        anrede=row[0],
+        titel=row[1],
+        vorname=row[2],
+        nachname=row[3],
+        geschlecht=row[4],
+        sprache=row[5],
+        briefanrede=row[6],
+        needs_review=bool(row[7]),
+        inaccuracies=json.loads(row[8]),
+        review_fields=json.loads(row[9]),
+        history_id=row[10],
+    )
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+class SQLiteHistoryRepository(IHistoryRepository):
+    """
+    Persistente Kontakt-Historie in SQLite (WAL-Modus).
+
+    Reihenfolge ist die Einfügereihenfolge (AUTOINCREMENT-id). Vor- und
+    Nachname sind mit NOCASE indiziert, sodass search() als Index-Bereichs-
+    suche läuft; list() und search() laden immer nur eine Seite.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        :param path: Pfad zur SQLite-Datei (":memory:" für flüchtig)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " anrede TEXT NOT NULL,"
+            " titel TEXT NOT NULL,"
+            " vorname TEXT NOT NULL COLLATE NOCASE,"
+            " nachname TEXT NOT NULL COLLATE NOCASE,"
+            " geschlecht TEXT NOT NULL,"
+            " sprache TEXT NOT NULL,"
+            " briefanrede TEXT NOT NULL,"
+            " needs_review INTEGER NOT NULL,"
+            " inaccuracies TEXT NOT NULL,"
+            " review_fields TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_history_nachname ON history(nachname)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_history_vorname ON history(vorname)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_history_needs_review ON history(needs_review)"
+        )
+        self._conn.commit()
+
+    def save(self, contact: Contact) -> None:
+        with self._lock:
+            cursor = self._conn.execute(_INSERT, _to_row(contact))
+            self._conn.commit()
+        contact.history_id = cursor.lastrowid
+
+    def save_many(self, contacts: Iterable[Contact]) -> None:
+        """
+        Schreibt alle Kontakte in einer Transaktion (executemany). Die ids
+        sind innerhalb der Transaktion fortlaufend und werden danach vergeben.
+        """
+        contacts = list(contacts)
+        if not contacts:
+            return
+        with self._lock:
+            self._conn.executemany(_INSERT, (_to_row(c) for c in contacts))
+            (last,) = self._conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'history'"
+            ).fetchone()
+            self._conn.commit()
+        for offset, contact in enumerate(contacts):
+            contact.history_id = last - len(contacts) + 1 + offset
+
+    def update(self, contact: Contact) -> bool:
+        if contact.history_id is None:
+            return False
+        with self._lock:
+            cursor = self._conn.execute(_UPDATE, _to_row(contact) + (contact.history_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def list(self, offset: int = 0, limit: Optional[int] = None) -> List[Contact]:
+        with self._lock:
+            rows = self._conn.execute(
+                _SELECT + " ORDER BY id LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [_from_row(r) for r in rows]
+
+    def list_needs_review(self, offset: int = 0, limit: Optional[int] = None) -> List[Contact]:
+        """Nur Kontakte mit Prüfbedarf (über den needs_review-Index)."""
+        with self._lock:
+            rows = self._conn.execute(
+                _SELECT + " WHERE needs_review = 1 ORDER BY id LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [_from_row(r) for r in rows]
+
+    def search(self, prefix: str, limit: int = 50) -> List[Contact]:
+        pattern = _like_prefix(prefix)
+        with self._lock:
+            rows = self._conn.execute(
+                _SELECT + " WHERE id IN ("
+                " SELECT id FROM history WHERE nachname LIKE ? ESCAPE '\\'"
+                " UNION SELECT id FROM history WHERE vorname LIKE ? ESCAPE '\\')"
+                " ORDER BY id LIMIT ?",
+                (pattern, pattern, limit),
+            ).fetchall()
+        return [_from_row(r) for r in rows]
+
+    def trim(self, max_size: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM history WHERE id <= ("
+                " SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (max_size,),
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()
+        return n
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
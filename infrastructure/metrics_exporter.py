@@ -0,0 +1,143 @@
+import logging
+import math
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from application.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format(value) -> str:
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+def render_prometheus(registry: MetricsRegistry) -> str:
+    """Stand der Registry im Prometheus-Textformat."""
+    lines = []
+    for sample in registry.collect():
+        help_text = sample.help.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {sample.name} {help_text}")
+        lines.append(f"# TYPE {sample.name} {sample.kind}")
+        lines.append(f"{sample.name} {_format(sample.value)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHTTPServer:
+    """
+    Lokaler HTTP-Endpunkt GET /metrics für Prometheus-Scrapes.
+    Läuft in einem Daemon-Thread; port=0 wählt einen freien Port.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._port = port
+
+    @property
+    def port(self) -> int:
+        """Tatsächlicher Port (nach start() auch bei port=0)."""
+        if self._server is not None:
+            return self._server.server_address[1]
+        return self._port
+
+    def _handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_prometheus(registry).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> "MetricsHTTPServer":
+        if self._server is None:
+            self._server = ThreadingHTTPServer((self.host, self._port), self._handler())
+            self._server.daemon_threads = True
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="metrics-http", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+
+class TextFileExporter:
+    """
+    Schreibt den Stand der Registry atomar als Prometheus-Textdatei, z. B.
+    für den Textfile-Collector des node_exporters bei Stapelläufen.
+    Mit `interval` zusätzlich periodisch aus einem Hintergrund-Thread.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: Optional[float] = None):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def flush(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".metrics.", suffix=".prom.tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(render_prometheus(self.registry))
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def start(self) -> "TextFileExporter":
+        if self.interval is not None and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="metrics-textfile", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except OSError:
+                logger.exception(f"Kennzahlen nicht nach {self.path} geschrieben")
+
+    def stop(self) -> None:
+        """Beendet den Hintergrund-Thread und schreibt den Endstand."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
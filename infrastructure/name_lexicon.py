@@ -0,0 +1,188 @@
+import os
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional
+
+from application.interfaces import IContactEnricher, IGenderDetector, ILanguageDetector
+from domain.contact import Contact
+
+DEFAULT_LEXICON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "first_names.tsv"
+)
+
+
+class LexiconEntry(NamedTuple):
+    gender: str
+    gender_confidence: float
+    language: str
+    language_confidence: float
+
+
+class NameLexicon:
+    """
+    Kompaktes, lokales Vornamen-Lexikon (first_names.tsv).
+
+    Die Namen liegen als sortierte Liste von Strings vor und werden per
+    Binärsuche gefunden; Geschlecht und Sprache sind als Codes in parallelen
+    Arrays abgelegt, die Konfidenzen als float-Arrays. Außer dem Namen selbst
+    gibt es also kein Objekt pro Eintrag (kein Tupel, kein LexiconEntry).
+    """
+
+    def __init__(self, path: str = DEFAULT_LEXICON_PATH):
+        """
+        :param path: TSV mit name, gender, gender_confidence, language, language_confidence
+        """
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                name, gender, g_conf, lang, l_conf = line.rstrip("\n").split("\t")
+                rows.append((self.normalize(name), gender, float(g_conf), lang, float(l_conf)))
+        rows.sort()
+
+        self._codes: List[str] = sorted({r[1] for r in rows} | {r[3] for r in rows})
+        code_index = {code: i for i, code in enumerate(self._codes)}
+        self._names: List[str] = [r[0] for r in rows]
+        self._genders = array("B", (code_index[r[1]] for r in rows))
+        self._gender_conf = array("f", (r[2] for r in rows))
+        self._languages = array("B", (code_index[r[3]] for r in rows))
+        self._language_conf = array("f", (r[4] for r in rows))
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return unicodedata.normalize("NFC", name.strip()).casefold()
+
+    def lookup(self, first_name: str) -> Optional[LexiconEntry]:
+        """Liefert den Lexikon-Eintrag zu einem Vornamen oder None."""
+        key = self.normalize(first_name)
+        i = bisect_left(self._names, key)
+        if i == len(self._names) or self._names[i] != key:
+            return None
+        return LexiconEntry(
+            self._codes[self._genders[i]],
+            self._gender_conf[i],
+            self._codes[self._languages[i]],
+            self._language_conf[i],
+        )
+
+    def lookup_contact(self, contact: Contact) -> Optional[LexiconEntry]:
+        """
+        Sucht den ersten Vornamen eines Kontakts; bei Doppelnamen
+        ("Karl-Heinz") wird zuerst der volle Name, dann der erste Teil versucht.
+        """
+        tokens = contact.vorname.split()
+        if not tokens:
+            return None
+        first = tokens[0]
+        entry = self.lookup(first)
+        if entry is None and "-" in first:
+            entry = self.lookup(first.split("-", 1)[0])
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class LexiconGenderDetector(IGenderDetector):
+    """
+    Geschlechtserkennung aus dem lokalen Lexikon; nur bei unbekannten oder
+    unsicheren Vornamen wird an `fallback` (z. B. OpenAI) weitergereicht.
+    """
+
+    def __init__(
+        self,
+        lexicon: NameLexicon,
+        fallback: Optional[IGenderDetector] = None,
+        min_confidence: float = 0.9,
+    ):
+        self.lexicon = lexicon
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self.hits = 0
+        self.escalations = 0
+
+    def detect(self, contact: Contact) -> str:
+        entry = self.lexicon.lookup_contact(contact)
+        if entry is not None and entry.gender_confidence >= self.min_confidence:
+            self.hits += 1
+            return entry.gender
+        if self.fallback is None:
+            return "-"
+        self.escalations += 1
+        return self.fallback.detect(contact)
+
+
+class LexiconLanguageDetector(ILanguageDetector):
+    """
+    Spracherkennung aus dem lokalen Lexikon; nur bei unbekannten oder
+    mehrdeutigen Vornamen wird an `fallback` (z. B. OpenAI) weitergereicht.
+    """
+
+    def __init__(
+        self,
+        lexicon: NameLexicon,
+        fallback: Optional[ILanguageDetector] = None,
+        min_confidence: float = 0.9,
+    ):
+        self.lexicon = lexicon
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self.hits = 0
+        self.escalations = 0
+
+    def detect(self, contact: Contact) -> str:
+        entry = self.lexicon.lookup_contact(contact)
+        if entry is not None and entry.language_confidence >= self.min_confidence:
+            self.hits += 1
+            return entry.language
+        if self.fallback is None:
+            return ""
+        self.escalations += 1
+        return self.fallback.detect(contact)
+
+
+class LexiconContactEnricher(IContactEnricher):
+    """
+    Vorstufe für den kombinierten Erkenner: Geschlecht und Sprache kommen,
+    wenn sicher, aus dem Lexikon. Nur wenn danach noch mehr als ein Feld
+    offen ist, wird `fallback` (ein einzelner kombinierter KI-Aufruf) gefragt.
+    """
+
+    def __init__(
+        self,
+        lexicon: NameLexicon,
+        fallback: Optional[IContactEnricher] = None,
+        min_confidence: float = 0.9,
+    ):
+        self.lexicon = lexicon
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self.escalations = 0
+
+    def enrich(self, contact: Contact) -> Dict[str, str]:
+        result: Dict[str, str] = {}
+        entry = self.lexicon.lookup_contact(contact)
+        if entry is not None:
+            if contact.geschlecht == "-" and entry.gender_confidence >= self.min_confidence:
+                result["geschlecht"] = entry.gender
+            if not contact.sprache and entry.language_confidence >= self.min_confidence:
+                result["sprache"] = entry.language
+
+        open_fields = [
+            name
+            for name, missing in (
+                ("geschlecht", contact.geschlecht == "-" and bool(contact.vorname)),
+                ("sprache", not contact.sprache),
+                ("briefanrede", not contact.briefanrede),
+            )
+            if missing and name not in result
+        ]
+        if self.fallback is not None and len(open_fields) > 1:
+            self.escalations += 1
+            combined = self.fallback.enrich(contact)
+            for name in open_fields:
+                if name in combined:
+                    result[name] = combined[name]
+        return result
@@ -1,11 +1,130 @@
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import replace
+from functools import partial
+from typing import Callable, Dict, Optional
+
 from application.interfaces import INameParser, ITitleRepository
 from domain.contact import Contact
-from domain.name_parser import parse_name_to_contact
+from domain.name_parser import compile_titles, parse_name_to_contact
+
+logger = logging.getLogger(__name__)
 
 
 class DomainNameParser(INameParser):
-    def __init__(self, title_repo: ITitleRepository):
+    def __init__(
+        self,
+        title_repo: ITitleRepository,
+        snapshot_path: Optional[str] = None,
+        reload_interval: Optional[float] = None,
+    ):
+        """
+        :param snapshot_path: Datei für den binären Titel-Snapshot der
+            Worker-Prozesse (None = kompilierten Trie picklen)
+        :param reload_interval: Worker beobachten titles.json in diesem
+            Abstand (Sekunden) und übernehmen Änderungen (None = aus)
+        """
         self.title_repo = title_repo
+        self.snapshot_path = snapshot_path
+        self.reload_interval = reload_interval
 
     def parse(self, raw_input: str) -> Contact:
         return parse_name_to_contact(raw_input, self.title_repo)
+
+    def parse_function(self) -> Callable[[str], Contact]:
+        # Nur die kompilierte Titeltabelle wird an die Worker übertragen,
+        # nicht das Repository samt Datei-Zustand. Mit Snapshot ist das
+        # lediglich der Pfad; die Worker blenden die Datei per mmap ein.
+        titles = None
+        if self.snapshot_path is not None:
+            from infrastructure.title_snapshot import ReloadingTitleTable, ensure_snapshot
+
+            try:
+                titles = ensure_snapshot(self.title_repo, self.snapshot_path)
+                file_path = getattr(self.title_repo, "file_path", None)
+                if self.reload_interval is not None and file_path:
+                    # Beobachtet wird erst im Worker (nach dem Unpickeln)
+                    titles = ReloadingTitleTable(
+                        file_path,
+                        self.snapshot_path,
+                        interval=self.reload_interval,
+                        journal=getattr(self.title_repo, "journal", False),
+                        watch=False,
+                    )
+            except OSError as e:
+                logger.warning(f"Titel-Snapshot nicht verfügbar ({e}), übertrage Trie")
+        if titles is None:
+            titles = compile_titles(self.title_repo)
+        return partial(parse_name_to_contact, title_repo=titles)
+
+
+class CachingNameParser(INameParser):
+    """
+    LRU-Memoisierung vor einem INameParser.
+
+    Schlüssel ist die NFC-normalisierte Eingabe; der Cache gilt nur für die
+    aktuelle `version` des Titel-Repositories und wird bei jeder Titel-
+    Änderung (z. B. über die Titelverwaltung) verworfen. Geliefert werden
+    stets Kopien, da ContactService die Kontakte weiter befüllt.
+    """
+
+    def __init__(self, parser: INameParser, title_repo: ITitleRepository, max_size: int = 10_000):
+        self.parser = parser
+        self.title_repo = title_repo
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._version = getattr(title_repo, "version", 0)
+        self._cache: "OrderedDict[str, Contact]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _copy(contact: Contact) -> Contact:
+        return replace(
+            contact,
+            inaccuracies=list(contact.inaccuracies),
+            review_fields=list(contact.review_fields),
+        )
+
+    def parse(self, raw_input: str) -> Contact:
+        key = unicodedata.normalize("NFC", raw_input.strip()) if raw_input else ""
+        version = getattr(self.title_repo, "version", 0)
+        with self._lock:
+            if version != self._version:
+                self._cache.clear()
+                self._version = version
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._copy(cached)
+            self.misses += 1
+
+        contact = self.parser.parse(raw_input)
+        with self._lock:
+            # Nur ablegen, wenn sich die Titel währenddessen nicht geändert haben
+            if version == self._version:
+                self._cache[key] = self._copy(contact)
+                if len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+        return contact
+
+    def parse_function(self) -> Callable[[str], Contact]:
+        # Worker-Prozesse parsen ohne den (prozesslokalen) Cache
+        return self.parser.parse_function()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "size": len(self._cache),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -1,16 +1,182 @@
 # infrastructure/openai_service.py
 
+import asyncio
+import hashlib
+import json
 import os
+import random
+import threading
 import time
 import logging
-from typing import Optional
-
-from openai import OpenAI
+import weakref
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from application.metrics import MetricsRegistry
+from application.interfaces import ITracer
+from application.tracing import NULL_TRACER
+from domain.briefanrede import generate_briefanrede as local_briefanrede
 from domain.contact import Contact
+from infrastructure.circuit_breaker import CircuitBreaker
+from infrastructure.rate_limiter import RateLimiter, TokenBudget
+
+if TYPE_CHECKING:  # openai wird erst beim ersten API-Aufruf importiert
+    from openai import AsyncOpenAI, OpenAI
 
 logger = logging.getLogger(__name__)
 
+# Pauschale für die Antwortlänge bei der Token-Schätzung vor dem Aufruf
+_COMPLETION_TOKEN_ESTIMATE = 64
+
+# Listenpreise in USD je 1 Mio. Tokens (Eingabe, Ausgabe) für die Kostenschätzung;
+# datierte Modellversionen ("gpt-4o-2024-08-06") gelten über den Präfix
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+# Die Batch-API rechnet zum halben Preis ab
+BATCH_PRICE_FACTOR = 0.5
+
+# Zähler in stats() bzw. als kontaktsplitter_openai_<name>_total
+_COUNTERS = {
+    "requests": "Gestellte OpenAI-Anfragen (ohne Retries)",
+    "retries": "Wiederholte Versuche nach vorübergehenden Fehlern",
+    "failures": "Fehlgeschlagene Versuche",
+    "timeouts": "Versuche mit Zeitüberschreitung",
+    "short_circuits": "Wegen offenem Circuit Breaker übersprungene Anfragen",
+    "budget_exhausted": "Wegen aufgebrauchtem Token-Budget übersprungene Anfragen",
+    "tokens": "Verbrauchte Tokens (laut usage, sonst geschätzt)",
+    "prompt_tokens": "Eingabe-Tokens laut usage",
+    "completion_tokens": "Ausgabe-Tokens laut usage",
+    "cost_usd": "Geschätzte Kosten in USD nach MODEL_PRICES",
+}
+
+_LANGUAGE_MAPPING = {
+    "deutsch": "de",
+    "german": "de",
+    "de": "de",
+    "englisch": "en",
+    "english": "en",
+    "en": "en",
+    "franz": "fr",
+    "french": "fr",
+    "fr": "fr",
+    "italien": "it",
+    "italian": "it",
+    "it": "it",
+    "spanisch": "es",
+    "spanish": "es",
+    "es": "es",
+    "-": "",
+    "unknown": "",
+    "unbekannt": "",
+}
+
+
+def _parse_gender(raw: str) -> Optional[str]:
+    """Übersetzt eine Modellantwort in 'm'/'w'/'-'; None, wenn nicht erkennbar."""
+    raw = raw.strip().lower()
+    if raw in {"m", "male", "man"}:
+        return "m"
+    if raw in {"w", "female", "woman"}:
+        return "w"
+    if raw in {"-", "unknown", "unbekannt", ""}:
+        return "-"
+    return None
+
+
+def _parse_language(raw: str) -> Optional[str]:
+    """Übersetzt eine Modellantwort in einen Sprachcode ('' = unbekannt); None, wenn nicht erkennbar."""
+    raw = raw.strip().lower()
+    if not raw:
+        return ""
+    for key, code in _LANGUAGE_MAPPING.items():
+        if key in raw:
+            return code
+    return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Vorübergehende Fehler (Timeout, Verbindung, 408/409/429, 5xx) lohnen
+    einen neuen Versuch; Auth- und andere Client-Fehler (4xx) nicht.
+    """
+    from openai import APIConnectionError  # umfasst auch APITimeoutError
+
+    if isinstance(error, APIConnectionError):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return False
+    return status in (408, 409, 429) or status >= 500
+
+
+def _counts_against_breaker(error: Optional[Exception]) -> bool:
+    """
+    Ob ein endgültig fehlgeschlagener Request gegen den Circuit Breaker
+    zählt: ja bei Verbindungsproblemen, 408/409/429, 5xx und Auth-Fehlern
+    (401/403); andere Client-Fehler betreffen nur die einzelne Anfrage.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return True
+    return status in (401, 403, 408, 409, 429) or status >= 500
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Vom Server verlangte Wartezeit (Retry-After bzw. retry-after-ms) oder None."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def _estimate_tokens(args: dict) -> int:
+    """Grobe Token-Schätzung (≈ 4 Zeichen je Token) für Rate-Limit und Budget."""
+    chars = sum(len(message["content"]) for message in args["messages"])
+    return chars // 4 + _COMPLETION_TOKEN_ESTIMATE
+
+
+def _usage(resp, estimate: int) -> Tuple[int, int]:
+    """(Eingabe-, Ausgabe-Tokens) laut usage-Feld, sonst aus der Schätzung."""
+    usage = getattr(resp, "usage", None)
+    prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "completion_tokens", None)
+    if prompt is None or completion is None:
+        return estimate - _COMPLETION_TOKEN_ESTIMATE, _COMPLETION_TOKEN_ESTIMATE
+    return prompt, completion
+
+
+def _model_prices(model: str) -> Optional[Tuple[float, float]]:
+    """Preise des Modells bzw. des längsten passenden Präfixes; None = unbekannt."""
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model == name or model.startswith(name + "-"):
+            return MODEL_PRICES[name]
+    return None
+
+
+def _contact_context(contact: Contact) -> str:
+    """Kontext-Zusammenbau aus allen befüllten Feldern für die Prompts."""
+    parts = []
+    for label, val in [
+        ("Anrede", contact.anrede),
+        ("Titel", contact.titel),
+        ("Vorname", contact.vorname),
+        ("Nachname", contact.nachname),
+        ("Sprache", contact.sprache),
+    ]:
+        if val:
+            parts.append(f"{label}: {val}")
+    return "\n".join(parts)
+
 
 class OpenAIService:
     """
@@ -20,122 +186,721 @@ class OpenAIService:
       - Briefanrede-Generierung via GPT-4o
 
     Mit:
-      * Exponential Backoff bei API-Fehlern
-      * Fallback auf Generic-Salutation, falls alle Versuche fehlschlagen
+      * Timeout pro Request und einem gemeinsamen (gepoolten) HTTP-Client
+      * Exponential Backoff mit Full Jitter, nur bei vorübergehenden Fehlern
+        (Retry-After wird als Mindestwartezeit beachtet)
+      * Circuit Breaker: bei hoher Fehlerquote sofort lokale Fallbacks
+        (Briefanrede nach Regeln, Geschlecht "-")
+      * optionalem Rate-Limit (Requests/Tokens pro Minute, auch über
+        Prozesse hinweg) und Token-Budget je Job (danach lokale Fallbacks)
+      * async-Varianten (a*-Methoden) für nebenläufige Massenverarbeitung
     """
 
+    # Sync-Clients je (Key, URL, Timeout) prozessweit geteilt: ein Connection-Pool
+    # für alle Service-Instanzen statt eines eigenen pro Instanz
+    _shared_clients: Dict[Tuple[str, Optional[str], float], "OpenAI"] = {}
+    _shared_lock = threading.Lock()
+
+    GENDER_PROMPT = (
+        "You are an assistant that classifies a first name as male, "
+        "female, or unknown. Answer with 'm', 'w', or '-' exactly."
+        "You do this by checking the name against the common names of the given language that name comes from."
+    )
+    LANGUAGE_PROMPT = (
+        "You are an assistant that detects the language/origin of a name. "
+        "Answer with one of: de, en, fr, it, es, or '-' if unknown."
+    )
+    BRIEFANREDE_PROMPT = (
+        "You are a formal correspondence assistant. "
+        "Given the following contact details, generate a polite letter salutation consorting to DIN 5008"
+        "in the appropriate language and style."
+    )
+    ENRICH_PROMPT = (
+        "You are a formal correspondence assistant. "
+        "Given the following contact details, answer with a JSON object with exactly the keys "
+        "'geschlecht' ('m', 'w' or '-' if unknown, judged by the first name and its language of origin), "
+        "'sprache' (one of de, en, fr, it, es, or '-' if unknown, the language/origin of the name) and "
+        "'briefanrede' (a polite letter salutation according to DIN 5008 in that language and style)."
+    )
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: str = "gpt-4o",
         max_retries: int = 3,
         backoff_factor: float = 1.0,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0,
+        max_backoff: float = 30.0,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        budget: Optional[TokenBudget] = None,
+        tracer: Optional[ITracer] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        prices: Optional[Tuple[float, float]] = None,
     ):
+        """
+        :param max_retries: Versuche pro Anfrage (inkl. dem ersten)
+        :param timeout: Timeout pro HTTP-Request in Sekunden
+        :param max_backoff: Obergrenze der Wartezeit zwischen Versuchen
+        :param breaker: Circuit Breaker (Standard: eigener pro Service)
+        :param rate_limiter: gemeinsames Rate-Limit (None = keines)
+        :param budget: Token-Budget des laufenden Jobs (None = unbegrenzt)
+        :param tracer: Zeitmessung der Requests (Standard: aus)
+        :param metrics: Registry für die Zähler (Standard: eigene pro Service);
+            Services mit derselben Registry zählen gemeinsam
+        :param prices: USD je 1 Mio. Eingabe-/Ausgabe-Tokens
+            (Standard: MODEL_PRICES; unbekannte Modelle kosten 0)
+        """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY", "")
         if not self.api_key:
             raise ValueError("OpenAI API key required (env OPENAI_API_KEY or param).")
 
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url
+        self._client: Optional["OpenAI"] = None
+        # Je Event-Loop ein eigener Client; verfällt mit der Loop
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+            weakref.WeakKeyDictionary()
+        )
         self.model = model
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter
+        self.budget = budget
+        self.tracer = tracer or NULL_TRACER
+        self.prices = prices or _model_prices(model)
+        self.metrics = metrics or MetricsRegistry()
+        self._counters = {
+            name: self.metrics.counter(f"kontaktsplitter_openai_{name}_total", help)
+            for name, help in _COUNTERS.items()
+        }
 
-    def _request_chat_completion(self, system: str, user: str) -> str:
-        messages = [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ]
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                resp = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=0.0,
-                )
-                # .choices list und .message.content sind in jedem Release vorhanden
-                return resp.choices[0].message.content.strip()
-            except Exception as e:
-                wait = self.backoff_factor * (2 ** (attempt - 1))
-                logger.warning(
-                    f"OpenAI API attempt {attempt} failed ({e}), retry in {wait}s"
-                )
-                time.sleep(wait)
+    @property
+    def client(self) -> "OpenAI":
+        """
+        Gemeinsamer OpenAI-Client; openai wird erst beim ersten Zugriff importiert.
+        SDK-eigene Retries sind abgeschaltet, damit Backoff und Circuit Breaker
+        nur hier greifen.
+        """
+        if self._client is None:
+            key = (self.api_key, self.base_url, self.timeout)
+            with self._shared_lock:
+                client = self._shared_clients.get(key)
+                if client is None:
+                    from openai import OpenAI
+
+                    client = OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        timeout=self.timeout,
+                        max_retries=0,
+                    )
+                    self._shared_clients[key] = client
+            self._client = client
+        return self._client
+
+    @client.setter
+    def client(self, client: "OpenAI") -> None:
+        self._client = client
+
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        """
+        AsyncOpenAI-Client der laufenden Event-Loop, beim ersten async-Aufruf
+        in dieser Loop erzeugt. Seine Verbindungen gehören zu der Loop, daher
+        bekommt jeder asyncio.run()-Lauf einen eigenen Client.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = self._async_clients[loop] = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=0,
+            )
+        return client
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        self._counters[name].inc(amount)
+
+    def record_usage(self, prompt_tokens: int, completion_tokens: int, price_factor: float = 1.0) -> None:
+        """Verbucht Tokens und geschätzte Kosten (auch für Batch-Ergebnisse)."""
+        self._count("tokens", prompt_tokens + completion_tokens)
+        self._count("prompt_tokens", prompt_tokens)
+        self._count("completion_tokens", completion_tokens)
+        if self.prices is not None:
+            price_in, price_out = self.prices
+            cost = (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+            self._count("cost_usd", cost * price_factor)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Request-Zähler (requests, retries, failures, timeouts, short_circuits,
+        budget_exhausted, tokens, prompt_tokens, completion_tokens, cost_usd)
+        sowie Breaker- und Rate-Limit-Zustand.
+        """
+        stats: Dict[str, object] = {
+            name: counter.value() for name, counter in self._counters.items()
+        }
+        stats["breaker"] = self.breaker.stats()
+        if self.rate_limiter is not None:
+            stats["rate_limiter"] = self.rate_limiter.stats()
+        return stats
+
+    def prompt_version(self, kind: str) -> str:
+        """
+        Kurzer Hash des System-Prompts ("gender", "language", "briefanrede").
+        Dient als Cache-Schlüsselbestandteil: geänderte Prompts → neue Einträge.
+        """
+        prompt = {
+            "gender": self.GENDER_PROMPT,
+            "language": self.LANGUAGE_PROMPT,
+            "briefanrede": self.BRIEFANREDE_PROMPT,
+            "enrich": self.ENRICH_PROMPT,
+        }[kind]
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+    def _completion_args(self, system: str, user: str, json_mode: bool) -> dict:
+        args = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            "temperature": 0.0,
+        }
+        if json_mode:
+            args["response_format"] = {"type": "json_object"}
+        return args
+
+    def _retry_wait(self, error: Exception, attempt: int) -> float:
+        """
+        Wartezeit vor dem nächsten Versuch: exponentiell mit Full Jitter
+        (zufällig zwischen 0 und der Stufe, gedeckelt durch max_backoff),
+        mindestens aber so lange wie vom Server per Retry-After verlangt.
+        """
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        wait = random.uniform(0, ceiling)
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            wait = max(wait, retry_after)
+        return wait
+
+    def _failed_attempt(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Verbucht einen Fehlversuch; liefert die Wartezeit bis zum nächsten
+        Versuch oder None, wenn nicht erneut versucht werden soll.
+        Der Circuit Breaker erfährt erst das Ergebnis des ganzen Requests.
+        """
+        self._count("failures")
+        if type(error).__name__ == "APITimeoutError":
+            self._count("timeouts")
+        if not _is_retryable(error):
+            logger.warning(f"OpenAI API attempt {attempt} failed permanently ({error})")
+            return None
+        if attempt == self.max_retries:
+            logger.warning(f"OpenAI API attempt {attempt} failed ({error})")
+            return None
+        wait = self._retry_wait(error, attempt)
+        logger.warning(f"OpenAI API attempt {attempt} failed ({error}), retry in {wait:.2f}s")
+        self._count("retries")
+        return wait
+
+    def _admit(self) -> bool:
+        """
+        Fragt Token-Budget und Circuit Breaker einmal je Request (nicht je
+        Versuch); ist das Budget aufgebraucht oder der Schalter offen, wird
+        nicht angefragt.
+        """
+        if self.budget is not None and self.budget.exhausted:
+            self._count("budget_exhausted")
+            return False
+        if self.breaker.allow():
+            self._count("requests")
+            return True
+        self._count("short_circuits")
+        return False
+
+    def _throttle(self, estimate: int) -> float:
+        """Bucht den Aufruf beim Rate-Limiter; Rückgabe: Wartezeit davor."""
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.reserve(estimate)
+
+    async def _athrottle(self, estimate: int) -> float:
+        """
+        async-Variante von _throttle. Ein SQLite-Limiter (path gesetzt) wartet
+        auf die Schreibsperre anderer Prozesse und läuft deshalb in einem
+        Thread, damit die übrigen Tasks der Event-Loop weiterlaufen.
+        """
+        if self.rate_limiter is None:
+            return 0.0
+        if self.rate_limiter.path is None:
+            return self.rate_limiter.reserve(estimate)
+        return await asyncio.to_thread(self.rate_limiter.reserve, estimate)
+
+    def _settle(self, correction: int) -> None:
+        """Korrigiert die Token-Buchung des Rate-Limiters nach dem Aufruf."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.adjust(correction)
+
+    async def _asettle(self, correction: int) -> None:
+        """async-Variante von _settle (SQLite-Limiter wie bei _athrottle im Thread)."""
+        if self.rate_limiter is None:
+            return
+        if self.rate_limiter.path is None:
+            self.rate_limiter.adjust(correction)
+        else:
+            await asyncio.to_thread(self.rate_limiter.adjust, correction)
+
+    def _failed_request(self, error: Optional[Exception]) -> str:
+        """Meldet einen endgültig gescheiterten Request dem Breaker; Rückgabe ""."""
+        if _counts_against_breaker(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_ignored()
         logger.error("All OpenAI attempts failed, returning empty string.")
         return ""
 
+    def _succeeded(self, resp, estimate: int) -> Tuple[str, int]:
+        """
+        Verbucht Erfolg und Tokenverbrauch; liefert den Antworttext und die
+        Abweichung des Verbrauchs von der Schätzung (für _settle/_asettle).
+        Antworten ohne Text (Verweigerung, Tool-Call, Content-Filter) ergeben
+        "", damit der Aufrufer auf seinen Fallback ausweicht.
+        """
+        self.breaker.record_success()
+        prompt, completion = _usage(resp, estimate)
+        used = prompt + completion
+        self.record_usage(prompt, completion)
+        if self.budget is not None:
+            self.budget.charge(used)
+        # .choices list und .message.content sind in jedem Release vorhanden
+        choices = resp.choices
+        content = choices[0].message.content if choices else None
+        if content is None:
+            logger.warning("OpenAI response without text content, returning empty string.")
+            return "", used - estimate
+        return content.strip(), used - estimate
+
+    def _request_chat_completion(
+        self, system: str, user: str, json_mode: bool = False
+    ) -> str:
+        """
+        Liefert den Antworttext oder "" (alle Versuche fehlgeschlagen,
+        Breaker offen oder Budget aufgebraucht).
+        Spans: "openai.request" (gesamt inkl. Retries), je Versuch
+        "openai.attempt", Wartezeiten "openai.throttle" und "openai.backoff".
+        """
+        tracer = self.tracer
+        args = self._completion_args(system, user, json_mode)
+        estimate = _estimate_tokens(args)
+        with tracer.span("openai.request"):
+            if not self._admit():
+                return ""
+            error: Optional[Exception] = None
+            for attempt in range(1, self.max_retries + 1):
+                wait = self._throttle(estimate)
+                if wait:
+                    with tracer.span("openai.throttle"):
+                        time.sleep(wait)
+                try:
+                    with tracer.span("openai.attempt"):
+                        resp = self.client.chat.completions.create(**args, timeout=self.timeout)
+                except Exception as e:
+                    error = e
+                    wait = self._failed_attempt(e, attempt)
+                    if wait is None:
+                        break
+                    with tracer.span("openai.backoff"):
+                        time.sleep(wait)
+                    continue
+                text, correction = self._succeeded(resp, estimate)
+                self._settle(correction)
+                return text
+            return self._failed_request(error)
+
+    async def _arequest_chat_completion(
+        self, system: str, user: str, json_mode: bool = False
+    ) -> str:
+        """
+        async-Variante von _request_chat_completion (Backoff via asyncio.sleep,
+        gleiche Spans); ein SQLite-Rate-Limiter blockiert die Event-Loop nicht.
+        """
+        tracer = self.tracer
+        args = self._completion_args(system, user, json_mode)
+        estimate = _estimate_tokens(args)
+        with tracer.span("openai.request"):
+            if not self._admit():
+                return ""
+            error: Optional[Exception] = None
+            for attempt in range(1, self.max_retries + 1):
+                wait = await self._athrottle(estimate)
+                if wait:
+                    with tracer.span("openai.throttle"):
+                        await asyncio.sleep(wait)
+                try:
+                    with tracer.span("openai.attempt"):
+                        resp = await self.async_client.chat.completions.create(
+                            **args, timeout=self.timeout
+                        )
+                except Exception as e:
+                    error = e
+                    wait = self._failed_attempt(e, attempt)
+                    if wait is None:
+                        break
+                    with tracer.span("openai.backoff"):
+                        await asyncio.sleep(wait)
+                    continue
+                text, correction = self._succeeded(resp, estimate)
+                await self._asettle(correction)
+                return text
+            return self._failed_request(error)
+
+    # --- Prompt-Aufbau und Antwort-Auswertung (sync und async gemeinsam) ---
+
+    def _gender_request(self, name: str) -> Tuple[str, str]:
+        return self.GENDER_PROMPT, f"Full name: {name}"
+
+    def _language_request(self, name: str) -> Tuple[str, str]:
+        return self.LANGUAGE_PROMPT, f"Name: {name}"
+
+    def _briefanrede_request(self, contact: Contact) -> Tuple[str, str]:
+        return (
+            self.BRIEFANREDE_PROMPT,
+            f"{_contact_context(contact)}\n\nGenerate the salutation:",
+        )
+
+    def _enrich_request(self, contact: Contact) -> Tuple[str, str]:
+        return (
+            self.ENRICH_PROMPT,
+            f"{_contact_context(contact)}\n\nGenerate the JSON object:",
+        )
+
+    def _parse_enrichment(self, raw: str) -> Dict[str, str]:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            logger.warning(f"Invalid JSON from combined enrichment: {raw!r}")
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        result: Dict[str, str] = {}
+        gender = data.get("geschlecht")
+        if isinstance(gender, str) and _parse_gender(gender) is not None:
+            result["geschlecht"] = _parse_gender(gender)
+        language = data.get("sprache")
+        if isinstance(language, str) and _parse_language(language) is not None:
+            result["sprache"] = _parse_language(language)
+        briefanrede = data.get("briefanrede")
+        if isinstance(briefanrede, str) and briefanrede.strip():
+            result["briefanrede"] = briefanrede.strip()
+        return result
+
+    # --- Anfragen und Antworten für die Batch-API ---
+
+    def request_body(self, kind: str, subject) -> dict:
+        """
+        Body der Chat-Completion-Anfrage, wie sie auch der Einzelaufruf
+        sendet. kind "gender"/"language": subject ist der Name;
+        "briefanrede"/"enrich": subject ist der Contact.
+        """
+        builders = {
+            "gender": self._gender_request,
+            "language": self._language_request,
+            "briefanrede": self._briefanrede_request,
+            "enrich": self._enrich_request,
+        }
+        system, user = builders[kind](subject)
+        return self._completion_args(system, user, json_mode=kind == "enrich")
+
+    def parse_response(self, kind: str, raw: str) -> Dict[str, str]:
+        """
+        Wertet den Antworttext einer Anfrage der Art `kind` als Kontaktfelder
+        aus; unbrauchbare Antworten liefern für die Einzelfelder den
+        Standardwert, für "briefanrede"/"enrich" keine Felder.
+        """
+        if kind == "enrich":
+            return self._parse_enrichment(raw)
+        if kind == "gender":
+            return {"geschlecht": _parse_gender(raw) or "-"}
+        if kind == "language":
+            return {"sprache": _parse_language(raw) or ""}
+        raw = raw.strip()
+        return {"briefanrede": raw} if raw else {}
+
+    # --- Öffentliche API ---
+
     def detect_gender(self, name: str) -> str:
         if not name:
             return "-"
-        system = (
-            "You are an assistant that classifies a first name as male, "
-            "female, or unknown. Answer with 'm', 'w', or '-' exactly."
-            "You do this by checking the name against the common names of the given language that name comes from."
-        )
-        user = f"Full name: {name}"
-        raw = self._request_chat_completion(system, user).lower()
-        if raw in {"m", "male", "man"}:
-            return "m"
-        if raw in {"w", "female", "woman"}:
-            return "w"
-        return "-"
+        raw = self._request_chat_completion(*self._gender_request(name))
+        return _parse_gender(raw) or "-"
 
     def detect_language(self, name: str) -> str:
         if not name:
             return ""
-        system = (
-            "You are an assistant that detects the language/origin of a name. "
-            "Answer with one of: de, en, fr, it, es, or '-' if unknown."
-        )
-        user = f"Name: {name}"
-        raw = self._request_chat_completion(system, user).lower()
-        mapping = {
-            "deutsch": "de",
-            "german": "de",
-            "de": "de",
-            "englisch": "en",
-            "english": "en",
-            "en": "en",
-            "franz": "fr",
-            "french": "fr",
-            "fr": "fr",
-            "italien": "it",
-            "italian": "it",
-            "it": "it",
-            "spanisch": "es",
-            "spanish": "es",
-            "es": "es",
-            "-": "",
-            "unknown": "",
-            "unbekannt": "",
-        }
-        for key, code in mapping.items():
-            if key in raw:
-                return code
-        return ""
+        raw = self._request_chat_completion(*self._language_request(name))
+        return _parse_language(raw) or ""
 
     def generate_briefanrede(self, contact: Contact) -> str:
         """
         Erstelle eine formelle Briefanrede via GPT-4o:
         Verwende alle Felder: anrede, titel, vorname, nachname, sprache.
+        Ohne Antwort (Fehler, Breaker offen) greifen die lokalen Regeln.
         """
-        # Kontext-Zusammenbau
-        parts = []
-        for label, val in [
-            ("Anrede", contact.anrede),
-            ("Titel", contact.titel),
-            ("Vorname", contact.vorname),
-            ("Nachname", contact.nachname),
-            ("Sprache", contact.sprache),
-        ]:
-            if val:
-                parts.append(f"{label}: {val}")
-        context = "\n".join(parts)
-
-        system = (
-            "You are a formal correspondence assistant. "
-            "Given the following contact details, generate a polite letter salutation consorting to DIN 5008"
-            "in the appropriate language and style."
+        result = self._request_chat_completion(*self._briefanrede_request(contact))
+        return result or local_briefanrede(contact)
+
+    def enrich_contact(self, contact: Contact) -> Dict[str, str]:
+        """
+        Ermittelt Geschlecht, Sprache und Briefanrede in einem einzigen Aufruf.
+        Die Antwort wird als JSON-Objekt angefordert und feldweise validiert;
+        ungültige oder fehlende Felder sind im Ergebnis nicht enthalten,
+        damit der Aufrufer gezielt auf Einzelaufrufe ausweichen kann.
+        """
+        raw = self._request_chat_completion(*self._enrich_request(contact), json_mode=True)
+        return self._parse_enrichment(raw)
+
+    async def adetect_gender(self, name: str) -> str:
+        if not name:
+            return "-"
+        raw = await self._arequest_chat_completion(*self._gender_request(name))
+        return _parse_gender(raw) or "-"
+
+    async def adetect_language(self, name: str) -> str:
+        if not name:
+            return ""
+        raw = await self._arequest_chat_completion(*self._language_request(name))
+        return _parse_language(raw) or ""
+
+    async def agenerate_briefanrede(self, contact: Contact) -> str:
+        result = await self._arequest_chat_completion(*self._briefanrede_request(contact))
+        return result or local_briefanrede(contact)
+
+    async def aenrich_contact(self, contact: Contact) -> Dict[str, str]:
+        raw = await self._arequest_chat_completion(
+            *self._enrich_request(contact), json_mode=True
         )
-        user = f"{context}\n\nGenerate the salutation:"
-        result = self._request_chat_completion(system, user)
-        return result or "Sehr geehrte Damen und Herren"
+        return self._parse_enrichment(raw)
+
+
+class OpenAIBatchEnricher:
+    """
+    Massen-Anreicherung über die OpenAI-Batch-API (günstiger, dafür mit
+    Laufzeiten bis 24h) für nächtliche Importe:
+
+      1. build_payload: JSONL mit einer Anfrage je fehlendem Feld bzw. einer
+         kombinierten JSON-Anfrage, wenn mehrere Felder fehlen
+      2. submit: Upload + Batch anlegen
+      3. wait: Status pollen, bis der Batch abgeschlossen ist
+      4. merge: Ergebnisse per custom_id ("<index>:<art>") zurückschreiben
+
+    Große Eingaben werden auf mehrere Batches verteilt, sodass keiner die
+    Grenzen der API (Anfragen bzw. Bytes je Eingabedatei) überschreitet.
+    run() verbindet alle Schritte und vermerkt jeden abgesendeten Batch im
+    Checkpoint; wird der Lauf unterbrochen, setzt ein erneuter Aufruf mit
+    denselben Kontakten bei den bereits abgesendeten Batches fort und sendet
+    nur die fehlenden ab.
+    """
+
+    FINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+    # Grenzen der Batch-API je Eingabedatei
+    MAX_REQUESTS = 50_000
+    MAX_BYTES = 200 * 1024 * 1024
+
+    def __init__(
+        self,
+        ai_service: OpenAIService,
+        checkpoint_path: str,
+        poll_interval: float = 60.0,
+        max_requests: int = MAX_REQUESTS,
+        max_bytes: int = MAX_BYTES,
+    ):
+        """
+        :param max_requests: höchstens so viele Anfragen je Batch
+        :param max_bytes: höchstens so große Eingabedatei je Batch
+        """
+        self.ai = ai_service
+        self.checkpoint_path = checkpoint_path
+        self.poll_interval = poll_interval
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+
+    def _requests(self, contacts: List[Contact]) -> List[Tuple[str, dict]]:
+        requests = []
+        for index, contact in enumerate(contacts):
+            missing = []
+            if contact.geschlecht == "-" and contact.vorname:
+                missing.append("gender")
+            if not contact.sprache:
+                missing.append("language")
+            if not contact.briefanrede:
+                missing.append("briefanrede")
+            name = f"{contact.vorname} {contact.nachname}".strip()
+            if len(missing) > 1:
+                missing = ["enrich"]
+            for kind in missing:
+                subject = name if kind in ("gender", "language") else contact
+                requests.append((f"{index}:{kind}", self.ai.request_body(kind, subject)))
+        return requests
+
+    @staticmethod
+    def _line(custom_id: str, body: dict) -> str:
+        line = {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body,
+        }
+        return json.dumps(line, ensure_ascii=False) + "\n"
+
+    def _parts(self, requests: List[Tuple[str, dict]]) -> List[List[str]]:
+        """Teilt die JSONL-Zeilen in Batches innerhalb der API-Grenzen."""
+        parts: List[List[str]] = []
+        current: List[str] = []
+        size = 0
+        for custom_id, body in requests:
+            line = self._line(custom_id, body)
+            length = len(line.encode("utf-8"))
+            if current and (len(current) >= self.max_requests or size + length > self.max_bytes):
+                parts.append(current)
+                current, size = [], 0
+            current.append(line)
+            size += length
+        if current:
+            parts.append(current)
+        return parts
+
+    def build_payload(self, contacts: List[Contact], path: str) -> int:
+        """
+        Schreibt die Batch-Eingabe als eine JSONL-Datei (ohne Aufteilung);
+        Rückgabe: Anzahl Anfragen.
+        """
+        requests = self._requests(contacts)
+        with open(path, "w", encoding="utf-8") as f:
+            for custom_id, body in requests:
+                f.write(self._line(custom_id, body))
+        return len(requests)
+
+    def submit(self, payload_path: str) -> str:
+        """Lädt die Eingabedatei hoch und legt den Batch an; Rückgabe: Batch-ID."""
+        with open(payload_path, "rb") as f:
+            uploaded = self.ai.client.files.create(file=f, purpose="batch")
+        batch = self.ai.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def wait(self, batch_id: str):
+        """Pollt den Batch, bis er einen Endzustand erreicht hat."""
+        while True:
+            batch = self.ai.client.batches.retrieve(batch_id)
+            if batch.status in self.FINAL_STATES:
+                return batch
+            logger.info(f"Batch {batch_id} status {batch.status}, polling again")
+            time.sleep(self.poll_interval)
+
+    def merge(self, contacts: List[Contact], output: str) -> int:
+        """
+        Überträgt die Batch-Ergebnisse auf die Kontakte.
+        Fehlerhafte oder unlesbare Antworten lassen das Feld unverändert.
+        Rückgabe: Anzahl gesetzter Felder.
+        """
+        updated = 0
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            index, kind = item["custom_id"].split(":", 1)
+            contact = contacts[int(index)]
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                logger.warning(f"Batch request {item['custom_id']} failed")
+                continue
+            body = response["body"]
+            usage = body.get("usage") or {}
+            self.ai.record_usage(
+                usage.get("prompt_tokens", 0),
+                usage.get("completion_tokens", 0),
+                price_factor=BATCH_PRICE_FACTOR,
+            )
+            raw = body["choices"][0]["message"]["content"]
+            for field_name, value in self.ai.parse_response(kind, raw).items():
+                setattr(contact, field_name, value)
+                updated += 1
+        return updated
+
+    def run(self, contacts: List[Contact]) -> List[Contact]:
+        """
+        Reichert die Kontakte per Batch an (mit Checkpoint/Resume je Batch).
+        Nicht beantwortete Felder bleiben leer und können anschließend
+        über die Einzel-Erkennung nachgezogen werden.
+        Scheitert ein Batch, wird nur sein Eintrag aus dem Checkpoint
+        entfernt; ein neuer Lauf sendet dann nur diesen erneut ab.
+        """
+        parts = self._parts(self._requests(contacts))
+        if not parts:
+            return contacts
+        fingerprints = [
+            hashlib.sha256("".join(lines).encode("utf-8")).hexdigest() for lines in parts
+        ]
+
+        checkpoint = self._load_checkpoint() or {}
+        submitted: Dict[str, str] = checkpoint.get("batches", {})
+        # Nur Batches dieses Laufs behalten (andere Eingabe → neu absenden)
+        submitted = {fp: bid for fp, bid in submitted.items() if fp in fingerprints}
+        for lines, fingerprint in zip(parts, fingerprints):
+            if fingerprint in submitted:
+                logger.info(f"Resuming batch {submitted[fingerprint]} from checkpoint")
+                continue
+            payload_path = self.checkpoint_path + ".input.jsonl"
+            with open(payload_path, "w", encoding="utf-8") as f:
+                f.writelines(lines)
+            submitted[fingerprint] = self.submit(payload_path)
+            os.remove(payload_path)
+            self._save_checkpoint({"batches": submitted})
+
+        failed = []
+        for fingerprint in fingerprints:
+            batch_id = submitted[fingerprint]
+            batch = self.wait(batch_id)
+            if batch.status != "completed" or not batch.output_file_id:
+                failed.append(f"{batch_id} ({batch.status})")
+                del submitted[fingerprint]
+                continue
+            output = self.ai.client.files.content(batch.output_file_id).text
+            self.merge(contacts, output)
+        if failed:
+            self._save_checkpoint({"batches": submitted})
+            raise RuntimeError(f"Batches did not complete: {', '.join(failed)}")
+        self._clear_checkpoint()
+        return contacts
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except ValueError:
+            return None
+
+    def _save_checkpoint(self, data: dict) -> None:
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _clear_checkpoint(self) -> None:
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
@@ -0,0 +1,175 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class RateLimiter:
+    """
+    Clientseitiges Token-Bucket-Limit für die OpenAI-API
+    (Requests/Minute und Tokens/Minute).
+
+    reserve() bucht einen Aufruf sofort und liefert die Wartezeit, bis er
+    stattfinden darf; die Buckets dürfen dabei ins Minus laufen, sodass
+    gleichzeitige Aufrufer automatisch hintereinander eingereiht werden.
+    Gewartet wird beim Aufrufer (time.sleep bzw. asyncio.sleep).
+
+    Ohne `path` gilt das Limit für alle Threads dieses Prozesses; mit
+    `path` liegt der Zustand in einer SQLite-Datei und wird unter einer
+    Schreibsperre (BEGIN IMMEDIATE) von allen Prozessen geteilt, die
+    dieselbe Datei und denselben `name` verwenden.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst_seconds: float = 1.0,
+        path: Optional[str] = None,
+        name: str = "openai",
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        """
+        :param requests_per_minute: Requests pro Minute (None = unbegrenzt)
+        :param tokens_per_minute: Tokens pro Minute (None = unbegrenzt)
+        :param burst_seconds: Bucket-Größe als Anteil des Minutenlimits in
+            Sekunden; klein halten, die API zählt in kurzen Fenstern
+        :param path: SQLite-Datei für prozessübergreifendes Limit
+        :param name: Schlüssel des Limits in der Datei
+        :param clock: Zeitquelle (Standard: monotonic bzw. time.time bei `path`)
+        """
+        self._rates = [
+            (requests_per_minute or 0) / 60.0,
+            (tokens_per_minute or 0) / 60.0,
+        ]
+        # Mindestens ein kompletter Request passt immer in den Bucket
+        self._capacities = [max(1.0, rate * burst_seconds) for rate in self._rates]
+        self.path = path
+        self.name = name
+        # Mehrere Prozesse brauchen eine gemeinsame Uhr
+        self._clock = clock or (time.time if path else time.monotonic)
+        self._lock = threading.Lock()
+        self._levels: List[float] = list(self._capacities) + [self._clock()]
+        self._conn: Optional[sqlite3.Connection] = None
+        self.waits = 0
+        self.waited = 0.0
+        if path is not None:
+            # isolation_level=None: Transaktionen werden explizit gesteuert
+            self._conn = sqlite3.connect(
+                path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " name TEXT PRIMARY KEY,"
+                " requests REAL NOT NULL,"
+                " tokens REAL NOT NULL,"
+                " updated REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _state(self) -> Iterator[List[float]]:
+        """[Request-Stand, Token-Stand, Zeitpunkt], prozessweit bzw. aus SQLite."""
+        with self._lock:
+            if self._conn is None:
+                yield self._levels
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT requests, tokens, updated FROM rate_limits WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                state = list(row) if row else list(self._capacities) + [self._clock()]
+                yield state
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits (name, requests, tokens, updated)"
+                    " VALUES (?, ?, ?, ?)",
+                    (self.name, *state),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _refill(self, state: List[float]) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - state[2])
+        for i, rate in enumerate(self._rates):
+            if rate:
+                state[i] = min(self._capacities[i], state[i] + elapsed * rate)
+        state[2] = now
+
+    def reserve(self, tokens: int = 0, requests: int = 1) -> float:
+        """Bucht einen Aufruf und liefert die Wartezeit in Sekunden (0 = sofort)."""
+        with self._state() as state:
+            self._refill(state)
+            wait = 0.0
+            for i, amount in enumerate((requests, tokens)):
+                rate = self._rates[i]
+                if not rate:
+                    continue
+                state[i] -= amount
+                if state[i] < 0:
+                    wait = max(wait, -state[i] / rate)
+        if wait:
+            with self._lock:
+                self.waits += 1
+                self.waited += wait
+        return wait
+
+    def adjust(self, tokens: int) -> None:
+        """
+        Korrigiert die Token-Buchung nach dem Aufruf um die Differenz zwischen
+        tatsächlichem Verbrauch und Schätzung (positiv = mehr verbraucht).
+        """
+        if not self._rates[1] or not tokens:
+            return
+        with self._state() as state:
+            self._refill(state)
+            state[1] -= tokens
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"waits": self.waits, "waited": self.waited}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class TokenBudget:
+    """
+    Token-Budget für einen Job (z. B. einen Stapellauf).
+
+    Ist es aufgebraucht, stellt OpenAIService keine Anfragen mehr; es
+    greifen die lokalen Fallbacks. Bereits laufende Anfragen werden noch
+    verbucht, das Budget kann also um deren Verbrauch überschritten werden.
+    """
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max_tokens
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.max_tokens - self._used)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._used >= self.max_tokens
+
+    def charge(self, tokens: int) -> None:
+        with self._lock:
+            self._used += tokens
+
+    def reset(self) -> None:
+        """Für den nächsten Job wieder freigeben."""
+        with self._lock:
+            self._used = 0
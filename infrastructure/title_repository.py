@@ -1,46 +1,151 @@
 import json
+import logging
 import os
-from typing import Dict
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 from application.interfaces import ITitleRepository
 from domain.constants import DEFAULT_TITLES
+from domain.title_trie import TitleTrie
+from infrastructure.file_watcher import FileWatcher
+
+logger = logging.getLogger(__name__)
+
+# Journal-Operation: ("add", langform, kurzform) | ("delete", langform)
+Operation = Tuple[str, ...]
 
 
 class TitleRepository(ITitleRepository):
     """
     Lädt und verwaltet die Titelliste aus einer JSON-Datei (titles.json).
-    Wenn die Datei fehlt oder ungültig ist, wird sie mit DEFAULT_TITLES neu angelegt.
+    Wenn die Datei fehlt, wird sie mit DEFAULT_TITLES neu angelegt; eine
+    defekte Datei wird vorher als <datei>.corrupt beiseitegelegt.
     Änderungen (add/delete/reset) wirken direkt auf diese Datei.
+
+    Gespeichert wird atomar (temporäre Datei + os.replace), ein Absturz
+    hinterlässt also immer den alten oder den neuen Stand. Mehrere
+    Änderungen lassen sich mit batch()/add_many() zu einer Transaktion
+    zusammenfassen, die genau einmal schreibt und einmal neu kompiliert.
+
+    Mit journal=True wird titles.json nicht bei jeder Änderung neu
+    geschrieben: jede Transaktion wird als eine Zeile an <datei>.journal
+    angehängt und beim Laden nachgespielt. Ab `compact_after` Zeilen
+    schreibt ein Hintergrund-Thread den Stand nach titles.json und
+    verwirft das abgearbeitete Journal.
+
+    Änderungen durch andere Prozesse übernimmt reload() bzw. watch(), ohne
+    Sperren auf dem Lesepfad: Trie und Version werden nur ausgetauscht.
+
+    Zu jedem Stand wird ein kompilierter TitleTrie vorgehalten; nach
+    load/add/delete/reset zählt `version` hoch und der Trie wird beim
+    nächsten Zugriff neu erzeugt (nicht bei jeder Änderung eines Imports).
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, journal: bool = False, compact_after: int = 1000):
         """
         :param file_path: Pfad zur titles.json
+        :param journal: Änderungen an ein Append-only-Journal anhängen
+        :param compact_after: Journal-Zeilen, ab denen verdichtet wird
         """
         self.file_path = file_path
+        self.journal = journal
+        self.compact_after = compact_after
+        self.journal_path = file_path + ".journal"
+        # Während einer Verdichtung umbenanntes Journal (wird beim Laden mit nachgespielt)
+        self._compacting_path = file_path + ".journal.compacting"
         self.titles: Dict[str, str] = {}
+        self.version = 0
+        self._compiled: Optional[TitleTrie] = TitleTrie({}, version=self.version)
+        self._lock = threading.RLock()
+        # Offene Transaktion: Schachtelungstiefe, Operationen, (Schlüssel, alter Wert)
+        self._batch_depth = 0
+        self._pending: List[Operation] = []
+        self._undo: List[Tuple[str, Optional[str]]] = []
+        self._journal_file = None
+        self._journal_lines = 0
+        self._compactor: Optional[threading.Thread] = None
 
     def load(self) -> None:
         """
-        Lädt die titles.json.
-        - Existiert sie nicht oder ist defekt → wird neu mit DEFAULT_TITLES angelegt.
+        Lädt die titles.json (und spielt ggf. das Journal nach).
+        - Existiert sie nicht → wird neu mit DEFAULT_TITLES angelegt.
+        - Ist sie defekt → wird sie beiseitegelegt und neu angelegt.
         - Sonst wird der Inhalt in self.titles geladen.
         """
         data: Dict[str, str]
+        self.wait_for_compaction()
         if not os.path.exists(self.file_path):
             data = DEFAULT_TITLES.copy()
             self._save(data)
         else:
             try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    loaded = json.load(f)
-                    if not isinstance(loaded, dict):
-                        raise ValueError("Ungültiges Format")
-                    data = loaded
+                data = self._read_file()
             except Exception:
+                logger.warning(
+                    f"{self.file_path} ist defekt, wird als .corrupt gesichert und neu angelegt"
+                )
+                os.replace(self.file_path, self.file_path + ".corrupt")
                 data = DEFAULT_TITLES.copy()
                 self._save(data)
         # Schlüssel normieren auf Kleinbuchstaben
-        self.titles = {k.lower(): v for k, v in data.items()}
+        with self._lock:
+            self.titles = {k.lower(): v for k, v in data.items()}
+            if self.journal:
+                self._close_journal()
+                for path in (self._compacting_path, self.journal_path):
+                    self._truncate_torn_line(path)
+            self._journal_lines = self._replay_journal(self.titles)
+            self._recompile()
+
+    def reload(self) -> bool:
+        """
+        Liest titles.json (und ggf. das Journal) erneut ein, z. B. nachdem
+        ein anderer Prozess sie geändert hat. Anders als load() wird eine
+        unlesbare Datei nicht ersetzt; der bisherige Stand bleibt dann
+        erhalten. Der neue Trie wird vor dem Austausch fertig gebaut, Leser
+        sehen also immer einen vollständigen Stand.
+        Rückgabe True, wenn sich der Inhalt geändert hat.
+        """
+        try:
+            data = self._read_file()
+        except (OSError, ValueError) as e:
+            logger.warning(f"{self.file_path} nicht neu geladen ({e})")
+            return False
+        titles = {k.lower(): v for k, v in data.items()}
+        with self._lock:
+            lines = self._replay_journal(titles)
+            if titles == self.titles:
+                return False
+            self.titles = titles
+            self._journal_lines = lines
+            # Erst den Trie tauschen, dann die Version: wer die neue Version
+            # liest, bekommt auch den neuen Trie (siehe CachingNameParser)
+            self._compiled = TitleTrie(titles, version=self.version + 1)
+            self.version += 1
+            return True
+
+    def watched_paths(self) -> List[str]:
+        """Dateien, deren Änderung einen reload() erfordert."""
+        if self.journal:
+            return [self.file_path, self.journal_path, self._compacting_path]
+        return [self.file_path]
+
+    def watch(self, interval: float = 1.0, debounce: float = 0.5) -> FileWatcher:
+        """
+        Startet einen Hintergrund-Watcher, der Änderungen anderer Prozesse
+        (z. B. Titelverwaltung in der GUI) per reload() übernimmt.
+        Eigene Schreibvorgänge lösen dabei keinen neuen Stand aus.
+        """
+        return FileWatcher(self.watched_paths(), self.reload, interval, debounce).start()
+
+    def _read_file(self) -> Dict[str, str]:
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError("Ungültiges Format")
+        return loaded
 
     def get_titles(self) -> list[str]:
         """
@@ -61,34 +166,262 @@ class TitleRepository(ITitleRepository):
         """
         key = langform.strip().lower()
         val = kurzform.strip()
-        if self.titles.get(key) == val:
-            return False
-        self.titles[key] = val
-        self._save(self.titles)
+        with self.batch():
+            old = self.titles.get(key)
+            if old == val:
+                return False
+            self.titles[key] = val
+            self._pending.append(("add", key, val))
+            self._undo.append((key, old))
         return True
 
+    def add_many(self, titles: Union[Mapping[str, str], Iterable[Tuple[str, str]]]) -> int:
+        """
+        Fügt viele Einträge in einer Transaktion hinzu (ein Schreibvorgang).
+        Rückgabe: Anzahl geänderter Einträge.
+        """
+        items = titles.items() if isinstance(titles, Mapping) else titles
+        with self.batch():
+            return sum(self.add(langform, kurzform) for langform, kurzform in items)
+
     def delete(self, langform: str) -> bool:
         """
         Entfernt einen Eintrag. Rückgabe True, wenn er vorher existierte.
         """
         key = langform.strip().lower()
-        if key in self.titles:
-            del self.titles[key]
-            self._save(self.titles)
-            return True
-        return False
+        with self.batch():
+            if key not in self.titles:
+                return False
+            self._undo.append((key, self.titles.pop(key)))
+            self._pending.append(("delete", key))
+        return True
+
+    @contextmanager
+    def batch(self) -> Iterator["TitleRepository"]:
+        """
+        Fasst alle Änderungen im with-Block zu einer Transaktion zusammen:
+        gespeichert und neu kompiliert wird erst am Ende, und nur bei
+        Änderungen. Bei einer Exception wird der vorherige Stand
+        wiederhergestellt und nichts geschrieben. Schachtelbar.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._batch_depth == 1:
+                    self._rollback()
+                raise
+            finally:
+                self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending:
+                operations, self._pending, self._undo = self._pending, [], []
+                self._commit(operations)
+
+    def _rollback(self) -> None:
+        """Macht die Änderungen der offenen Transaktion rückgängig."""
+        for key, old in reversed(self._undo):
+            if old is None:
+                self.titles.pop(key, None)
+            else:
+                self.titles[key] = old
+        self._pending, self._undo = [], []
 
     def reset_to_defaults(self) -> None:
         """
         Überschreibt titles.json komplett mit DEFAULT_TITLES.
         """
         data = {k.lower(): v for k, v in DEFAULT_TITLES.items()}
-        self.titles = data.copy()
-        self._save(data)
+        with self._lock:
+            self.wait_for_compaction()
+            self.titles = data.copy()
+            self._save(data)
+            if self.journal:
+                self._discard_journal()
+            self._recompile()
+
+    @property
+    def compiled_titles(self) -> TitleTrie:
+        """
+        Kompilierter Titel-Trie zum aktuellen Stand (nur lesen).
+        """
+        compiled = self._compiled
+        if compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    self._compiled = TitleTrie(self.titles, version=self.version)
+                compiled = self._compiled
+        return compiled
+
+    def _recompile(self) -> None:
+        """
+        Erhöht den Versionszähler; der Titel-Trie wird beim nächsten Zugriff neu erzeugt.
+        """
+        self._compiled = None
+        self.version += 1
+
+    def _commit(self, operations: List[Operation]) -> None:
+        """Persistiert eine abgeschlossene Transaktion und kompiliert neu."""
+        if self.journal:
+            self._append_journal(operations)
+        else:
+            self._save(self.titles)
+        self._recompile()
 
     def _save(self, data: Dict[str, str]) -> None:
         """
-        Persistiert die gegebene Map in titles.json.
+        Persistiert die gegebene Map atomar in titles.json
+        (temporäre Datei im selben Verzeichnis, dann os.replace).
+        """
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(self.file_path) + ".", suffix=".tmp", dir=directory
+        )
+        try:
+            # mkstemp legt mit 0600 an; Rechte der bisherigen Datei übernehmen
+            if os.path.exists(self.file_path):
+                os.chmod(tmp_path, os.stat(self.file_path).st_mode & 0o777)
+            else:
+                os.chmod(tmp_path, 0o644)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    # --- Journal ---
+
+    def _replay_journal(self, titles: Dict[str, str]) -> int:
+        """Spielt (ggf.) verdichtetes und laufendes Journal auf `titles` nach."""
+        if not self.journal:
+            return 0
+        return sum(self._replay(path, titles) for path in (self._compacting_path, self.journal_path))
+
+    def _replay(self, path: str, titles: Dict[str, str]) -> int:
+        """
+        Spielt ein Journal auf `titles` nach; Rückgabe: Anzahl Zeilen.
+        Abgeschnittene Zeilen (Absturz beim Schreiben) werden als nicht
+        abgeschlossene Transaktionen übersprungen, spätere Zeilen gelten.
+        """
+        if not os.path.exists(path):
+            return 0
+        lines = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    operations = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Unvollständige Journal-Zeile in {path} ignoriert")
+                    continue
+                for op in operations:
+                    if op[0] == "add":
+                        titles[op[1]] = op[2]
+                    else:
+                        titles.pop(op[1], None)
+                lines += 1
+        return lines
+
+    @staticmethod
+    def _truncate_torn_line(path: str) -> None:
+        """Kürzt ein Journal auf die letzte vollständige (mit \n beendete) Zeile."""
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as f:
+            data = f.read()
+            if not data or data.endswith(b"\n"):
+                return
+            logger.warning(f"Abgeschnittene letzte Zeile in {path} entfernt")
+            f.truncate(data.rfind(b"\n") + 1)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append_journal(self, operations: List[Operation]) -> None:
+        """
+        Hängt eine Transaktion als eine JSON-Zeile an. Endet die Datei nicht
+        mit einem Zeilenumbruch (Absturz eines Schreibers seit dem Laden),
+        beginnt die Transaktion auf einer neuen Zeile.
+        """
+        if self._journal_file is None:
+            torn = False
+            if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path):
+                with open(self.journal_path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+            if torn:
+                self._journal_file.write("\n")
+        self._journal_file.write(json.dumps(operations, ensure_ascii=False) + "\n")
+        self._journal_file.flush()
+        os.fsync(self._journal_file.fileno())
+        self._journal_lines += 1
+        if self._journal_lines >= self.compact_after:
+            self._start_compaction()
+
+    def _close_journal(self) -> None:
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def _discard_journal(self) -> None:
+        self._close_journal()
+        for path in (self.journal_path, self._compacting_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._journal_lines = 0
+
+    def _start_compaction(self) -> None:
+        """
+        Benennt das Journal um und schreibt den aktuellen Stand im
+        Hintergrund nach titles.json; neue Änderungen gehen derweil in ein
+        frisches Journal. Läuft schon eine Verdichtung, wird gewartet, bis
+        die nächste Schwelle erreicht ist.
         """
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._close_journal()
+        if not os.path.exists(self._compacting_path):
+            os.replace(self.journal_path, self._compacting_path)
+        elif os.path.exists(self.journal_path):
+            # Vorige Verdichtung gescheitert: anhängen statt überschreiben
+            with open(self.journal_path, "rb") as src, open(self._compacting_path, "ab") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.journal_path)
+        self._journal_lines = 0
+        snapshot = self.titles.copy()
+        self._compactor = threading.Thread(
+            target=self._compact, args=(snapshot,), name="titles-compaction", daemon=True
+        )
+        self._compactor.start()
+
+    def _compact(self, snapshot: Dict[str, str]) -> None:
+        # Stürzt der Prozess vor dem Löschen ab, wird .compacting beim Laden
+        # erneut nachgespielt; das ist idempotent.
+        try:
+            self._save(snapshot)
+            os.remove(self._compacting_path)
+        except OSError:
+            logger.exception("Verdichten des Titel-Journals fehlgeschlagen")
+
+    def compact(self) -> None:
+        """Verdichtet das Journal sofort (blockierend)."""
+        with self._lock:
+            if not self.journal:
+                return
+            self.wait_for_compaction()
+            if self._journal_lines:
+                self._start_compaction()
+            self.wait_for_compaction()
+
+    def wait_for_compaction(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def close(self) -> None:
+        """Wartet eine laufende Verdichtung ab und schließt das Journal."""
+        with self._lock:
+            self.wait_for_compaction()
+            self._close_journal()
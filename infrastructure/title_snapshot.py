@@ -0,0 +1,411 @@
+"""
+Binärer Snapshot der kompilierten Titeltabelle für Worker-Prozesse.
+
+Statt den TitleTrie (verschachtelte dicts) in jeden Worker zu picklen,
+schreibt der Elternprozess die Tabelle einmal in eine Datei, die die
+Worker per mmap nur lesend einblenden. Übertragen wird nur der Pfad;
+im Worker wird nichts geparst oder aufgebaut, und alle Prozesse teilen
+sich die Seiten über den Page-Cache.
+
+Dateiaufbau (little endian):
+    Kopf      Magic, Formatversion, Quelle (mtime_ns, Größe, SHA-256 der
+              titles.json), SHA-256 des Inhalts, Repository-Version
+    3 Tabellen je (Einträge, Slots, Offset): titles, keys, phrases
+    Slots     je (Key-Offset, Key-Länge, Wert-Offset, Wert-Länge),
+              offene Adressierung mit linearer Sondierung über crc32
+    Heap      UTF-8-Zeichenketten (dedupliziert)
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from domain.name_parser import compile_titles
+from domain.title_trie import TitleTable, TitleTrie, normalize_title_token
+from infrastructure.file_watcher import FileWatcher
+from infrastructure.title_repository import TitleRepository
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"KSTT"
+_FORMAT = 1
+_HEADER = struct.Struct("<4sIqQ32s32sQ")
+_TABLE = struct.Struct("<III")
+_SLOT = struct.Struct("<IIII")
+_EMPTY = 0xFFFFFFFF
+# Wert-Länge für "nur Präfix einer Wortfolge, kein Titel-Ende"
+_PREFIX_ONLY = 0xFFFFFFFF
+
+_TITLES, _KEYS, _PHRASES = range(3)
+
+# Zuletzt gesuchte Schlüssel je Prozess; Namen wiederholen sich stark,
+# der Speicherbedarf bleibt trotzdem klein und unabhängig von der Titelzahl
+_LOOKUP_CACHE_SIZE = 4096
+
+
+def titles_digest(titles: Mapping[str, str]) -> bytes:
+    """Inhalts-Hash einer Titel-Map (unabhängig von der Reihenfolge)."""
+    raw = json.dumps(sorted(titles.items()), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).digest()
+
+
+def _file_sha256(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+class _Heap:
+    """Sammelt deduplizierte UTF-8-Zeichenketten ab einem Start-Offset."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._offsets: Dict[bytes, int] = {}
+
+    def add(self, value: bytes) -> int:
+        offset = self._offsets.get(value)
+        if offset is None:
+            offset = self._offsets[value] = len(self.data)
+            self.data += value
+        return offset
+
+
+def _build_table(
+    entries: Sequence[Tuple[str, Optional[str]]], heap: _Heap
+) -> List[Tuple[int, int, int, int]]:
+    """Hash-Tabelle (Heap-relative Offsets) mit Ladefaktor ≤ 0,5."""
+    size = 1
+    while size < 2 * len(entries):
+        size *= 2
+    slots = [(_EMPTY, 0, 0, 0)] * size
+    for key, value in entries:
+        key_bytes = key.encode("utf-8")
+        index = zlib.crc32(key_bytes) & (size - 1)
+        while slots[index][0] != _EMPTY:
+            index = (index + 1) & (size - 1)
+        if value is None:
+            val_off, val_len = 0, _PREFIX_ONLY
+        else:
+            val_bytes = value.encode("utf-8")
+            val_off, val_len = heap.add(val_bytes), len(val_bytes)
+        slots[index] = (heap.add(key_bytes), len(key_bytes), val_off, val_len)
+    return slots
+
+
+def write_snapshot(
+    path: str, trie: TitleTrie, source_path: Optional[str] = None
+) -> None:
+    """
+    Schreibt den Snapshot atomar (temporäre Datei + os.replace), damit
+    laufende Worker nie eine halb geschriebene Datei einblenden.
+    :param source_path: titles.json, gegen die matches_source() prüft
+    """
+    titles = trie.titles()
+    phrases: Dict[str, Optional[str]] = {}
+    for words, short in trie.phrases():
+        # Präfixe markieren, damit longest_match weiß, wann es abbrechen kann
+        for i in range(1, len(words)):
+            phrases.setdefault(" ".join(words[:i]), None)
+        phrases[" ".join(words)] = short
+    tables = [
+        list(titles.items()),
+        [(key, "") for key in sorted(trie.keys())],
+        list(phrases.items()),
+    ]
+
+    heap = _Heap()
+    built = [_build_table(entries, heap) for entries in tables]
+    heap_start = _HEADER.size + 3 * _TABLE.size + sum(len(t) for t in built) * _SLOT.size
+
+    mtime_ns, size, source_hash = -1, 0, bytes(32)
+    if source_path and os.path.exists(source_path):
+        stat = os.stat(source_path)
+        mtime_ns, size, source_hash = stat.st_mtime_ns, stat.st_size, _file_sha256(source_path)
+
+    out = bytearray(
+        _HEADER.pack(
+            _MAGIC, _FORMAT, mtime_ns, size, source_hash, titles_digest(titles), trie.version
+        )
+    )
+    offset = _HEADER.size + 3 * _TABLE.size
+    for entries, slots in zip(tables, built):
+        out += _TABLE.pack(len(entries), len(slots), offset)
+        offset += len(slots) * _SLOT.size
+    for slots in built:
+        for key_off, key_len, val_off, val_len in slots:
+            if key_off == _EMPTY:
+                out += _SLOT.pack(_EMPTY, 0, 0, 0)
+            else:
+                if val_len != _PREFIX_ONLY:
+                    val_off += heap_start
+                out += _SLOT.pack(key_off + heap_start, key_len, val_off, val_len)
+    out += heap.data
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(out)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class MappedTitleTable(TitleTable):
+    """
+    TitleTable über einen per mmap eingeblendeten Snapshot (nur lesen).
+    Beim Pickeln wird nur der Pfad übertragen; der Empfänger blendet die
+    Datei selbst ein. Die letzten Treffer werden in einem kleinen LRU
+    gehalten, damit häufige Tokens nicht jedes Mal sondiert werden.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic,
+                fmt,
+                self.source_mtime_ns,
+                self.source_size,
+                self.source_sha256,
+                self.digest,
+                self.version,
+            ) = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic, fmt = b"", 0
+        if magic != _MAGIC or fmt != _FORMAT:
+            self._mm.close()
+            raise ValueError(f"{path} ist kein Titel-Snapshot (Format {_FORMAT})")
+        self._tables = [
+            _TABLE.unpack_from(self._mm, _HEADER.size + i * _TABLE.size) for i in range(3)
+        ]
+        self._find = lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(self._probe)
+
+    def __reduce__(self):
+        return (MappedTitleTable, (self.path,))
+
+    def _probe(self, table: int, key: str) -> Optional[Tuple[int, int]]:
+        """(Wert-Offset, Wert-Länge) zum Schlüssel oder None."""
+        _, size, base = self._tables[table]
+        if not size:
+            return None
+        mm = self._mm
+        key_bytes = key.encode("utf-8")
+        index = zlib.crc32(key_bytes) & (size - 1)
+        while True:
+            key_off, key_len, val_off, val_len = _SLOT.unpack_from(mm, base + index * _SLOT.size)
+            if key_off == _EMPTY:
+                return None
+            if key_len == len(key_bytes) and mm[key_off:key_off + key_len] == key_bytes:
+                return val_off, val_len
+            index = (index + 1) & (size - 1)
+
+    def _value(self, found: Tuple[int, int]) -> str:
+        offset, length = found
+        return self._mm[offset:offset + length].decode("utf-8")
+
+    def lookup(self, token: str) -> Optional[str]:
+        found = self._find(_TITLES, token.lower())
+        return None if found is None else self._value(found)
+
+    def contains(self, token: str) -> bool:
+        return self._find(_KEYS, token) is not None
+
+    def longest_match(
+        self, tokens: Sequence[str], start: int = 0
+    ) -> Tuple[Optional[str], int]:
+        best: Tuple[Optional[str], int] = (None, 0)
+        phrase = ""
+        # Wie im Trie: ein Token ohne Wörter ("-", ".") bleibt auf dem
+        # bisherigen Knoten und verlängert einen vollständigen Titel
+        found = None
+        for pos in range(start, len(tokens)):
+            for word in normalize_title_token(tokens[pos]):
+                phrase = f"{phrase} {word}" if phrase else word
+                found = self._find(_PHRASES, phrase)
+                if found is None:
+                    return best
+            if found is not None and found[1] != _PREFIX_ONLY:
+                best = (self._value(found), pos - start + 1)
+        return best
+
+    def __len__(self) -> int:
+        return self._tables[_TITLES][0]
+
+    def matches_source(self, titles_path: str) -> bool:
+        """
+        True, wenn der Snapshot aus dem aktuellen Stand von titles_path
+        erzeugt wurde: zuerst per mtime/Größe, bei Abweichung per SHA-256.
+        """
+        try:
+            stat = os.stat(titles_path)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == (self.source_mtime_ns, self.source_size):
+            return True
+        return stat.st_size == self.source_size and _file_sha256(titles_path) == self.source_sha256
+
+    def close(self) -> None:
+        self._find.cache_clear()
+        self._mm.close()
+
+
+def ensure_snapshot(title_repo, path: str) -> MappedTitleTable:
+    """
+    Liefert einen Snapshot zum aktuellen Stand des Repositories; nur wenn
+    sich der Inhalt geändert hat (oder die Datei fehlt/defekt ist), wird
+    er neu geschrieben.
+    """
+    if isinstance(title_repo, MappedTitleTable):
+        return title_repo
+    trie = compile_titles(title_repo)
+    if not isinstance(trie, TitleTrie):
+        trie = TitleTrie.from_repository(title_repo)
+    try:
+        table = MappedTitleTable(path)
+    except (OSError, ValueError):
+        table = None
+    if table is not None:
+        if table.digest == titles_digest(trie.titles()):
+            return table
+        table.close()
+    write_snapshot(path, trie, getattr(title_repo, "file_path", None))
+    return MappedTitleTable(path)
+
+
+class ReloadingTitleTable(TitleTable):
+    """
+    Snapshot-Tabelle, die Änderungen an titles.json selbst übernimmt
+    (für langlaufende Worker-Prozesse).
+
+    Ein FileWatcher beobachtet titles.json und den Snapshot. Nach einer
+    Änderung wird der Snapshot eingeblendet, falls er schon zum neuen
+    Stand passt (ein anderer Prozess hat ihn bereits erzeugt); sonst wird
+    die Datei einmal gelesen und der Snapshot neu geschrieben. Die neue
+    Tabelle ersetzt die alte durch eine einzige Zuweisung; die Lesepfade
+    kommen ohne Sperren aus. `version` zählt bei jedem Austausch hoch.
+    """
+
+    def __init__(
+        self,
+        titles_path: str,
+        snapshot_path: str,
+        interval: float = 1.0,
+        debounce: float = 0.5,
+        journal: bool = False,
+        watch: bool = True,
+    ):
+        """
+        :param watch: False = in diesem Prozess nicht beobachten (Eltern-
+            prozess, der die Tabelle nur an Worker weiterreicht); ein per
+            fork erzeugter Worker erbt das Objekt ungepickelt und startet
+            den Watcher dann beim ersten Zugriff selbst
+        """
+        self.titles_path = titles_path
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.debounce = debounce
+        self.journal = journal
+        self._repo = TitleRepository(titles_path, journal=journal)
+        self._table: MappedTitleTable = self._current() or ensure_snapshot(
+            self._load_repo(), snapshot_path
+        )
+        self.version = 1
+        self._watcher: Optional[FileWatcher] = None
+        self._creator_pid = os.getpid()
+        self._watch_lock = threading.Lock()
+        # Solange True, prüfen die Lesepfade, ob sie in einem Kindprozess laufen
+        self._watch_elsewhere = not watch
+        if watch:
+            self._start_watching()
+
+    def _start_watching(self) -> None:
+        paths = self._repo.watched_paths() + [self.snapshot_path]
+        self._watcher = FileWatcher(paths, self.refresh, self.interval, self.debounce).start()
+
+    def _ensure_watching(self) -> None:
+        """Startet den Watcher im ersten Zugriff eines geforkten Prozesses."""
+        if os.getpid() == self._creator_pid:
+            return
+        with self._watch_lock:
+            if self._watch_elsewhere:
+                self._watch_elsewhere = False
+                self.refresh()  # Änderungen zwischen fork und erstem Zugriff
+                self._start_watching()
+
+    def __reduce__(self):
+        return (
+            ReloadingTitleTable,
+            (self.titles_path, self.snapshot_path, self.interval, self.debounce, self.journal),
+        )
+
+    def _current(self) -> Optional[MappedTitleTable]:
+        """Vorhandener Snapshot, wenn er zu titles.json passt (ohne sie zu parsen)."""
+        if self.journal:
+            return None  # das Journal deckt matches_source() nicht ab
+        try:
+            table = MappedTitleTable(self.snapshot_path)
+        except (OSError, ValueError):
+            return None
+        if table.matches_source(self.titles_path):
+            return table
+        table.close()
+        return None
+
+    def _load_repo(self):
+        self._repo.reload()
+        return self._repo
+
+    def refresh(self) -> bool:
+        """Übernimmt einen geänderten Stand; True, wenn getauscht wurde."""
+        table = self._current()
+        if table is None:
+            if not self._load_repo().titles:
+                return False  # unlesbar oder leer: alten Stand behalten
+            table = ensure_snapshot(self._repo, self.snapshot_path)
+        if table.digest == self._table.digest:
+            return False
+        # Die alte Tabelle wird nicht geschlossen: andere Threads können
+        # gerade noch darauf lesen; die Abbildung endet mit dem Objekt.
+        self._table = table
+        self.version += 1
+        logger.info(f"Titel neu geladen aus {self.titles_path} (Version {self.version})")
+        return True
+
+    def lookup(self, token: str) -> Optional[str]:
+        if self._watch_elsewhere:
+            self._ensure_watching()
+        return self._table.lookup(token)
+
+    def contains(self, token: str) -> bool:
+        if self._watch_elsewhere:
+            self._ensure_watching()
+        return self._table.contains(token)
+
+    def longest_match(
+        self, tokens: Sequence[str], start: int = 0
+    ) -> Tuple[Optional[str], int]:
+        if self._watch_elsewhere:
+            self._ensure_watching()
+        return self._table.longest_match(tokens, start)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
@@ -0,0 +1,169 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+from application.interfaces import ITraceSink
+
+# Exponentielle Bucket-Grenzen in Sekunden: 1 µs · 2^k bis ~67 s
+DEFAULT_BUCKETS: Sequence[float] = tuple(1e-6 * 2 ** k for k in range(27))
+
+
+class LoggingTraceSink(ITraceSink):
+    """Schreibt jeden Span als Logzeile (für Einzelfälle und Fehlersuche)."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG):
+        self.logger = logger or logging.getLogger("kontaktsplitter.trace")
+        self.level = level
+
+    def record(self, name: str, seconds: float) -> None:
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, f"{name} {seconds * 1000:.3f} ms")
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)  # letzter Eintrag: über der höchsten Grenze
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class HistogramTraceSink(ITraceSink):
+    """
+    Sammelt Spans in Histogrammen je Name (feste Buckets, konstanter
+    Speicher). summary() liefert Kennzahlen, report() eine Tabelle für
+    den Abschluss eines Stapellaufs. Perzentile sind auf die obere
+    Bucket-Grenze gerundet.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = list(buckets)
+        self._histograms: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram(len(self.buckets))
+            histogram.counts[index] += 1
+            histogram.count += 1
+            histogram.total += seconds
+            if seconds > histogram.max:
+                histogram.max = seconds
+
+    def _percentile(self, histogram: _Histogram, fraction: float) -> float:
+        rank = fraction * histogram.count
+        seen = 0
+        for index, count in enumerate(histogram.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(self.buckets):
+                    return min(self.buckets[index], histogram.max)
+                return histogram.max
+        return histogram.max
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Je Span: count, total, mean, p50, p95, p99, max (Sekunden)."""
+        with self._lock:
+            return {
+                name: {
+                    "count": h.count,
+                    "total": h.total,
+                    "mean": h.total / h.count,
+                    "p50": self._percentile(h, 0.50),
+                    "p95": self._percentile(h, 0.95),
+                    "p99": self._percentile(h, 0.99),
+                    "max": h.max,
+                }
+                for name, h in sorted(self._histograms.items())
+            }
+
+    def report(self) -> str:
+        """Tabellarische Zusammenfassung (Zeiten in ms)."""
+        header = f"{'Span':<24}{'Anzahl':>9}{'Summe s':>10}{'Mittel':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'Max':>10}"
+        lines = [header, "-" * len(header)]
+        for name, s in self.summary().items():
+            lines.append(
+                f"{name:<24}{s['count']:>9}{s['total']:>10.3f}"
+                + "".join(f"{s[k] * 1000:>10.3f}" for k in ("mean", "p50", "p95", "p99", "max"))
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def _snapshot(self) -> Dict[str, _Histogram]:
+        with self._lock:
+            copies = {}
+            for name, h in self._histograms.items():
+                copy = _Histogram(len(self.buckets))
+                copy.counts, copy.count, copy.total, copy.max = list(h.counts), h.count, h.total, h.max
+                copies[name] = copy
+            return copies
+
+
+class PrometheusTextFileSink(HistogramTraceSink):
+    """
+    Histogramm-Sink, der seinen Stand im Prometheus-Textformat in eine
+    Datei schreibt (z. B. für den Textfile-Collector des node_exporters).
+    Geschrieben wird atomar bei flush() und – mit `flush_interval` –
+    höchstens so oft aus record() heraus.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        metric: str = "kontaktsplitter_span_seconds",
+        flush_interval: Optional[float] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(buckets)
+        self.path = path
+        self.metric = metric
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def record(self, name: str, seconds: float) -> None:
+        super().record(name, seconds)
+        if self.flush_interval is not None:
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._last_flush = now
+                self.flush()
+
+    def render(self) -> str:
+        lines: List[str] = [
+            f"# HELP {self.metric} Dauer der Verarbeitungsschritte",
+            f"# TYPE {self.metric} histogram",
+        ]
+        for name, h in sorted(self._snapshot().items()):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(self.buckets, h.counts):
+                cumulative += count
+                lines.append(f'{self.metric}_bucket{{span="{label}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{self.metric}_bucket{{span="{label}",le="+Inf"}} {h.count}')
+            lines.append(f'{self.metric}_sum{{span="{label}"}} {h.total:.9f}')
+            lines.append(f'{self.metric}_count{{span="{label}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".trace.", suffix=".prom.tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -1,49 +1,31 @@
 import os
-import tkinter as tk
 
-from infrastructure.openai_service import OpenAIService
-from infrastructure.title_repository import TitleRepository
-from infrastructure.name_parser_adapter import DomainNameParser
-from infrastructure.ai_adapters import (
-    OpenAIGenderDetector,
-    OpenAILanguageDetector,
-    OpenAIAnredeGenerator,
-)
-from infrastructure.history_repository import InMemoryHistoryRepository
-from application.contact_service import ContactService
-from ui.app import KontaktsplitterApp
+from providers import BASE_DIR, Providers
+
+# Kapazität des persistenten Kontaktbuchs (älteste Einträge werden verdrängt)
+HISTORY_SIZE = 10_000
 
 
 def main():
-    # 1) Konfiguration & Infrastruktur
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    ai_service = OpenAIService(api_key=api_key)
-
-    # Title-Repository laden
-    title_path = os.path.join(os.path.dirname(__file__), "titles.json")
-    title_repo = TitleRepository(file_path=title_path)
-    title_repo.load()
-
-    # 2) Konkrete Implementierungen
-    name_parser = DomainNameParser(title_repo)
-    gender_detector = OpenAIGenderDetector(ai_service)
-    language_detector = OpenAILanguageDetector(ai_service)
-    anrede_generator = OpenAIAnredeGenerator(ai_service)
-    history_repo = InMemoryHistoryRepository()
-
-    # 3) Haupt-Service
-    contact_service = ContactService(
-        name_parser,
-        gender_detector,
-        language_detector,
-        anrede_generator,
-        history_repo,
+    # 1) Konfiguration & Infrastruktur (Komponenten entstehen erst bei Bedarf)
+    providers = Providers(
+        history_path=os.path.join(BASE_DIR, "history.db"),
+        history_size=HISTORY_SIZE,
+        # Titeländerungen anderer Instanzen/Skripte übernehmen
+        titles_reload_interval=1.0,
     )
 
-    # 4) UI starten
+    # 2) UI starten; tkinter wird erst hier geladen
+    import tkinter as tk
+    from ui.app import KontaktsplitterApp
+
     root = tk.Tk()
-    app = KontaktsplitterApp(root, contact_service, title_repo)
-    root.mainloop()
+    app = KontaktsplitterApp(root, providers.contact_service, providers.title_repo)
+    try:
+        root.mainloop()
+    finally:
+        app.close()
+        providers.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,224 @@
+"""
+Composition Root: alle Bausteine als verzögert erzeugte Provider.
+
+Jede Komponente wird erst beim ersten Zugriff gebaut und ihr Modul erst
+dann importiert. Der Stapelbetrieb ohne KI lädt so weder openai noch
+tkinter; mit KI wird der OpenAI-Client erst beim ersten Request erzeugt.
+"""
+
+import os
+from functools import cached_property
+from typing import Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Providers:
+    def __init__(
+        self,
+        titles_path: Optional[str] = None,
+        use_ai: bool = True,
+        history_path: Optional[str] = None,
+        history_size: int = 10,
+        cache_path: Optional[str] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        rate_limit_path: Optional[str] = None,
+        token_budget: Optional[int] = None,
+        titles_reload_interval: Optional[float] = None,
+        tracer=None,
+        metrics=None,
+    ):
+        """
+        :param titles_path: Pfad zur titles.json (Standard: neben diesem Modul)
+        :param use_ai: False = nur lokale Erkennung (Lexikon + Regeln)
+        :param history_path: SQLite-Datei fürs Kontaktbuch; None = Ringpuffer im Speicher
+        :param history_size: Kapazität des Kontaktbuchs
+        :param cache_path: SQLite-Datei für den Klassifikations-Cache
+        :param requests_per_minute: clientseitiges Limit für OpenAI-Requests
+        :param tokens_per_minute: clientseitiges Limit für OpenAI-Tokens
+        :param rate_limit_path: SQLite-Datei, um das Limit mit anderen Prozessen zu teilen
+        :param token_budget: Token-Budget des Jobs, danach nur lokale Erkennung
+        :param titles_reload_interval: titles.json in diesem Abstand (Sekunden)
+            auf Änderungen anderer Prozesse prüfen, auch in den Parse-Workern
+        :param tracer: application.tracing.Tracer für Zeitmessungen (None = aus)
+        :param metrics: application.metrics.MetricsRegistry für laufende
+            Kennzahlen (None = aus)
+        """
+        self.titles_path = titles_path or os.path.join(BASE_DIR, "titles.json")
+        self.use_ai = use_ai
+        self.history_path = history_path
+        self.history_size = history_size
+        self.cache_path = cache_path or os.path.join(BASE_DIR, "classification_cache.sqlite3")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.rate_limit_path = rate_limit_path
+        self.token_budget = token_budget
+        self.titles_reload_interval = titles_reload_interval
+        self._titles_watcher = None
+        self.tracer = tracer
+        self.metrics = metrics
+
+    @cached_property
+    def title_repo(self):
+        from infrastructure.title_repository import TitleRepository
+
+        repo = TitleRepository(file_path=self.titles_path)
+        repo.load()
+        if self.titles_reload_interval is not None:
+            self._titles_watcher = repo.watch(self.titles_reload_interval)
+        return repo
+
+    @cached_property
+    def lexicon(self):
+        # Lokales Vornamen-Lexikon; OpenAI nur für unbekannte/unsichere Namen
+        from infrastructure.name_lexicon import NameLexicon
+
+        return NameLexicon()
+
+    @cached_property
+    def rate_limiter(self):
+        # Ohne Limits kein Limiter (und keine SQLite-Datei)
+        if not (self.requests_per_minute or self.tokens_per_minute):
+            return None
+        from infrastructure.rate_limiter import RateLimiter
+
+        return RateLimiter(
+            self.requests_per_minute, self.tokens_per_minute, path=self.rate_limit_path
+        )
+
+    @cached_property
+    def ai_service(self):
+        from infrastructure.openai_service import OpenAIService
+        from infrastructure.rate_limiter import TokenBudget
+
+        return OpenAIService(
+            api_key=os.getenv("OPENAI_API_KEY", ""),
+            rate_limiter=self.rate_limiter,
+            budget=TokenBudget(self.token_budget) if self.token_budget else None,
+            tracer=self.tracer,
+            metrics=self.metrics,
+        )
+
+    @cached_property
+    def classification_cache(self):
+        # Persistenter Cache für Geschlechts-/Spracherkennung
+        from infrastructure.classification_cache import ClassificationCache
+
+        return ClassificationCache(self.cache_path)
+
+    @cached_property
+    def name_parser(self):
+        # Eingangsdaten enthalten viele Dubletten; gleiche Namen nur einmal parsen
+        from infrastructure.name_parser_adapter import CachingNameParser, DomainNameParser
+
+        # Worker-Prozesse blenden die Titel als Snapshot neben der titles.json ein
+        return CachingNameParser(
+            DomainNameParser(
+                self.title_repo,
+                snapshot_path=self.titles_path + ".snapshot",
+                reload_interval=self.titles_reload_interval,
+            ),
+            self.title_repo,
+        )
+
+    @cached_property
+    def gender_detector(self):
+        from infrastructure.name_lexicon import LexiconGenderDetector
+
+        if not self.use_ai:
+            return LexiconGenderDetector(self.lexicon)
+        from infrastructure.ai_adapters import OpenAIGenderDetector
+
+        return LexiconGenderDetector(
+            self.lexicon, OpenAIGenderDetector(self.ai_service, self.classification_cache)
+        )
+
+    @cached_property
+    def language_detector(self):
+        from infrastructure.name_lexicon import LexiconLanguageDetector
+
+        if not self.use_ai:
+            return LexiconLanguageDetector(self.lexicon)
+        from infrastructure.ai_adapters import OpenAILanguageDetector
+
+        return LexiconLanguageDetector(
+            self.lexicon, OpenAILanguageDetector(self.ai_service, self.classification_cache)
+        )
+
+    @cached_property
+    def anrede_generator(self):
+        from infrastructure.anrede_generator import RuleBasedAnredeGenerator
+
+        if not self.use_ai:
+            return RuleBasedAnredeGenerator()
+        from infrastructure.ai_adapters import OpenAIAnredeGenerator
+
+        return RuleBasedAnredeGenerator(OpenAIAnredeGenerator(self.ai_service))
+
+    @cached_property
+    def enricher(self):
+        # Ohne KI gibt es nichts zu kombinieren
+        if not self.use_ai:
+            return None
+        from infrastructure.ai_adapters import OpenAIContactEnricher
+        from infrastructure.name_lexicon import LexiconContactEnricher
+
+        return LexiconContactEnricher(
+            self.lexicon, OpenAIContactEnricher(self.ai_service, self.classification_cache)
+        )
+
+    @cached_property
+    def history_repo(self):
+        from infrastructure.history_repository import (
+            RingBufferHistoryRepository,
+            SQLiteHistoryRepository,
+        )
+
+        if self.history_path is None:
+            return RingBufferHistoryRepository(self.history_size)
+        return SQLiteHistoryRepository(self.history_path)
+
+    @cached_property
+    def contact_service(self):
+        from application.contact_service import ContactService
+
+        service = ContactService(
+            self.name_parser,
+            self.gender_detector,
+            self.language_detector,
+            self.anrede_generator,
+            self.history_repo,
+            history_size=self.history_size,
+            enricher=self.enricher,
+            tracer=self.tracer,
+            metrics=self.metrics,
+        )
+        if self.metrics is not None:
+            self._register_cache_metrics()
+        return service
+
+    def _register_cache_metrics(self) -> None:
+        # Cache-Treffer aus den vorhandenen stats(); Worker-Prozesse parsen ohne Cache
+        caches = [("parse_cache", "Parse-Cache", self.name_parser)]
+        if self.use_ai:
+            caches.append(
+                ("classification_cache", "Klassifikations-Cache", self.classification_cache)
+            )
+        for prefix, label, cache in caches:
+            for key, word in (("hits", "Treffer"), ("misses", "Fehlgriffe")):
+                self.metrics.gauge(
+                    f"kontaktsplitter_{prefix}_{key}_total",
+                    f"{word} im {label}",
+                    lambda cache=cache, key=key: cache.stats()[key],
+                    kind="counter",
+                )
+
+    def close(self) -> None:
+        """Schließt nur die Ressourcen, die tatsächlich erzeugt wurden."""
+        if self._titles_watcher is not None:
+            self._titles_watcher.stop()
+        for name in ("history_repo", "classification_cache", "rate_limiter"):
+            resource = self.__dict__.get(name)
+            if resource is not None and hasattr(resource, "close"):
+                resource.close()
@@ -3,6 +3,10 @@ import infrastructure.title_repository
 import pytest
 from unittest.mock import MagicMock
 import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from infrastructure.openai_service import OpenAIService
 from infrastructure.title_repository import TitleRepository
 from infrastructure.name_parser_adapter import DomainNameParser
@@ -58,3 +62,175 @@ def contact_service():
     )
 
     return contact_service
+
+
+class FakeOpenAIServer:
+    """
+    Lokaler Stand-in für die OpenAI-REST-API (chat/completions, files, batches).
+    Antworten werden aus dem System-Prompt abgeleitet, sodass Tests
+    ohne Netzwerk und ohne API-Key laufen.
+    """
+
+    def __init__(self, delay: float = 0.0, rate_limited: int = 0):
+        self.delay = delay
+        self.rate_limited = rate_limited  # Anzahl initialer Fehlerantworten
+        self.error_status = 429  # Status dieser Fehlerantworten
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.files = {}
+        self.batches = {}
+        self.batch_polls = 1  # Anzahl "in_progress"-Antworten je Batch
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length)
+                if self.path.endswith("/files"):
+                    server._upload(self, raw)
+                elif self.path.endswith("/batches"):
+                    server._create_batch(self, json.loads(raw))
+                else:
+                    server._handle(self, json.loads(raw or b"{}"))
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if parts[-1] == "content":
+                    server._file_content(self, parts[-2])
+                else:
+                    server._retrieve_batch(self, parts[-1])
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/v1"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def answer(self, system: str, user: str) -> str:
+        name = user.split(":", 1)[-1].strip()
+        first = name.split()[0] if name.split() else ""
+        if "classifies a first name" in system:
+            return "w" if first.endswith("a") else "m"
+        if "language/origin" in system and "JSON" not in system:
+            return "de"
+        if "JSON" in system:
+            return json.dumps({"geschlecht": "m", "sprache": "de", "briefanrede": "Sehr geehrte Damen und Herren"})
+        return "Sehr geehrte Damen und Herren"
+
+    def _send(self, handler, status, payload, headers=None):
+        out = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(out)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(out)
+
+    def _completion(self, body):
+        messages = body.get("messages", [])
+        system = messages[0]["content"] if messages else ""
+        user = messages[-1]["content"] if messages else ""
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body.get("model", ""),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": self.answer(system, user)},
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+        }
+
+    def _upload(self, handler, raw):
+        # multipart/form-data: Dateiinhalt steht nach der Leerzeile des "file"-Teils
+        boundary = handler.headers["Content-Type"].split("boundary=", 1)[1].encode()
+        content = b""
+        for part in raw.split(b"--" + boundary):
+            if b'name="file"' in part:
+                content = part.split(b"\r\n\r\n", 1)[1].rsplit(b"\r\n", 1)[0]
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = content.decode("utf-8")
+        self._send(handler, 200, {
+            "id": file_id, "object": "file", "bytes": len(content), "created_at": 0,
+            "filename": "input.jsonl", "purpose": "batch", "status": "processed",
+        })
+
+    def _batch_payload(self, batch):
+        return {
+            "id": batch["id"], "object": "batch", "endpoint": "/v1/chat/completions",
+            "completion_window": "24h", "created_at": 0, "input_file_id": batch["input_file_id"],
+            "status": batch["status"], "output_file_id": batch.get("output_file_id"),
+        }
+
+    def _create_batch(self, handler, body):
+        batch_id = f"batch-{len(self.batches)}"
+        batch = {"id": batch_id, "input_file_id": body["input_file_id"], "status": "in_progress", "polls": 0}
+        self.batches[batch_id] = batch
+        self._send(handler, 200, self._batch_payload(batch))
+
+    def _retrieve_batch(self, handler, batch_id):
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        if batch["status"] == "in_progress" and batch["polls"] > self.batch_polls:
+            lines = []
+            for line in self.files[batch["input_file_id"]].splitlines():
+                request = json.loads(line)
+                lines.append(json.dumps({
+                    "id": f"req-{request['custom_id']}",
+                    "custom_id": request["custom_id"],
+                    "response": {"status_code": 200, "body": self._completion(request["body"])},
+                    "error": None,
+                }))
+            output_id = f"file-{len(self.files)}"
+            self.files[output_id] = "\n".join(lines) + "\n"
+            batch["status"] = "completed"
+            batch["output_file_id"] = output_id
+        self._send(handler, 200, self._batch_payload(batch))
+
+    def _file_content(self, handler, file_id):
+        out = self.files[file_id].encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/octet-stream")
+        handler.send_header("Content-Length", str(len(out)))
+        handler.end_headers()
+        handler.wfile.write(out)
+
+    def _handle(self, handler, body):
+        with self._lock:
+            self.requests.append(body)
+            limited = self.rate_limited > 0
+            if limited:
+                self.rate_limited -= 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if limited:
+                error = {"error": {"message": "Fehler", "type": "api_error", "code": None}}
+                self._send(handler, self.error_status, error, {"Retry-After": "0"})
+                return
+            time.sleep(self.delay)
+            self._send(handler, 200, self._completion(body))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def fake_openai_server():
+    server = FakeOpenAIServer(delay=0.02).start()
+    yield server
+    server.stop()
@@ -0,0 +1,89 @@
+import asyncio
+from application.contact_service import ContactService
+from infrastructure.ai_adapters import (
+    AsyncOpenAIGenderDetector,
+    AsyncOpenAILanguageDetector,
+    AsyncOpenAIAnredeGenerator,
+    OpenAIGenderDetector,
+    OpenAILanguageDetector,
+    OpenAIAnredeGenerator,
+)
+from infrastructure.history_repository import InMemoryHistoryRepository
+from infrastructure.name_parser_adapter import DomainNameParser
+from infrastructure.openai_service import OpenAIService
+from infrastructure.title_repository import TitleRepository
+
+
+def make_service(base_url):
+    ai = OpenAIService(api_key="test-key", base_url=base_url, backoff_factor=0.0)
+    title_repo = TitleRepository("tests/data/titles.json")
+    title_repo.load()
+    return ContactService(
+        DomainNameParser(title_repo),
+        OpenAIGenderDetector(ai),
+        OpenAILanguageDetector(ai),
+        OpenAIAnredeGenerator(ai),
+        InMemoryHistoryRepository(),
+        async_gender_detector=AsyncOpenAIGenderDetector(ai),
+        async_language_detector=AsyncOpenAILanguageDetector(ai),
+        async_anrede_generator=AsyncOpenAIAnredeGenerator(ai),
+    )
+
+
+async def collect(aiter):
+    return [item async for item in aiter]
+
+
+NAMES = ["Anna Schmidt", "Max Mustermann", "Herr Dr. Karl Müller", "Maria Rossi"] * 5
+
+
+def test_aprocess_many_keeps_order(fake_openai_server):
+    service = make_service(fake_openai_server.base_url)
+    results = asyncio.run(collect(service.aprocess_many(NAMES, concurrency=4)))
+    assert ([c.nachname for c in results] == [service.name_parser.parse(n).nachname for n in NAMES])
+    assert ([c.geschlecht for c in results[:4]] == ["w", "m", "m", "w"])
+    assert (all(c.sprache == "de" for c in results))
+    assert (all(c.briefanrede for c in results))
+
+
+def test_aprocess_many_bounds_concurrency(fake_openai_server):
+    service = make_service(fake_openai_server.base_url)
+    results = asyncio.run(collect(service.aprocess_many(NAMES, concurrency=3, ordered=False)))
+    assert (len(results) == len(NAMES))
+    assert (1 < fake_openai_server.max_in_flight <= 3)
+
+
+def test_aprocess_many_retries_after_rate_limit(fake_openai_server):
+    fake_openai_server.rate_limited = 2
+    service = make_service(fake_openai_server.base_url)
+    results = asyncio.run(collect(service.aprocess_many(["Anna Schmidt"], concurrency=1)))
+    assert (results[0].geschlecht == "w")
+
+
+def test_aprocess_many_falls_back_to_sync_detectors(fake_openai_server):
+    service = make_service(fake_openai_server.base_url)
+    service.async_gender_detector = None
+    results = asyncio.run(collect(service.aprocess_many(["Anna Schmidt"], concurrency=2)))
+    assert (results[0].geschlecht == "w")
+
+
+def test_aprocess_many_in_consecutive_event_loops(fake_openai_server):
+    service = make_service(fake_openai_server.base_url)
+    first = asyncio.run(collect(service.aprocess_many(NAMES[:4], concurrency=2)))
+    requests = len(fake_openai_server.requests)
+    second = asyncio.run(collect(service.aprocess_many(NAMES[:4], concurrency=2)))
+    assert ([c.geschlecht for c in first] == ["w", "m", "m", "w"])
+    assert ([c.geschlecht for c in second] == ["w", "m", "m", "w"])
+    assert (len(fake_openai_server.requests) == 2 * requests)
+
+
+def test_async_client_belongs_to_running_loop(fake_openai_server):
+    ai = OpenAIService(api_key="test-key", base_url=fake_openai_server.base_url)
+
+    async def clients():
+        return ai.async_client, ai.async_client
+
+    first, again = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+    assert (first is again)
+    assert (second is not first)
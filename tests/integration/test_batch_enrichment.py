@@ -0,0 +1,103 @@
+import json
+import os
+import pytest
+from domain.contact import Contact
+from infrastructure.openai_service import OpenAIBatchEnricher, OpenAIService
+
+
+def make_contacts():
+    return [
+        Contact(vorname="Anna", nachname="Schmidt"),
+        Contact(anrede="Herr", vorname="Max", nachname="Mustermann", geschlecht="m", sprache="de"),
+        Contact(vorname="Karl", nachname="Müller", sprache="de", briefanrede="Hallo"),
+    ]
+
+
+def make_enricher(server, tmp_path):
+    ai = OpenAIService(api_key="test-key", base_url=server.base_url)
+    return OpenAIBatchEnricher(ai, str(tmp_path / "batch.checkpoint"), poll_interval=0.0)
+
+
+def test_build_payload_one_line_per_request(fake_openai_server, tmp_path):
+    enricher = make_enricher(fake_openai_server, tmp_path)
+    path = str(tmp_path / "payload.jsonl")
+    assert (enricher.build_payload(make_contacts(), path) == 3)
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert ([line["custom_id"] for line in lines] == ["0:enrich", "1:briefanrede", "2:gender"])
+    assert (lines[0]["body"]["response_format"] == {"type": "json_object"})
+
+
+def test_run_merges_results_by_custom_id(fake_openai_server, tmp_path):
+    enricher = make_enricher(fake_openai_server, tmp_path)
+    contacts = enricher.run(make_contacts())
+    assert ((contacts[0].geschlecht, contacts[0].sprache) == ("m", "de"))
+    assert (contacts[0].briefanrede == "Sehr geehrte Damen und Herren")
+    assert (contacts[1].briefanrede == "Sehr geehrte Damen und Herren")
+    assert (contacts[2].geschlecht == "m")
+    assert (contacts[2].briefanrede == "Hallo")
+    assert (not os.path.exists(enricher.checkpoint_path))
+
+
+def test_run_resumes_from_checkpoint(fake_openai_server, tmp_path, monkeypatch):
+    enricher = make_enricher(fake_openai_server, tmp_path)
+
+    def interrupted(batch_id):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(enricher, "wait", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        enricher.run(make_contacts())
+    assert (os.path.exists(enricher.checkpoint_path))
+    assert (len(fake_openai_server.batches) == 1)
+
+    resumed = make_enricher(fake_openai_server, tmp_path)
+    contacts = resumed.run(make_contacts())
+    assert (len(fake_openai_server.batches) == 1)
+    assert (contacts[2].geschlecht == "m")
+
+
+def test_run_splits_into_batches_within_limits(fake_openai_server, tmp_path):
+    ai = OpenAIService(api_key="test-key", base_url=fake_openai_server.base_url)
+    enricher = OpenAIBatchEnricher(
+        ai, str(tmp_path / "batch.checkpoint"), poll_interval=0.0, max_requests=2
+    )
+    contacts = enricher.run(make_contacts() * 2)
+    assert (len(fake_openai_server.batches) == 3)
+    assert ([c.briefanrede for c in contacts] == ["Sehr geehrte Damen und Herren"] * 2 + ["Hallo"]
+            + ["Sehr geehrte Damen und Herren"] * 2 + ["Hallo"])
+    assert (not os.path.exists(enricher.checkpoint_path))
+
+
+def test_run_resubmits_only_missing_batches(fake_openai_server, tmp_path, monkeypatch):
+    ai = OpenAIService(api_key="test-key", base_url=fake_openai_server.base_url)
+    enricher = OpenAIBatchEnricher(
+        ai, str(tmp_path / "batch.checkpoint"), poll_interval=0.0, max_requests=2
+    )
+    submit = enricher.submit
+    calls = []
+
+    def crash_after_first(path):
+        if calls:
+            raise KeyboardInterrupt
+        calls.append(path)
+        return submit(path)
+
+    monkeypatch.setattr(enricher, "submit", crash_after_first)
+    with pytest.raises(KeyboardInterrupt):
+        enricher.run(make_contacts() * 2)
+    assert (len(fake_openai_server.batches) == 1)
+
+    resumed = OpenAIBatchEnricher(
+        ai, str(tmp_path / "batch.checkpoint"), poll_interval=0.0, max_requests=2
+    )
+    contacts = resumed.run(make_contacts() * 2)
+    assert (len(fake_openai_server.batches) == 3)
+    assert (contacts[3].geschlecht == "m")
+
+
+def test_parts_respect_byte_limit(tmp_path):
+    ai = OpenAIService(api_key="test-key")
+    enricher = OpenAIBatchEnricher(ai, str(tmp_path / "c"), max_bytes=1)
+    parts = enricher._parts(enricher._requests(make_contacts()))
+    assert ([len(p) for p in parts] == [1, 1, 1])
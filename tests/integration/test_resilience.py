@@ -0,0 +1,173 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from application.tracing import Tracer
+from domain.contact import Contact
+from infrastructure.circuit_breaker import CircuitBreaker
+from infrastructure.openai_service import OpenAIService
+from infrastructure.rate_limiter import RateLimiter, TokenBudget
+from infrastructure.trace_sinks import HistogramTraceSink
+
+
+def make_ai(server, **kwargs):
+    kwargs.setdefault("backoff_factor", 0.0)
+    return OpenAIService(api_key="test-key", base_url=server.base_url, **kwargs)
+
+
+def test_client_error_is_not_retried(fake_openai_server):
+    fake_openai_server.rate_limited = 5
+    fake_openai_server.error_status = 400
+    ai = make_ai(fake_openai_server)
+    assert (ai.detect_gender("Anna") == "-")
+    assert (len(fake_openai_server.requests) == 1)
+    assert (ai.stats()["retries"] == 0)
+
+
+def test_server_errors_are_retried(fake_openai_server):
+    fake_openai_server.rate_limited = 2
+    fake_openai_server.error_status = 503
+    ai = make_ai(fake_openai_server)
+    assert (ai.detect_gender("Anna") == "w")
+    assert (ai.stats()["retries"] == 2)
+
+
+def test_open_breaker_skips_requests_and_falls_back(fake_openai_server):
+    fake_openai_server.rate_limited = 100
+    fake_openai_server.error_status = 500
+    breaker = CircuitBreaker(window=4, min_calls=2, open_seconds=60.0)
+    ai = make_ai(fake_openai_server, max_retries=2, breaker=breaker)
+    contact = Contact(anrede="Herr", nachname="Müller", geschlecht="m", sprache="de")
+    # Ein Ergebnis je Request, nicht je Versuch
+    assert (ai.generate_briefanrede(contact) == "Sehr geehrter Herr Müller")
+    assert ((breaker.state, breaker.stats()["failures"]) == (CircuitBreaker.CLOSED, 1))
+    assert (ai.generate_briefanrede(contact) == "Sehr geehrter Herr Müller")
+    assert (breaker.state == CircuitBreaker.OPEN)
+    sent = len(fake_openai_server.requests)
+    assert (ai.generate_briefanrede(contact) == "Sehr geehrter Herr Müller")
+    assert (len(fake_openai_server.requests) == sent)
+    assert (ai.stats()["short_circuits"] == 1)
+
+
+def _response_without_content():
+    message = SimpleNamespace(role="assistant", content=None, refusal="I can't help with that.")
+    usage = SimpleNamespace(prompt_tokens=10, completion_tokens=2)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def test_response_without_content_falls_back(fake_openai_server):
+    budget = TokenBudget(1000)
+    ai = make_ai(fake_openai_server, budget=budget)
+    ai.client = MagicMock()
+    ai.client.chat.completions.create.return_value = _response_without_content()
+    assert (ai.detect_gender("Anna") == "-")
+    assert (budget.used == 12)
+    assert (ai.breaker.stats()["successes"] == 1)
+
+    async def detect():
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=_response_without_content())
+        ai._async_clients[asyncio.get_running_loop()] = client
+        return await ai.adetect_gender("Anna")
+
+    assert (asyncio.run(detect()) == "-")
+    assert (budget.used == 24)
+
+
+def test_client_errors_do_not_open_breaker(fake_openai_server):
+    fake_openai_server.rate_limited = 10
+    fake_openai_server.error_status = 400
+    breaker = CircuitBreaker(window=4, min_calls=2, open_seconds=60.0)
+    ai = make_ai(fake_openai_server, breaker=breaker)
+    for _ in range(5):
+        assert (ai.detect_gender("Anna") == "-")
+    assert (breaker.state == CircuitBreaker.CLOSED)
+    assert (breaker.stats()["ignored"] == 5)
+
+
+def test_auth_errors_open_breaker(fake_openai_server):
+    fake_openai_server.rate_limited = 10
+    fake_openai_server.error_status = 401
+    breaker = CircuitBreaker(window=4, min_calls=2, open_seconds=60.0)
+    ai = make_ai(fake_openai_server, breaker=breaker)
+    for _ in range(2):
+        assert (ai.detect_gender("Anna") == "-")
+    assert (breaker.state == CircuitBreaker.OPEN)
+
+
+def test_retried_transient_error_counts_as_success(fake_openai_server):
+    fake_openai_server.rate_limited = 2
+    breaker = CircuitBreaker(window=4, min_calls=1)
+    ai = make_ai(fake_openai_server, breaker=breaker)
+    assert (ai.detect_gender("Anna") == "w")
+    assert ((breaker.stats()["successes"], breaker.stats()["failures"]) == (1, 0))
+
+
+def test_timeout_counts_and_falls_back(fake_openai_server):
+    fake_openai_server.delay = 0.5
+    ai = make_ai(fake_openai_server, timeout=0.05, max_retries=1)
+    assert (ai.detect_language("Anna Schmidt") == "")
+    assert (ai.stats()["timeouts"] >= 1)
+
+
+def test_token_budget_switches_to_fallbacks(fake_openai_server):
+    budget = TokenBudget(20)  # Fake-Server meldet 12 Tokens je Antwort
+    ai = make_ai(fake_openai_server, budget=budget)
+    assert (ai.detect_gender("Anna") == "w")
+    assert (ai.detect_gender("Anna") == "w")
+    assert (budget.exhausted)
+    contact = Contact(anrede="Frau", nachname="Schmidt", geschlecht="w", sprache="de")
+    assert (ai.generate_briefanrede(contact) == "Sehr geehrte Frau Schmidt")
+    assert (len(fake_openai_server.requests) == 2)
+    stats = ai.stats()
+    assert ((stats["tokens"], stats["budget_exhausted"]) == (24, 1))
+
+
+def test_rate_limiter_spaces_requests(fake_openai_server):
+    limiter = RateLimiter(requests_per_minute=300, burst_seconds=0)  # ein Request je 200 ms
+    ai = make_ai(fake_openai_server, rate_limiter=limiter)
+    assert ([ai.detect_language("Anna Schmidt") for _ in range(3)] == ["de"] * 3)
+    assert (ai.stats()["rate_limiter"]["waits"] == 2)
+
+
+def test_async_sqlite_rate_limiter_does_not_block_event_loop(fake_openai_server, tmp_path):
+    path = str(tmp_path / "limits.sqlite")
+    ai = make_ai(fake_openai_server, rate_limiter=RateLimiter(requests_per_minute=600, path=path))
+    # Ein anderer Prozess hält die Schreibsperre der Limit-Datei
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    async def main():
+        request = asyncio.create_task(ai.adetect_gender("Anna"))
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0.02)
+            ticks += 1
+        waiting = not request.done()
+        other.execute("COMMIT")
+        return await request, ticks, waiting
+
+    assert (asyncio.run(main()) == ("w", 5, True))
+    other.close()
+
+
+def test_tracer_records_attempts_and_backoff(fake_openai_server):
+    fake_openai_server.rate_limited = 1
+    histogram = HistogramTraceSink()
+    ai = make_ai(fake_openai_server, tracer=Tracer([histogram]))
+    assert (ai.detect_gender("Anna") == "w")
+    summary = histogram.summary()
+    assert (summary["openai.request"]["count"] == 1)
+    assert (summary["openai.attempt"]["count"] == 2)
+    assert (summary["openai.backoff"]["count"] == 1)
+
+
+def test_usage_from_response_is_counted(fake_openai_server):
+    ai = make_ai(fake_openai_server)
+    assert (ai.detect_gender("Anna") == "w")
+    stats = ai.stats()
+    assert ((stats["prompt_tokens"], stats["completion_tokens"]) == (10, 2))
+    assert (stats["cost_usd"] == pytest.approx((10 * 2.50 + 2 * 10.00) / 1e6))
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from domain.contact import Contact
+from ui.background import BackgroundRunner
+
+
+def _poll_until(runner, predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        runner.poll()
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_result_delivered_only_on_poll():
+    runner = BackgroundRunner()
+    results = []
+    try:
+        runner.submit("contact", lambda x: x * 2, 21, on_done=results.append)
+        time.sleep(0.05)
+        assert (results == [])
+        assert (_poll_until(runner, lambda: results == [42]))
+        assert (not runner.is_busy())
+    finally:
+        runner.shutdown()
+
+
+def test_stale_request_is_discarded():
+    runner = BackgroundRunner()
+    release = threading.Event()
+    results = []
+
+    def slow(value):
+        release.wait(1.0)
+        return value
+
+    try:
+        runner.submit("contact", slow, "alt", on_done=results.append)
+        runner.submit("contact", lambda v: v, "neu", on_done=results.append)
+        release.set()
+        assert (_poll_until(runner, lambda: not runner.is_busy()))
+        time.sleep(0.05)
+        runner.poll()
+        assert (results == ["neu"])
+    finally:
+        runner.shutdown()
+
+
+def test_error_goes_to_on_error():
+    runner = BackgroundRunner()
+    errors = []
+
+    def fail():
+        raise ValueError("kaputt")
+
+    try:
+        runner.submit("contact", fail, on_done=lambda _: None, on_error=errors.append)
+        assert (_poll_until(runner, lambda: len(errors) == 1))
+        assert (str(errors[0]) == "kaputt")
+    finally:
+        runner.shutdown()
+
+
+def test_cancel_drops_result():
+    runner = BackgroundRunner()
+    results = []
+    try:
+        runner.submit("contact", lambda: "x", on_done=results.append)
+        runner.cancel("contact")
+        time.sleep(0.05)
+        runner.poll()
+        assert (results == [])
+        assert (not runner.is_busy("contact"))
+    finally:
+        runner.shutdown()
+
+
+def test_stream_items_delivered_in_order():
+    runner = BackgroundRunner()
+    items = []
+    done = []
+    contacts = [Contact(nachname=f"N{i}") for i in range(50)]
+    try:
+        runner.submit_stream("bulk", iter, contacts, on_item=items.append, on_done=done.append)
+        deadline = time.monotonic() + 2
+        while not done and time.monotonic() < deadline:
+            assert (runner.poll(max_items=7) <= 7)
+            time.sleep(0.002)
+        assert (done == [None])
+        assert (items == contacts)
+    finally:
+        runner.shutdown()
@@ -1,5 +1,7 @@
+from unittest.mock import MagicMock
 from domain.contact import Contact
 from domain.briefanrede import generate_briefanrede
+from infrastructure.anrede_generator import RuleBasedAnredeGenerator
 
 def test_briefanrede_empty():
     contact = Contact()
@@ -171,3 +173,58 @@ def test_briefanrede_spanish_unspecified_gender():
     contact.sprache = "es"
     assert (generate_briefanrede(contact) == "Estimados Señores y Señoras")
 
+
+
+def test_briefanrede_male_portuguese():
+    contact = Contact()
+    contact.nachname = "Silva"
+    contact.geschlecht = "m"
+    contact.sprache = "pt"
+    assert (generate_briefanrede(contact) == "Prezado Senhor Silva")
+
+
+def test_briefanrede_female_dutch():
+    contact = Contact()
+    contact.nachname = "Jansen"
+    contact.geschlecht = "w"
+    contact.sprache = "nl"
+    assert (generate_briefanrede(contact) == "Geachte mevrouw Jansen")
+
+
+def test_briefanrede_polish_unspecified_gender():
+    contact = Contact()
+    contact.nachname = "Kowalski"
+    contact.sprache = "pl"
+    assert (generate_briefanrede(contact) == "Szanowni Państwo")
+
+
+def test_briefanrede_male_turkish():
+    contact = Contact()
+    contact.nachname = "Yılmaz"
+    contact.geschlecht = "m"
+    contact.sprache = "tr"
+    assert (generate_briefanrede(contact) == "Sayın Yılmaz Bey")
+
+
+def test_briefanrede_unknown_language_defaults_to_german():
+    contact = Contact()
+    contact.nachname = "Tanaka"
+    contact.geschlecht = "m"
+    contact.sprache = "ja"
+    assert (generate_briefanrede(contact) == "Sehr geehrter Herr Tanaka")
+
+
+def test_rule_based_generator_escalates_only_unsupported_languages():
+    fallback = MagicMock()
+    fallback.generate.return_value = "拝啓 田中様"
+    generator = RuleBasedAnredeGenerator(fallback)
+    contact = Contact(nachname="Svensson", geschlecht="w", sprache="sv")
+    assert (generator.generate(contact) == "Bästa fru Svensson")
+    assert (generator.generate(Contact(nachname="Tanaka", sprache="ja")) == "拝啓 田中様")
+    assert (generator.generate(Contact(nachname="Tanaka")) == "拝啓 田中様")
+    assert (generator.escalations == 2)
+
+
+def test_rule_based_generator_without_fallback():
+    generator = RuleBasedAnredeGenerator()
+    assert (generator.generate(Contact(nachname="Tanaka", sprache="ja")) == "Sehr geehrte Damen und Herren")
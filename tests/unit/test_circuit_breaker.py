@@ -0,0 +1,59 @@
+from infrastructure.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock):
+    return CircuitBreaker(failure_threshold=0.5, window=4, min_calls=4, open_seconds=10.0, clock=clock)
+
+
+def test_opens_when_failure_rate_exceeded():
+    breaker = make_breaker(FakeClock())
+    for _ in range(2):
+        breaker.record_success()
+    breaker.record_failure()
+    assert (breaker.state == CircuitBreaker.CLOSED)
+    breaker.record_failure()
+    assert (breaker.state == CircuitBreaker.OPEN)
+    assert (not breaker.allow())
+    assert (breaker.stats()["short_circuits"] == 1)
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10.0
+    assert (breaker.state == CircuitBreaker.HALF_OPEN)
+    assert (breaker.allow())
+    assert (not breaker.allow())  # nur ein Probeaufruf
+    breaker.record_failure()
+    assert (breaker.state == CircuitBreaker.OPEN)
+
+    clock.now = 20.0
+    assert (breaker.allow())
+    breaker.record_success()
+    assert (breaker.state == CircuitBreaker.CLOSED)
+    stats = breaker.stats()
+    assert ((stats["opened"], stats["half_opened"], stats["closed"]) == (2, 2, 1))
+    assert (stats["failure_rate"] == 0.0)
+
+
+def test_ignored_outcome_releases_half_open_probe():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10.0
+    assert (breaker.allow() == True)
+    assert (breaker.allow() == False)
+    breaker.record_ignored()
+    assert (breaker.state == CircuitBreaker.HALF_OPEN)
+    assert (breaker.allow() == True)
@@ -0,0 +1,115 @@
+from unittest.mock import MagicMock
+from domain.contact import Contact
+from infrastructure.ai_adapters import (
+    OpenAIContactEnricher,
+    OpenAIGenderDetector,
+    OpenAILanguageDetector,
+)
+from infrastructure.classification_cache import ClassificationCache
+
+
+def make_ai(gender="m", language="de"):
+    ai = MagicMock()
+    ai.model = "gpt-4o"
+    ai.prompt_version.side_effect = lambda kind: f"{kind}-v1"
+    ai.detect_gender.return_value = gender
+    ai.detect_language.return_value = language
+    return ai
+
+
+def test_cache_key_normalizes_name():
+    key = ClassificationCache.make_key("gender", "  Max   MÜLLER ", "gpt-4o", "v1")
+    assert (key == ClassificationCache.make_key("gender", "max müller", "gpt-4o", "v1"))
+    assert (key != ClassificationCache.make_key("gender", "max müller", "gpt-4o", "v2"))
+    assert (key != ClassificationCache.make_key("language", "max müller", "gpt-4o", "v1"))
+
+
+def test_cache_hit_and_miss_counters():
+    cache = ClassificationCache()
+    assert (cache.get("k") == None)
+    cache.put("k", "w")
+    assert (cache.get("k") == "w")
+    assert (cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size": 1})
+
+
+def test_cache_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("infrastructure.classification_cache.time.time", lambda: now[0])
+    cache = ClassificationCache(ttl=60)
+    cache.put("k", "m")
+    now[0] += 61
+    assert (cache.get("k") == None)
+    assert (len(cache) == 0)
+
+
+def test_cache_lru_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("infrastructure.classification_cache.time.time", lambda: now[0])
+    cache = ClassificationCache(max_entries=2)
+    cache.put("a", "m")
+    now[0] += 1
+    cache.put("b", "w")
+    now[0] += 1
+    assert (cache.get("a") == "m")  # a ist jetzt jünger als b
+    now[0] += 1
+    cache.put("c", "m")
+    assert (len(cache) == 2)
+    assert (cache.get("b") == None)
+    assert (cache.get("a") == "m")
+    assert (cache.get("c") == "m")
+
+
+def test_cache_persists_on_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ClassificationCache(path)
+    cache.put("k", "de")
+    cache.close()
+    assert (ClassificationCache(path).get("k") == "de")
+
+
+def test_gender_detector_consults_cache_before_api():
+    ai = make_ai(gender="w")
+    detector = OpenAIGenderDetector(ai, cache=ClassificationCache())
+    contact = Contact(vorname="Anna", nachname="Schmidt")
+    assert (detector.detect(contact) == "w")
+    assert (detector.detect(Contact(vorname="ANNA", nachname="schmidt")) == "w")
+    assert (ai.detect_gender.call_count == 1)
+
+
+def test_cache_is_keyed_on_first_name():
+    ai = make_ai(gender="w")
+    cache = ClassificationCache()
+    detector = OpenAIGenderDetector(ai, cache=cache)
+    assert (detector.detect(Contact(vorname="Anna", nachname="Schmidt")) == "w")
+    assert (detector.detect(Contact(vorname="anna", nachname="Meier")) == "w")
+    assert (ai.detect_gender.call_count == 1)
+    ai.detect_gender.assert_called_once_with("Anna Schmidt")
+    assert (cache.stats()["hits"] == 1)
+
+
+def test_unknown_results_are_not_cached():
+    ai = make_ai(language="")
+    cache = ClassificationCache()
+    detector = OpenAILanguageDetector(ai, cache=cache)
+    contact = Contact(vorname="Xy", nachname="Zz")
+    assert (detector.detect(contact) == "")
+    assert (detector.detect(contact) == "")
+    assert (ai.detect_language.call_count == 2)
+    assert (len(cache) == 0)
+
+
+def test_contact_enricher_shares_cache_with_detectors():
+    ai = make_ai()
+    ai.enrich_contact.return_value = {
+        "geschlecht": "w", "sprache": "de", "briefanrede": "Sehr geehrte Frau Schmidt"
+    }
+    cache = ClassificationCache()
+    enricher = OpenAIContactEnricher(ai, cache=cache)
+    assert (enricher.enrich(Contact(vorname="Anna", nachname="Schmidt")) == ai.enrich_contact.return_value)
+    # Geschlecht und Sprache kommen jetzt aus dem Cache; die Briefanrede allein
+    # bleibt dem Einzelschritt überlassen
+    assert (enricher.enrich(Contact(vorname="Anna", nachname="Meier")) == {"geschlecht": "w", "sprache": "de"})
+    assert (ai.enrich_contact.call_count == 1)
+    detector = OpenAIGenderDetector(ai, cache=cache)
+    assert (detector.detect(Contact(vorname="Anna", nachname="Weber")) == "w")
+    assert (ai.detect_gender.call_count == 0)
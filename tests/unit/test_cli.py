@@ -0,0 +1,48 @@
+import io
+import json
+import cli
+
+
+def test_split_csv_to_jsonl(tmp_path):
+    source = tmp_path / "in.csv"
+    source.write_text('id,name\n1,"Herr Dr. Max Mustermann"\n2,Karla Schmidt\n', encoding="utf-8")
+    target = tmp_path / "out.jsonl"
+    assert (cli.main(["split", str(source), "-o", str(target), "--column", "name", "--no-ai",
+                      "--titles", "tests/data/titles.json"]) == 0)
+    rows = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+    assert ([(r["titel"], r["vorname"], r["nachname"]) for r in rows] == [("Dr.", "Max", "Mustermann"), ("", "Karla", "Schmidt")])
+    assert (rows[0]["briefanrede"] == "Sehr geehrter Herr Dr. Mustermann")
+    assert (rows[1]["geschlecht"] == "w")
+
+
+def test_split_stdin_to_stdout_csv(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("Mr. William Shakespeare\n\nHerr Dr.\n"))
+    assert (cli.main(["split", "--output-format", "csv", "--no-ai", "--titles", "tests/data/titles.json"]) == 0)
+    lines = capsys.readouterr().out.splitlines()
+    assert (lines[0].startswith("anrede,titel,vorname,nachname"))
+    assert (lines[1] == "Mr,,William,Shakespeare,m,en,Dear Mr Shakespeare,False,,")
+    assert (lines[2] == "Herr,Dr.,,,m,de,Sehr geehrter Herr Dr.,True,Vorname fehlt; Nachname fehlt,vorname; nachname")
+
+
+def test_read_names_jsonl():
+    stream = io.StringIO('{"name": "Anna Schmidt"}\n{"full": "x"}\n')
+    assert (list(cli.read_names(stream, "jsonl", None)) == ["Anna Schmidt", ""])
+
+
+def test_split_closes_providers(tmp_path, monkeypatch):
+    closed = []
+    monkeypatch.setattr(cli.Providers, "close", lambda self: closed.append(self))
+    source = tmp_path / "in.txt"
+    source.write_text("Anna Schmidt\n", encoding="utf-8")
+    assert (cli.main(["split", str(source), "-o", str(tmp_path / "out.jsonl"), "--no-ai",
+                      "--titles", "tests/data/titles.json"]) == 0)
+    assert (len(closed) == 1)
+
+
+def test_read_names_csv_without_header():
+    rows = "Anna Schmidt,1\nMax Mustermann,2\n"
+    assert (list(cli.read_names(io.StringIO(rows), "csv", None)) == ["Anna Schmidt", "Max Mustermann"])
+    assert (list(cli.read_names(io.StringIO(rows), "csv", "1")) == ["1", "2"])
+    with_header = "name,id\n" + rows
+    assert (list(cli.read_names(io.StringIO(with_header), "csv", "name")) == ["Anna Schmidt", "Max Mustermann"])
+    assert (list(cli.read_names(io.StringIO(with_header), "csv", None, header=True)) == ["Anna Schmidt", "Max Mustermann"])
@@ -0,0 +1,37 @@
+import pickle
+
+from domain.contact import Contact
+from domain.contact_batch import ContactBatch
+
+
+def _contacts():
+    return [
+        Contact(anrede="Herr", vorname="Max", nachname="Mustermann", geschlecht="m", sprache="de"),
+        Contact(nachname="Schmidt", inaccuracies=["Vorname fehlt"], review_fields=["vorname"]),
+        Contact(anrede="Frau", vorname="Anna", nachname="Schmidt", geschlecht="w", sprache="de"),
+    ] * 4
+
+
+def test_contact_has_slots():
+    c = Contact(vorname="Max")
+    assert (not hasattr(c, "__dict__"))
+    assert (pickle.loads(pickle.dumps(c)) == c)
+
+
+def test_batch_rows_match_contacts():
+    contacts = _contacts()
+    batch = ContactBatch.from_contacts(contacts)
+    assert (len(batch) == 12)
+    assert ([row.to_dict() for row in batch] == [c.to_dict() for c in contacts])
+    assert (batch[1].to_contact() == contacts[1])
+    assert (batch[-1] == contacts[-1])
+    assert (batch[2].vorname == "Anna")
+
+
+def test_batch_interns_strings_and_review_bits():
+    batch = ContactBatch.from_contacts(_contacts())
+    # "", Herr, Max, Mustermann, m, de, Schmidt, Frau, Anna, w, "-"
+    assert (batch.distinct_strings == 11)
+    assert (list(batch.review_indices()) == [1, 4, 7, 10])
+    assert (batch[4].needs_review)
+    assert (not batch[5].needs_review)
@@ -0,0 +1,155 @@
+from unittest.mock import MagicMock
+from application.contact_service import ContactService
+from application.interfaces import IGenderDetector, ILanguageDetector, IAnredeGenerator, IContactEnricher
+from domain.briefanrede import generate_briefanrede
+from infrastructure.history_repository import InMemoryHistoryRepository
+from infrastructure.name_parser_adapter import DomainNameParser
+from infrastructure.title_repository import TitleRepository
+
+
+class StubGenderDetector(IGenderDetector):
+    def detect(self, contact):
+        return "w" if contact.vorname.endswith("a") else "m"
+
+
+class StubLanguageDetector(ILanguageDetector):
+    def detect(self, contact):
+        return "de"
+
+
+class StubAnredeGenerator(IAnredeGenerator):
+    def generate(self, contact):
+        return generate_briefanrede(contact)
+
+
+def make_service(snapshot_path=None):
+    title_repo = TitleRepository("tests/data/titles.json")
+    title_repo.load()
+    return ContactService(
+        DomainNameParser(title_repo, snapshot_path=snapshot_path),
+        StubGenderDetector(),
+        StubLanguageDetector(),
+        StubAnredeGenerator(),
+        InMemoryHistoryRepository(),
+    )
+
+
+NAMES = [
+    "Herr Dr. Max Mustermann",
+    "Anna Schmidt",
+    "Prof. Dr. von Trapp, Maria",
+    "Mr. William Shakespeare",
+    "Henri von Henrisson-Ford",
+] * 7
+
+
+def test_process_many_matches_process():
+    service = make_service()
+    expected = [service.process(raw) for raw in NAMES]
+    results = list(service.process_many(iter(NAMES), workers=2, chunksize=3))
+    assert (results == expected)
+
+
+def test_process_many_with_title_snapshot(tmp_path):
+    service = make_service(str(tmp_path / "titles.snapshot"))
+    expected = [service.process(raw) for raw in NAMES]
+    assert (list(service.process_many(NAMES, workers=2, chunksize=4)) == expected)
+    assert ((tmp_path / "titles.snapshot").exists())
+
+
+def test_process_many_without_pool():
+    service = make_service()
+    expected = [service.process(raw) for raw in NAMES]
+    assert (list(service.process_many(NAMES, workers=1)) == expected)
+
+
+def test_process_many_unordered():
+    service = make_service()
+    expected = sorted(str(service.process(raw)) for raw in NAMES)
+    results = service.process_many(NAMES, workers=2, chunksize=4, ordered=False)
+    assert (sorted(str(c) for c in results) == expected)
+
+
+def test_process_many_empty_input():
+    service = make_service()
+    assert (list(service.process_many([], workers=2)) == [])
+
+
+class CountingEnricher(IContactEnricher):
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def enrich(self, contact):
+        self.calls += 1
+        return dict(self.result)
+
+
+def make_enriching_service(enricher):
+    service = make_service()
+    service.enricher = enricher
+    service.gender_detector = MagicMock(wraps=service.gender_detector)
+    service.language_detector = MagicMock(wraps=service.language_detector)
+    service.anrede_generator = MagicMock(wraps=service.anrede_generator)
+    return service
+
+
+def test_process_uses_combined_enrichment():
+    enricher = CountingEnricher({"geschlecht": "w", "sprache": "it", "briefanrede": "Gentile Signora Loren"})
+    service = make_enriching_service(enricher)
+    contact = service.process("Sophia Loren")
+    assert ((contact.geschlecht, contact.sprache, contact.briefanrede) == ("w", "it", "Gentile Signora Loren"))
+    assert (enricher.calls == 1)
+    assert (service.gender_detector.detect.call_count == 0)
+    assert (service.language_detector.detect.call_count == 0)
+    assert (service.anrede_generator.generate.call_count == 0)
+
+
+def test_process_combined_enrichment_falls_back_per_field():
+    enricher = CountingEnricher({"sprache": "de"})
+    service = make_enriching_service(enricher)
+    contact = service.process("Max Mustermann")
+    assert ((contact.geschlecht, contact.sprache) == ("m", "de"))
+    assert (contact.briefanrede == "Sehr geehrter Herr Mustermann")
+    assert (service.gender_detector.detect.call_count == 1)
+    assert (service.language_detector.detect.call_count == 0)
+    assert (service.anrede_generator.generate.call_count == 1)
+
+
+def test_process_skips_combined_enrichment_for_single_missing_field():
+    enricher = CountingEnricher({})
+    service = make_enriching_service(enricher)
+    contact = service.process("Herr Max Mustermann")
+    assert (contact.briefanrede == "Sehr geehrter Herr Mustermann")
+    assert (enricher.calls == 0)
+
+
+def test_save_contact_enforces_history_size():
+    service = make_service()
+    service.history_size = 3
+    for raw in NAMES[:5]:
+        service.save_contact(service.process(raw))
+    history = service.get_history()
+    assert (len(history) == 3)
+    assert (history[0].vorname == "Maria")
+    assert (service.history_count() == 3)
+
+
+def test_process_batch_matches_process_many():
+    service = make_service()
+    expected = [c.to_dict() for c in service.process_many(NAMES, workers=1)]
+    batch = service.process_batch(NAMES, workers=1)
+    assert ([row.to_dict() for row in batch] == expected)
+
+
+def test_save_contact_updates_contact_from_history(tmp_path):
+    from infrastructure.history_repository import SQLiteHistoryRepository
+
+    service = make_service()
+    service.history_repo = SQLiteHistoryRepository(str(tmp_path / "history.db"))
+    service.save_contact(service.process("Anna Schmidt"))
+    picked = service.get_history()[0]
+    picked.vorname = "Anne"
+    service.save_contact(picked)
+    assert ([c.vorname for c in service.get_history()] == ["Anne"])
+    service.history_repo.close()
@@ -0,0 +1,49 @@
+import os
+
+from infrastructure.file_watcher import FileWatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def touch(path, content, mtime_ns):
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_debounces_bursts_of_changes(tmp_path):
+    path = tmp_path / "titles.json"
+    touch(path, "{}", 1_000_000_000)
+    calls = []
+    clock = FakeClock()
+    watcher = FileWatcher([str(path)], lambda: calls.append(clock.now), debounce=0.5, clock=clock)
+    assert (not watcher.check())
+
+    touch(path, '{"a": "A"}', 2_000_000_000)
+    assert (not watcher.check())
+    clock.now = 0.3
+    touch(path, '{"a": "A", "b": "B"}', 3_000_000_000)  # weitere Änderung: Ruhezeit neu
+    assert (not watcher.check())
+    clock.now = 0.7
+    assert (not watcher.check())
+    clock.now = 0.8
+    assert (watcher.check())
+    assert (calls == [0.8])
+    clock.now = 5.0
+    assert (not watcher.check())
+
+
+def test_notices_created_and_deleted_files(tmp_path):
+    path = tmp_path / "titles.json.journal"
+    calls = []
+    watcher = FileWatcher([str(path)], lambda: calls.append(1), debounce=0)
+    path.write_text("[]\n", encoding="utf-8")
+    assert (watcher.check())
+    path.unlink()
+    assert (watcher.check())
+    assert (len(calls) == 2)
@@ -0,0 +1,121 @@
+import tracemalloc
+from itertools import cycle, islice
+
+from domain.contact import Contact
+from infrastructure.history_repository import (
+    InMemoryHistoryRepository,
+    RingBufferHistoryRepository,
+    SQLiteHistoryRepository,
+)
+
+
+def _contacts():
+    return [
+        Contact(vorname="Max", nachname="Mustermann", sprache="de"),
+        Contact(vorname="Anna", nachname="Schmidt", geschlecht="w"),
+        Contact(vorname="Maria", nachname="Müller", inaccuracies=["Vorname fehlt"]),
+        Contact(vorname="Hans", nachname="Maier_Test"),
+    ]
+
+
+def test_sqlite_roundtrip_and_order():
+    repo = SQLiteHistoryRepository()
+    contacts = _contacts()
+    repo.save_many(contacts)
+    assert (repo.list() == contacts)
+    assert (repo.list(1, 2) == contacts[1:3])
+    assert (repo.count() == 4)
+    assert (repo.list()[2].needs_review)
+
+
+def test_sqlite_search_prefix_case_insensitive():
+    repo = SQLiteHistoryRepository()
+    repo.save_many(_contacts())
+    assert ([c.nachname for c in repo.search("mu")] == ["Mustermann"])
+    assert ([c.vorname for c in repo.search("MA")] == ["Max", "Maria", "Hans"])
+    # Platzhalter im Präfix werden wörtlich genommen
+    assert ([c.nachname for c in repo.search("Maier_")] == ["Maier_Test"])
+    assert (repo.search("Ma%") == [])
+    assert (len(repo.search("ma", limit=1)) == 1)
+
+
+def test_sqlite_needs_review_listing():
+    repo = SQLiteHistoryRepository()
+    repo.save_many(_contacts())
+    assert ([c.vorname for c in repo.list_needs_review()] == ["Maria"])
+
+
+def test_sqlite_trim_keeps_newest():
+    repo = SQLiteHistoryRepository()
+    repo.save_many(_contacts())
+    repo.trim(2)
+    assert ([c.vorname for c in repo.list()] == ["Maria", "Hans"])
+    repo.trim(5)
+    assert (repo.count() == 2)
+
+
+def test_sqlite_persists_across_instances(tmp_path):
+    path = str(tmp_path / "history.db")
+    repo = SQLiteHistoryRepository(path)
+    repo.save(_contacts()[0])
+    repo.close()
+    reopened = SQLiteHistoryRepository(path)
+    assert (reopened.list() == _contacts()[:1])
+    reopened.close()
+
+
+def test_in_memory_list_search_trim():
+    repo = InMemoryHistoryRepository()
+    repo.save_many(_contacts())
+    assert (repo.list(3) == _contacts()[3:])
+    assert ([c.vorname for c in repo.search("ma")] == ["Max", "Maria", "Hans"])
+    repo.trim(1)
+    assert (repo.list() == _contacts()[3:])
+
+
+def test_ring_buffer_evicts_oldest():
+    repo = RingBufferHistoryRepository(max_size=3)
+    repo.save_many(_contacts())
+    assert ([c.vorname for c in repo.list()] == ["Anna", "Maria", "Hans"])
+    assert ([c.vorname for c in repo.list(1, 1)] == ["Maria"])
+    view = repo.view()
+    assert (len(view) == 3)
+    repo.save(Contact(vorname="Eva"))
+    # Sicht ist live und kopiert nicht
+    assert (view[-1].vorname == "Eva")
+    assert ([c.vorname for c in view[:2]] == ["Maria", "Hans"])
+    repo.trim(1)
+    assert (repo.count() == 1)
+
+
+def test_ring_buffer_memory_flat_under_million_saves():
+    repo = RingBufferHistoryRepository(max_size=100)
+    # Vorab erzeugte Kontakte: gemessen wird nur, was das Repository selbst belegt
+    pool = [Contact(nachname=str(i)) for i in range(1_000)]
+    tracemalloc.start()
+    try:
+        for contact in pool:
+            repo.save(contact)
+        warm, _ = tracemalloc.get_traced_memory()
+        for contact in islice(cycle(pool), 1_000_000):
+            repo.save(contact)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert (repo.count() == 100)
+    assert (after - warm < 64 * 1024)
+
+
+def test_update_by_id_in_all_repositories():
+    for repo in (InMemoryHistoryRepository(), RingBufferHistoryRepository(10), SQLiteHistoryRepository()):
+        repo.save_many(_contacts()[:2])
+        repo.save(_contacts()[2])
+        # Gelesene Kontakte sind (bei SQLite) neue Objekte; Änderung über die id
+        picked = repo.list(1, 1)[0]
+        picked.briefanrede = "Sehr geehrte Frau Schmidt"
+        assert (repo.update(picked) == True)
+        assert ([c.briefanrede for c in repo.list()] == ["", "Sehr geehrte Frau Schmidt", ""])
+        assert (repo.update(Contact(vorname="Neu")) == False)
+        repo.trim(1)
+        assert (repo.update(picked) == False)
+        assert (repo.count() == 1)
@@ -0,0 +1,121 @@
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from application.contact_service import ContactService
+from application.metrics import MetricsRegistry
+from domain.briefanrede import generate_briefanrede
+from infrastructure.history_repository import InMemoryHistoryRepository
+from infrastructure.metrics_exporter import MetricsHTTPServer, TextFileExporter, render_prometheus
+from infrastructure.name_parser_adapter import DomainNameParser
+from infrastructure.openai_service import OpenAIService
+from infrastructure.title_repository import TitleRepository
+
+
+def test_counter_sums_all_threads():
+    registry = MetricsRegistry()
+    counter = registry.counter("x_total", "x")
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(5)
+    assert (counter.value() == 4005)
+
+
+def test_counter_is_shared_by_name():
+    registry = MetricsRegistry()
+    assert (registry.counter("x_total", "x") is registry.counter("x_total", "x"))
+    with pytest.raises(ValueError):
+        registry.gauge("x_total", "x", lambda: 1)
+
+
+def test_failing_gauge_is_skipped():
+    registry = MetricsRegistry()
+    registry.gauge("kaputt", "k", lambda: 1 / 0)
+    registry.gauge("ok", "o", lambda: 2.5)
+    assert (registry.values() == {"ok": 2.5})
+
+
+def test_render_prometheus():
+    registry = MetricsRegistry()
+    registry.counter("a_total", "Zähler A").inc(3)
+    registry.gauge("b", "Wert B", lambda: 0.5)
+    assert (render_prometheus(registry) == (
+        "# HELP a_total Zähler A\n# TYPE a_total counter\na_total 3\n"
+        "# HELP b Wert B\n# TYPE b gauge\nb 0.5\n"
+    ))
+
+
+def test_http_server_serves_metrics():
+    registry = MetricsRegistry()
+    registry.counter("a_total", "A").inc()
+    server = MetricsHTTPServer(registry, port=0).start()
+    try:
+        base = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(base + "/metrics") as response:
+            assert ("a_total 1" in response.read().decode("utf-8"))
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(base + "/")
+    finally:
+        server.stop()
+
+
+def test_text_file_exporter_writes_on_stop(tmp_path):
+    registry = MetricsRegistry()
+    counter = registry.counter("a_total", "A")
+    path = tmp_path / "metrics.prom"
+    exporter = TextFileExporter(registry, str(path), interval=60.0).start()
+    counter.inc(2)
+    exporter.stop()
+    assert ("a_total 2" in path.read_text())
+    assert ([p.name for p in tmp_path.iterdir()] == ["metrics.prom"])
+
+
+class _Stub:
+    def detect(self, contact):
+        return "-"
+
+    def generate(self, contact):
+        return generate_briefanrede(contact)
+
+
+def test_contact_service_counts_contacts():
+    title_repo = TitleRepository("tests/data/titles.json")
+    title_repo.load()
+    registry = MetricsRegistry()
+    stub = _Stub()
+    service = ContactService(
+        DomainNameParser(title_repo), stub, stub, stub, InMemoryHistoryRepository(),
+        metrics=registry,
+    )
+    for raw in ["Anna Schmidt", "Schmidt", "Herr Dr. Max Mustermann"]:
+        service.process(raw)
+    values = registry.values()
+    assert (values["kontaktsplitter_contacts_total"] == 3)
+    assert (values["kontaktsplitter_contacts_needs_review_total"] == 1)
+
+
+def test_openai_usage_and_cost():
+    ai = OpenAIService(api_key="test-key", model="gpt-4o-2024-08-06")
+    ai.record_usage(1000, 100)
+    ai.record_usage(1000, 100, price_factor=0.5)
+    stats = ai.stats()
+    assert ((stats["prompt_tokens"], stats["completion_tokens"], stats["tokens"]) == (2000, 200, 2200))
+    assert (stats["cost_usd"] == pytest.approx(1.5 * (1000 * 2.50 + 100 * 10.00) / 1e6))
+
+
+def test_openai_services_share_registry():
+    registry = MetricsRegistry()
+    for _ in range(2):
+        OpenAIService(api_key="test-key", metrics=registry).record_usage(10, 2)
+    assert (registry.values()["kontaktsplitter_openai_tokens_total"] == 24)
+    assert (OpenAIService(api_key="test-key", model="unbekannt").prices is None)
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+from domain.contact import Contact
+from infrastructure.name_lexicon import (
+    NameLexicon,
+    LexiconGenderDetector,
+    LexiconLanguageDetector,
+    LexiconContactEnricher,
+)
+
+lexicon = NameLexicon()
+
+
+def test_lexicon_lookup_known_name():
+    entry = lexicon.lookup("Fabian")
+    assert (entry.gender == "m")
+    assert (entry.language == "de")
+    assert (entry.gender_confidence > 0.9)
+
+
+def test_lexicon_lookup_is_case_insensitive():
+    assert (lexicon.lookup("  JOSÉ ") == lexicon.lookup("josé"))
+    assert (lexicon.lookup("josé").language == "es")
+
+
+def test_lexicon_lookup_unknown_name():
+    assert (lexicon.lookup("Xyzzy") == None)
+
+
+def test_lexicon_lookup_double_first_name():
+    contact = Contact(vorname="Maria-Pia-Junis", nachname="Muster")
+    assert (lexicon.lookup_contact(contact).gender == "w")
+
+
+def test_gender_detector_uses_lexicon_before_fallback():
+    fallback = MagicMock()
+    detector = LexiconGenderDetector(lexicon, fallback)
+    assert (detector.detect(Contact(vorname="Karla", nachname="Muster")) == "w")
+    assert (fallback.detect.call_count == 0)
+    assert (detector.hits == 1)
+
+
+def test_gender_detector_escalates_ambiguous_names():
+    fallback = MagicMock()
+    fallback.detect.return_value = "w"
+    detector = LexiconGenderDetector(lexicon, fallback)
+    assert (detector.detect(Contact(vorname="Andrea", nachname="Muster")) == "w")
+    assert (detector.detect(Contact(vorname="Xyzzy", nachname="Muster")) == "w")
+    assert (detector.escalations == 2)
+
+
+def test_gender_detector_without_fallback():
+    detector = LexiconGenderDetector(lexicon)
+    assert (detector.detect(Contact(vorname="Xyzzy", nachname="Muster")) == "-")
+
+
+def test_language_detector_escalates_multilingual_names():
+    fallback = MagicMock()
+    fallback.detect.return_value = "it"
+    detector = LexiconLanguageDetector(lexicon, fallback)
+    assert (detector.detect(Contact(vorname="Dante", nachname="Alighieri")) == "it")
+    assert (detector.detect(Contact(vorname="Laura", nachname="Rossi")) == "it")
+    assert (fallback.detect.call_count == 1)
+
+
+def test_contact_enricher_skips_combined_call_for_known_names():
+    fallback = MagicMock()
+    enricher = LexiconContactEnricher(lexicon, fallback)
+    result = enricher.enrich(Contact(vorname="Jürgen", nachname="Klopp"))
+    assert (result == {"geschlecht": "m", "sprache": "de"})
+    assert (fallback.enrich.call_count == 0)
+
+
+def test_contact_enricher_escalates_unknown_names():
+    fallback = MagicMock()
+    fallback.enrich.return_value = {"geschlecht": "m", "sprache": "en", "briefanrede": "Dear Mr Zork"}
+    enricher = LexiconContactEnricher(lexicon, fallback)
+    result = enricher.enrich(Contact(vorname="Xyzzy", nachname="Zork"))
+    assert (result == {"geschlecht": "m", "sprache": "en", "briefanrede": "Dear Mr Zork"})
+    assert (enricher.escalations == 1)
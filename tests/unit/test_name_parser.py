@@ -103,4 +103,28 @@ def test_parse_reversed_name_with_title(mock_title_repository):
     contact.titel = "Dr."
     contact.geschlecht = "m"
     contact.sprache = "de"
-    assert (parse_name_to_contact("Herr Dr. Henrisson-Noll, Benjamin Franklin", mock_title_repository) == contact)
\ No newline at end of file
+    assert (parse_name_to_contact("Herr Dr. Henrisson-Noll, Benjamin Franklin", mock_title_repository) == contact)
+
+def test_parse_salutation_and_title_only(mock_title_repository):
+    contact = Contact()
+    contact.anrede = "Herr"
+    contact.titel = "Dr."
+    contact.geschlecht = "m"
+    contact.sprache = "de"
+    assert (parse_name_to_contact("Herr Dr.", mock_title_repository) == contact)
+
+
+def test_parse_name_two_word_connector(mock_title_repository):
+    contact = Contact(vorname="Jan", nachname="Van Der Berg")
+    assert (parse_name_to_contact("Jan van der Berg", mock_title_repository) == contact)
+
+
+def test_parse_name_longest_connector_wins(mock_title_repository):
+    # "de la" hat Vorrang vor dem früheren Ein-Wort-Partikel "von"
+    contact = Contact(vorname="Anna Von Berg", nachname="De La Cruz")
+    assert (parse_name_to_contact("Anna von Berg de la Cruz", mock_title_repository) == contact)
+
+
+def test_parse_name_earliest_connector_wins(mock_title_repository):
+    contact = Contact(vorname="Anna", nachname="Von Berg Van Dyk")
+    assert (parse_name_to_contact("Anna von Berg van Dyk", mock_title_repository) == contact)
@@ -0,0 +1,75 @@
+import json
+from domain.contact import Contact
+from infrastructure.openai_service import OpenAIService
+
+
+def make_service(monkeypatch, answer):
+    ai = OpenAIService(api_key="test-key")
+    calls = []
+
+    def fake_request(system, user, json_mode=False):
+        calls.append((system, user, json_mode))
+        return answer
+
+    monkeypatch.setattr(ai, "_request_chat_completion", fake_request)
+    return ai, calls
+
+
+def test_enrich_contact_valid_json(monkeypatch):
+    answer = json.dumps({"geschlecht": "w", "sprache": "de", "briefanrede": "Sehr geehrte Frau Schmidt"})
+    ai, calls = make_service(monkeypatch, answer)
+    result = ai.enrich_contact(Contact(vorname="Anna", nachname="Schmidt"))
+    assert (result == {"geschlecht": "w", "sprache": "de", "briefanrede": "Sehr geehrte Frau Schmidt"})
+    assert (len(calls) == 1)
+    assert (calls[0][2] == True)
+    assert ("Vorname: Anna" in calls[0][1])
+
+
+def test_enrich_contact_drops_invalid_fields(monkeypatch):
+    answer = json.dumps({"geschlecht": "x", "sprache": "-", "briefanrede": 42})
+    ai, _ = make_service(monkeypatch, answer)
+    result = ai.enrich_contact(Contact(vorname="Anna", nachname="Schmidt"))
+    assert (result == {"sprache": ""})
+
+
+def test_enrich_contact_invalid_json(monkeypatch):
+    ai, _ = make_service(monkeypatch, "Sehr geehrte Frau Schmidt")
+    assert (ai.enrich_contact(Contact(vorname="Anna", nachname="Schmidt")) == {})
+
+
+def test_detect_gender_maps_answers(monkeypatch):
+    ai, _ = make_service(monkeypatch, "Female")
+    assert (ai.detect_gender("Anna Schmidt") == "w")
+    ai, _ = make_service(monkeypatch, "no idea")
+    assert (ai.detect_gender("Anna Schmidt") == "-")
+
+
+def test_detect_language_maps_answers(monkeypatch):
+    ai, _ = make_service(monkeypatch, "Italian")
+    assert (ai.detect_language("Dante Alighieri") == "it")
+    ai, _ = make_service(monkeypatch, "")
+    assert (ai.detect_language("Dante Alighieri") == "")
+
+
+class _Error(Exception):
+    def __init__(self, headers):
+        super().__init__("fehler")
+        self.response = type("Response", (), {"headers": headers})()
+
+
+def test_retry_wait_full_jitter_and_retry_after():
+    ai = OpenAIService(api_key="test-key", backoff_factor=1.0, max_backoff=4.0)
+    waits = [ai._retry_wait(_Error({}), 5) for _ in range(200)]
+    assert (all(0.0 <= w <= 4.0 for w in waits))
+    assert (len(set(waits)) > 1)
+    assert (ai._retry_wait(_Error({"retry-after": "7"}), 1) >= 7.0)
+    assert (ai._retry_wait(_Error({"retry-after-ms": "1500"}), 1) >= 1.5)
+
+
+def test_open_breaker_uses_local_fallbacks(monkeypatch):
+    ai = OpenAIService(api_key="test-key")
+    monkeypatch.setattr(ai.breaker, "allow", lambda: False)
+    contact = Contact(anrede="Frau", nachname="Schmidt", geschlecht="w", sprache="de")
+    assert (ai.detect_gender("Anna") == "-")
+    assert (ai.generate_briefanrede(contact) == "Sehr geehrte Frau Schmidt")
+    assert (ai.stats()["short_circuits"] == 2)
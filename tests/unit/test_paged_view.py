@@ -0,0 +1,48 @@
+from domain.contact import Contact
+from ui.paged_view import PagedView, row_values
+
+
+def _contacts(n):
+    return [Contact(nachname=f"N{i}", needs_review=(i % 3 == 0)) for i in range(n)]
+
+
+def test_page_returns_only_requested_slice():
+    view = PagedView()
+    for c in _contacts(1000):
+        view.append(c)
+    page = view.page(500, 25)
+    assert (len(page) == 25)
+    assert (page[0].nachname == "N500")
+    assert (len(view) == 1000)
+
+
+def test_filter_needs_review_without_losing_items():
+    view = PagedView()
+    for c in _contacts(30):
+        view.append(c)
+    view.set_filter(True)
+    assert (len(view) == 10)
+    assert (view.total == 30)
+    assert (all(c.needs_review for c in view.page(0, 100)))
+    # neue Einträge werden unter aktivem Filter inkrementell einsortiert
+    assert (view.append(Contact(nachname="X", needs_review=True)))
+    assert (not view.append(Contact(nachname="Y")))
+    assert (len(view) == 11)
+    assert (view.review_count == 11)
+    view.set_filter(False)
+    assert (len(view) == 32)
+
+
+def test_clamp_offset():
+    view = PagedView()
+    for c in _contacts(10):
+        view.append(c)
+    assert (view.clamp_offset(100, 4) == 6)
+    assert (view.clamp_offset(-5, 4) == 0)
+    assert (view.clamp_offset(3, 25) == 0)
+
+
+def test_row_values_column_order():
+    c = Contact(anrede="Herr", vorname="Max", nachname="Mustermann")
+    assert (row_values(c)[:4] == ("Herr", "", "Max", "Mustermann"))
+
@@ -0,0 +1,48 @@
+import unicodedata
+
+from infrastructure.name_parser_adapter import CachingNameParser, DomainNameParser
+from infrastructure.title_repository import TitleRepository
+
+
+def make_parser(tmp_path):
+    title_repo = TitleRepository(str(tmp_path / "titles.json"))
+    title_repo.load()
+    return CachingNameParser(DomainNameParser(title_repo), title_repo, max_size=2), title_repo
+
+
+def test_cache_hits_on_normalized_input(tmp_path):
+    parser, _ = make_parser(tmp_path)
+    composed = "Herr Dr. Thomas Müller"
+    decomposed = unicodedata.normalize("NFD", composed)
+    first = parser.parse(composed)
+    second = parser.parse("  " + decomposed)
+    assert (first == second)
+    assert (parser.stats()["hits"] == 1)
+    assert (parser.stats()["hit_ratio"] == 0.5)
+
+
+def test_cache_returns_independent_copies(tmp_path):
+    parser, _ = make_parser(tmp_path)
+    first = parser.parse("Max")
+    first.briefanrede = "geändert"
+    first.inaccuracies.append("x")
+    second = parser.parse("Max")
+    assert (second.briefanrede == "")
+    assert (second.inaccuracies == [])
+
+
+def test_title_change_invalidates_cache(tmp_path):
+    parser, title_repo = make_parser(tmp_path)
+    assert (parser.parse("Magister Anna Berg").titel == "")
+    title_repo.add("magister", "Mag.")
+    assert (parser.parse("Magister Anna Berg").titel == "Mag.")
+    assert (parser.stats()["hits"] == 0)
+
+
+def test_lru_eviction(tmp_path):
+    parser, _ = make_parser(tmp_path)
+    for raw in ("Anna Berg", "Max Muster", "Anna Berg", "Eva Klein", "Max Muster"):
+        parser.parse(raw)
+    stats = parser.stats()
+    assert (stats["size"] == 2)
+    assert (stats["hits"] == 1)
@@ -0,0 +1,60 @@
+import pytest
+from infrastructure.rate_limiter import RateLimiter, TokenBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_requests_queue_up_behind_each_other():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=60, clock=clock)
+    waits = [limiter.reserve() for _ in range(3)]
+    assert (waits == [0.0, pytest.approx(1.0), pytest.approx(2.0)])
+    clock.now += 10.0
+    assert (limiter.reserve() == 0.0)
+    assert (limiter.stats()["waits"] == 2)
+
+
+def test_token_limit_and_adjust():
+    clock = FakeClock()
+    limiter = RateLimiter(tokens_per_minute=6000, clock=clock)  # 100 Tokens/s
+    assert (limiter.reserve(100) == 0.0)
+    assert (limiter.reserve(200) == pytest.approx(2.0))
+    limiter.adjust(-100)  # Schätzung war zu hoch
+    assert (limiter.reserve(0) == pytest.approx(1.0))
+    limiter.adjust(300)  # Verbrauch war höher als geschätzt
+    assert (limiter.reserve(0) == pytest.approx(4.0))
+
+
+def test_unlimited_never_waits():
+    limiter = RateLimiter()
+    assert (all(limiter.reserve(10_000) == 0.0 for _ in range(100)))
+
+
+def test_sqlite_limit_is_shared_between_instances(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "limits.sqlite3")
+    first = RateLimiter(requests_per_minute=60, path=path, clock=clock)
+    second = RateLimiter(requests_per_minute=60, path=path, clock=clock)
+    other = RateLimiter(requests_per_minute=60, path=path, name="other", clock=clock)
+    assert (first.reserve() == 0.0)
+    assert (second.reserve() == pytest.approx(1.0))
+    assert (first.reserve() == pytest.approx(2.0))
+    assert (other.reserve() == 0.0)
+    for limiter in (first, second, other):
+        limiter.close()
+
+
+def test_token_budget():
+    budget = TokenBudget(100)
+    budget.charge(60)
+    assert ((budget.used, budget.remaining, budget.exhausted) == (60, 40, False))
+    budget.charge(60)
+    assert ((budget.remaining, budget.exhausted) == (0, True))
+    budget.reset()
+    assert (not budget.exhausted)
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+from benchmarks.import_time import BASE_DIR, FORBIDDEN, SCENARIOS, measure
+
+
+def _loaded(code):
+    _, rows = measure(code)
+    return {name.split(".")[0] for name, _, _, _ in rows}
+
+
+def test_cli_batch_path_does_not_import_gui_or_http_stack():
+    loaded = _loaded(SCENARIOS["cli_no_ai"])
+    assert (not loaded & set(FORBIDDEN))
+
+
+def test_ai_service_creates_client_lazily():
+    # Service samt Adaptern aufbauen: openai darf erst beim ersten Request geladen werden
+    loaded = _loaded(SCENARIOS["providers_ai"])
+    assert ("openai" not in loaded)
+
+
+def test_main_module_imports_without_tkinter():
+    loaded = _loaded("import main")
+    assert ("tkinter" not in loaded)
+    assert ("openai" not in loaded)
+
+
+def test_client_created_on_first_access():
+    code = (
+        "import sys; from infrastructure.openai_service import OpenAIService; "
+        "ai = OpenAIService(api_key='x'); assert 'openai' not in sys.modules; "
+        "ai.client; assert 'openai' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, check=True)
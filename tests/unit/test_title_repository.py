@@ -1,3 +1,4 @@
+import json
 from infrastructure.title_repository import TitleRepository
 from unittest.mock import patch
 import domain.constants
@@ -117,3 +118,173 @@ def test_repo_reset_to_default(monkeypatch, tmp_path):
     assert (repo.reset_to_defaults() == None)
     assert (repo.lookup("added key") == None)
 
+
+
+def test_repo_compiled_titles_follow_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    non_existent_file = str(tmp_path / "nonexistent.json")
+
+    repo = TitleRepository(non_existent_file)
+    repo.load()
+    version = repo.version
+    assert (repo.compiled_titles.longest_match(["Dr.", "Max"]) == ("Dr.", 1))
+    assert (repo.compiled_titles.longest_match(["Dipl.-Ing.", "Max"]) == (None, 0))
+
+    assert (repo.add("diplomingenieur", "Dipl.-Ing.") == True)
+    assert (repo.version > version)
+    assert (repo.compiled_titles.longest_match(["Dipl.-Ing.", "Max"]) == ("Dipl.-Ing.", 1))
+    assert (repo.compiled_titles.longest_match(["Dipl.", "Ing.", "Max"]) == ("Dipl.-Ing.", 2))
+
+    assert (repo.delete("diplomingenieur") == True)
+    assert (repo.compiled_titles.longest_match(["Dipl.-Ing.", "Max"]) == (None, 0))
+
+
+def test_repo_compiled_titles_unchanged_without_modification(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    non_existent_file = str(tmp_path / "nonexistent.json")
+
+    repo = TitleRepository(non_existent_file)
+    repo.load()
+    compiled = repo.compiled_titles
+    assert (repo.add("doktor", "Dr.") == False)
+    assert (repo.compiled_titles is compiled)
+
+
+def test_repo_add_many_writes_once(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    repo = TitleRepository(str(tmp_path / "titles.json"))
+    repo.load()
+    version = repo.version
+    with patch.object(TitleRepository, "_save", autospec=True, side_effect=TitleRepository._save) as save:
+        titles = {f"titel{i}": f"T{i}." for i in range(1000)}
+        assert (repo.add_many(titles) == 1000)
+        assert (repo.add_many([("doktor", "Dr.")]) == 0)
+    assert (save.call_count == 1)
+    assert (repo.version == version + 1)
+    reloaded = TitleRepository(repo.file_path)
+    reloaded.load()
+    assert (reloaded.lookup("titel999") == "T999.")
+    assert ([p.name for p in tmp_path.iterdir()] == ["titles.json"])
+
+
+def test_repo_batch_rolls_back_on_error(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    repo = TitleRepository(str(tmp_path / "titles.json"))
+    repo.load()
+    version = repo.version
+    try:
+        with repo.batch():
+            repo.add("professor", "Prof.")
+            repo.add("doktor", "Dr. med.")
+            repo.delete("doktor")
+            raise RuntimeError("Abbruch")
+    except RuntimeError:
+        pass
+    assert (repo.titles == {"doktor": "Dr."})
+    assert (repo.version == version)
+    with open(repo.file_path, encoding="utf-8") as f:
+        assert (json.load(f) == {"doktor": "Dr."})
+
+
+def test_repo_keeps_corrupt_file(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    path = tmp_path / "titles.json"
+    path.write_text('{"professor": "Pr', encoding="utf-8")
+    repo = TitleRepository(str(path))
+    repo.load()
+    assert (repo.get_titles() == ["doktor"])
+    assert ((tmp_path / "titles.json.corrupt").read_text(encoding="utf-8") == '{"professor": "Pr')
+
+
+def test_repo_journal_replays_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    path = str(tmp_path / "titles.json")
+    repo = TitleRepository(path, journal=True)
+    repo.load()
+    repo.add("professor", "Prof.")
+    repo.add_many({"magister": "Mag.", "ingenieur": "Ing."})
+    repo.delete("doktor")
+    repo.close()
+    with open(path, encoding="utf-8") as f:
+        assert (json.load(f) == {"doktor": "Dr."})
+    # Absturz mitten im Schreiben einer Transaktion
+    with open(path + ".journal", "a", encoding="utf-8") as f:
+        f.write('[["add", "bachelor"')
+
+    reloaded = TitleRepository(path, journal=True)
+    reloaded.load()
+    assert (sorted(reloaded.get_titles()) == ["ingenieur", "magister", "professor"])
+
+
+def test_repo_journal_appends_after_torn_line(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    path = str(tmp_path / "titles.json")
+    repo = TitleRepository(path, journal=True)
+    repo.load()
+    repo.add("professor", "Prof.")
+    repo.close()
+    with open(path + ".journal", "a", encoding="utf-8") as f:
+        f.write('[["add", "bachelor"')
+
+    reloaded = TitleRepository(path, journal=True)
+    reloaded.load()
+    reloaded.add("magister", "Mag.")
+    reloaded.close()
+    again = TitleRepository(path, journal=True)
+    again.load()
+    assert (sorted(again.get_titles()) == ["doktor", "magister", "professor"])
+
+    # Ein anderer Schreiber stürzt nach unserem load() ab: neue Zeile beginnen
+    with open(path + ".journal", "a", encoding="utf-8") as f:
+        f.write('[["add", "bachelor"')
+    again.add("ingenieur", "Ing.")
+    again.close()
+    last = TitleRepository(path, journal=True)
+    last.load()
+    assert (sorted(last.get_titles()) == ["doktor", "ingenieur", "magister", "professor"])
+
+
+def test_repo_journal_compaction(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    path = str(tmp_path / "titles.json")
+    repo = TitleRepository(path, journal=True, compact_after=3)
+    repo.load()
+    for i in range(4):
+        repo.add(f"titel{i}", f"T{i}.")
+    repo.wait_for_compaction()
+    with open(path, encoding="utf-8") as f:
+        assert (sorted(json.load(f)) == ["doktor", "titel0", "titel1", "titel2"])
+    repo.compact()
+    repo.close()
+    with open(path, encoding="utf-8") as f:
+        assert (json.load(f) == repo.titles)
+    assert (sorted(p.name for p in tmp_path.iterdir()) == ["titles.json"])
+
+
+def test_repo_reload_picks_up_foreign_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    path = str(tmp_path / "titles.json")
+    repo = TitleRepository(path)
+    repo.load()
+    other = TitleRepository(path)
+    other.load()
+    assert (repo.reload() == False)
+
+    other.add("magister", "Mag.")
+    compiled = repo.compiled_titles
+    version = repo.version
+    assert (repo.reload() == True)
+    assert (repo.version == version + 1)
+    assert (repo.compiled_titles is not compiled)
+    assert (repo.compiled_titles.longest_match(["Mag.", "Anna"]) == ("Mag.", 1))
+
+
+def test_repo_reload_keeps_state_on_invalid_file(monkeypatch, tmp_path):
+    monkeypatch.setattr('infrastructure.title_repository.DEFAULT_TITLES', {"doktor": "Dr."})
+    path = tmp_path / "titles.json"
+    repo = TitleRepository(str(path))
+    repo.load()
+    path.write_text('{"doktor": ', encoding="utf-8")  # Editor schreibt gerade
+    assert (repo.reload() == False)
+    assert (repo.lookup("doktor") == "Dr.")
+    assert (path.read_text(encoding="utf-8") == '{"doktor": ')
@@ -0,0 +1,137 @@
+import os
+import pickle
+import time
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from domain.name_parser import parse_name_to_contact
+from infrastructure.name_parser_adapter import DomainNameParser
+from infrastructure.title_repository import TitleRepository
+from infrastructure.title_snapshot import (
+    MappedTitleTable,
+    ReloadingTitleTable,
+    ensure_snapshot,
+    write_snapshot,
+)
+from providers import Providers
+
+
+def make_repo(tmp_path):
+    repo = TitleRepository(str(tmp_path / "titles.json"))
+    repo.load()
+    repo.add_many({"doktor der medizin": "Dr. med.", "diplomingenieur": "Dipl.-Ing.", "müller-titel": "MT"})
+    return repo
+
+
+def test_snapshot_matches_trie(tmp_path):
+    repo = make_repo(tmp_path)
+    trie = repo.compiled_titles
+    path = str(tmp_path / "titles.snapshot")
+    write_snapshot(path, trie, repo.file_path)
+    table = MappedTitleTable(path)
+    assert (len(table) == len(trie))
+    for key in list(trie.titles()) + ["unbekannt", "DR", ""]:
+        assert (table.lookup(key) == trie.lookup(key))
+    for key in list(trie.keys()) + ["unbekannt", "dr med"]:
+        assert (table.contains(key) == trie.contains(key))
+    for tokens in (["Dr.", "med.", "Max"], ["Dipl.-Ing.", "Anna"], ["Dipl.", "Ing."], ["Prof.", "Dr.", "X"], ["Max"],
+                   ["Dr.", "-", "Hans"], ["Prof.", ".", "Anna"], ["-", "Dr."], ["Dr.", "med", "-", "."]):
+        assert (table.longest_match(tokens) == trie.longest_match(tokens))
+        assert (table.longest_match(tokens, 1) == trie.longest_match(tokens, 1))
+    for raw in ["Herr Dr. - Hans Müller", "Frau Prof. . Anna Schmidt"] + generate_corpus(2000, seed=7):
+        assert (parse_name_to_contact(raw, table) == parse_name_to_contact(raw, trie))
+    table.close()
+
+
+def test_snapshot_pickles_as_path(tmp_path):
+    repo = make_repo(tmp_path)
+    table = ensure_snapshot(repo, str(tmp_path / "titles.snapshot"))
+    data = pickle.dumps(table)
+    assert (len(data) < len(pickle.dumps(repo.compiled_titles)))
+    clone = pickle.loads(data)
+    assert (clone.lookup("doktor der medizin") == "Dr. med.")
+
+
+def test_ensure_snapshot_rewrites_only_on_change(tmp_path):
+    repo = make_repo(tmp_path)
+    path = str(tmp_path / "titles.snapshot")
+    first = ensure_snapshot(repo, path)
+    inode = os.stat(path).st_ino
+    assert (ensure_snapshot(repo, path).digest == first.digest)
+    assert (os.stat(path).st_ino == inode)
+    repo.add("magister", "Mag.")
+    second = ensure_snapshot(repo, path)
+    assert (second.lookup("magister") == "Mag.")
+    assert (first.lookup("magister") is None)  # alter Stand bleibt eingeblendet
+    assert (second.matches_source(repo.file_path))
+
+
+def test_matches_source_checks_mtime_then_hash(tmp_path):
+    repo = make_repo(tmp_path)
+    path = str(tmp_path / "titles.snapshot")
+    table = ensure_snapshot(repo, path)
+    assert (table.matches_source(repo.file_path))
+    os.utime(repo.file_path, ns=(0, 0))  # gleicher Inhalt, andere mtime
+    assert (table.matches_source(repo.file_path))
+    repo.add("magister", "Mag.")
+    assert (not table.matches_source(repo.file_path))
+    assert (not table.matches_source(str(tmp_path / "fehlt.json")))
+
+
+def test_invalid_snapshot_is_rejected_and_rebuilt(tmp_path):
+    repo = make_repo(tmp_path)
+    path = tmp_path / "titles.snapshot"
+    path.write_bytes(b"kein snapshot")
+    with pytest.raises(ValueError):
+        MappedTitleTable(str(path))
+    assert (ensure_snapshot(repo, str(path)).lookup("diplomingenieur") == "Dipl.-Ing.")
+
+
+def test_parse_function_ships_snapshot(tmp_path):
+    repo = make_repo(tmp_path)
+    parser = DomainNameParser(repo, snapshot_path=str(tmp_path / "titles.snapshot"))
+    parse = pickle.loads(pickle.dumps(parser.parse_function()))
+    assert (isinstance(parse.keywords["title_repo"], MappedTitleTable))
+    assert (parse("Herr Doktor der Medizin Max Müller") == parser.parse("Herr Doktor der Medizin Max Müller"))
+
+
+def test_reloading_table_follows_title_changes(tmp_path):
+    repo = make_repo(tmp_path)
+    snapshot = str(tmp_path / "titles.snapshot")
+    ensure_snapshot(repo, snapshot)
+    first = ReloadingTitleTable(repo.file_path, snapshot, watch=False)
+    second = ReloadingTitleTable(repo.file_path, snapshot, watch=False)
+    assert (first.refresh() == False)
+
+    repo.add("magister", "Mag.")
+    assert (first.lookup("magister") is None)
+    assert (first.refresh() == True)
+    assert ((first.lookup("magister"), first.version) == ("Mag.", 2))
+    # Der zweite Worker blendet den bereits erneuerten Snapshot nur noch ein
+    inode = os.stat(snapshot).st_ino
+    assert (second.refresh() == True)
+    assert (second.longest_match(["Mag.", "Anna"]) == ("Mag.", 1))
+    assert (os.stat(snapshot).st_ino == inode)
+
+
+def test_process_many_workers_follow_title_changes(tmp_path):
+    repo = make_repo(tmp_path)
+    providers = Providers(titles_path=repo.file_path, use_ai=False, titles_reload_interval=0.05)
+
+    def names():
+        for _ in range(6):
+            yield "Mag. Anna Schmidt"
+        # Änderung durch einen anderen Prozess, mitten im Lauf
+        repo.add("magister", "Mag.")
+        time.sleep(1.5)
+        for _ in range(6):
+            yield "Mag. Anna Schmidt"
+
+    try:
+        service = providers.contact_service
+        titles = [c.titel for c in service.process_many(names(), workers=2, chunksize=1)]
+    finally:
+        providers.close()
+    assert (titles[0] == "")
+    assert (titles[-4:] == ["Mag."] * 4)
+
@@ -0,0 +1,97 @@
+import pytest
+
+from application.tracing import NULL_TRACER, Tracer
+from infrastructure.trace_sinks import HistogramTraceSink, PrometheusTextFileSink
+from application.contact_service import ContactService
+from domain.briefanrede import generate_briefanrede
+from infrastructure.history_repository import InMemoryHistoryRepository
+from infrastructure.name_parser_adapter import DomainNameParser
+from infrastructure.title_repository import TitleRepository
+
+
+class _Stub:
+    def detect(self, contact):
+        return "de" if contact.vorname else "-"
+
+    def generate(self, contact):
+        return generate_briefanrede(contact)
+
+
+def make_service():
+    title_repo = TitleRepository("tests/data/titles.json")
+    title_repo.load()
+    stub = _Stub()
+    return ContactService(
+        DomainNameParser(title_repo), stub, stub, stub, InMemoryHistoryRepository()
+    )
+
+
+def test_null_tracer_reuses_one_span():
+    assert (NULL_TRACER.enabled is False)
+    assert (NULL_TRACER.span("a") is NULL_TRACER.span("b"))
+    with NULL_TRACER.span("a"):
+        pass
+
+
+def test_tracer_records_spans_into_histogram():
+    histogram = HistogramTraceSink()
+    tracer = Tracer([histogram])
+    for _ in range(3):
+        with tracer.span("schritt"):
+            pass
+    tracer.record("fest", 0.002)
+    summary = histogram.summary()
+    assert (summary["schritt"]["count"] == 3)
+    assert (summary["fest"]["max"] == 0.002)
+    assert (summary["fest"]["p50"] == 0.002)
+    assert ("schritt" in histogram.report())
+
+
+def test_span_is_recorded_on_exception():
+    histogram = HistogramTraceSink()
+    tracer = Tracer([histogram])
+    with pytest.raises(ValueError):
+        with tracer.span("kaputt"):
+            raise ValueError
+    assert (histogram.summary()["kaputt"]["count"] == 1)
+
+
+def test_percentiles_use_bucket_bounds():
+    histogram = HistogramTraceSink(buckets=[0.001, 0.01, 0.1])
+    for seconds in [0.0005] * 90 + [0.05] * 10:
+        histogram.record("x", seconds)
+    summary = histogram.summary()["x"]
+    assert ((summary["p50"], summary["p95"], summary["max"]) == (0.001, 0.05, 0.05))
+
+
+def test_prometheus_sink_writes_histogram(tmp_path):
+    path = tmp_path / "trace.prom"
+    sink = PrometheusTextFileSink(str(path), buckets=[0.001, 0.01])
+    sink.record("process.parse", 0.005)
+    sink.record("process.parse", 0.5)
+    sink.flush()
+    text = path.read_text()
+    assert ('kontaktsplitter_span_seconds_bucket{span="process.parse",le="0.001"} 0' in text)
+    assert ('kontaktsplitter_span_seconds_bucket{span="process.parse",le="0.01"} 1' in text)
+    assert ('kontaktsplitter_span_seconds_bucket{span="process.parse",le="+Inf"} 2' in text)
+    assert ('kontaktsplitter_span_seconds_count{span="process.parse"} 2' in text)
+
+
+def test_contact_service_records_pipeline_spans():
+    histogram = HistogramTraceSink()
+    service = make_service()
+    service.tracer = Tracer([histogram])
+    service.process("Anna Schmidt")
+    summary = histogram.summary()
+    assert (set(summary) == {
+        "process", "process.parse", "process.gender", "process.language",
+        "process.briefanrede", "process.validate",
+    })
+    assert (summary["process"]["total"] >= summary["process.parse"]["total"])
+
+
+def test_disabled_tracing_gives_same_result():
+    service = make_service()
+    expected = service.process("Prof. Dr. von Trapp, Maria")
+    service.tracer = Tracer([HistogramTraceSink()])
+    assert (service.process("Prof. Dr. von Trapp, Maria") == expected)
@@ -1,15 +1,22 @@
+import copy
 import re
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter.ttk import Combobox, Style
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 from domain.contact import Contact
+from ui.background import BackgroundRunner
+from ui.bulk_import import BulkImportWindow
+from ui.paged_view import row_values
 from ui.title_manager import TitleManagerDialog
 from application.interfaces import IContactService, ITitleRepository
 
 
 class KontaktsplitterApp:
+    # Höchstzahl angezeigter Einträge im Kontaktbuch (neueste Seite bzw. Treffer)
+    HISTORY_LIMIT = 500
+
     def __init__(
         self,
         root: tk.Tk,
@@ -21,8 +28,16 @@ class KontaktsplitterApp:
         self.title_repo = title_repo
         self.current_contact: Contact = None
         self._item_to_contact: Dict[str, Contact] = {}
+        # (Zeilenwerte, n-tes Vorkommen) → Treeview-Item; stabil auch für
+        # Repositories, die bei jedem Lesen neue Contact-Objekte liefern
+        self._key_to_item: Dict[tuple, str] = {}
+        # Zuletzt gewählte Sortierung (Spalte, absteigend); gilt auch für neue Zeilen
+        self._sort_state: Optional[Tuple[str, bool]] = None
         self.field_entries: Dict[str, ttk.Entry] = {}
         self.unsaved_changes = False
+        # Parsing/KI laufen im Hintergrund, Ergebnisse per root.after abgeholt
+        self.runner = BackgroundRunner()
+        self._poll_job = None
 
         # Styles für Fehler-Highlight
         self.style = Style(self.root)
@@ -37,6 +52,9 @@ class KontaktsplitterApp:
 
     def _build_menu(self):
         menubar = tk.Menu(self.root)
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Massenimport…", command=self._open_bulk_import)
+        menubar.add_cascade(label="Datei", menu=file_menu)
         tools = tk.Menu(menubar, tearoff=0)
         tools.add_command(label="Titel verwalten…", command=self._open_title_manager)
         menubar.add_cascade(label="Extras", menu=tools)
@@ -93,12 +111,16 @@ class KontaktsplitterApp:
         )
         self.regen_button.grid(row=0, column=1, padx=5)
 
-        # Statuszeile
+        # Statuszeile mit Fortschrittsanzeige (nur während Hintergrundarbeit)
+        status_frm = ttk.Frame(self.root, relief="sunken")
+        status_frm.grid(row=1, column=0, columnspan=2, sticky="we")
+        status_frm.columnconfigure(0, weight=1)
         self.status_var = tk.StringVar(value="")
-        status = ttk.Label(
-            self.root, textvariable=self.status_var, relief="sunken", anchor="w"
-        )
-        status.grid(row=1, column=0, columnspan=2, sticky="we")
+        status = ttk.Label(status_frm, textvariable=self.status_var, anchor="w")
+        status.grid(row=0, column=0, sticky="we")
+        self.progress = ttk.Progressbar(status_frm, mode="indeterminate", length=120)
+        self.progress.grid(row=0, column=1, padx=5)
+        self.progress.grid_remove()
 
         # Kontaktbuch
         hist_frm = ttk.LabelFrame(self.root, text="Kontaktbuch", padding=5)
@@ -115,19 +137,27 @@ class KontaktsplitterApp:
             "sprache",
             "briefanrede",
         )
+        # Suche (Vor-/Nachnamen-Präfix) läuft im Repository, nicht in der Tabelle
+        self.search_var = tk.StringVar()
+        ttk.Label(hist_frm, text="Suche:").grid(row=0, column=0, sticky="w")
+        ttk.Entry(hist_frm, textvariable=self.search_var).grid(
+            row=0, column=0, sticky="we", padx=(50, 0), pady=(0, 5)
+        )
+        self.search_var.trace_add("write", lambda *args: self._refresh_history())
+
         self.tree = ttk.Treeview(hist_frm, columns=cols, show="headings")
         for c in cols:
             self.tree.heading(
                 c, text=c.capitalize(), command=lambda _c=c: self._sort_by(_c, False)
             )
             self.tree.column(c, width=100, anchor="center")
-        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.tree.grid(row=1, column=0, sticky="nsew")
         vsb = ttk.Scrollbar(hist_frm, orient="vertical", command=self.tree.yview)
-        vsb.grid(row=0, column=1, sticky="ns")
+        vsb.grid(row=1, column=1, sticky="ns")
         self.tree.configure(yscrollcommand=vsb.set)
         self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
         hist_frm.columnconfigure(0, weight=1)
-        hist_frm.rowconfigure(0, weight=1)
+        hist_frm.rowconfigure(1, weight=1)
 
     def _bind_field_traces(self):
         for var in self.field_vars.values():
@@ -164,17 +194,22 @@ class KontaktsplitterApp:
         if not self._validate_raw(raw):
             return
 
-        # Busy
+        # Busy; ein erneutes Parsen ersetzt einen noch laufenden Auftrag
         self._set_busy(True, "Parsen…")
-        try:
-            contact = self.service.process(raw)
-            self.current_contact = contact
-            self._populate_fields(contact)
-            self._set_buttons_state(parsed=True)
-        except Exception as e:
-            messagebox.showerror("Fehler beim Parsen", str(e))
-        finally:
-            self._set_busy(False)
+        self.runner.submit(
+            "contact",
+            self.service.process,
+            raw,
+            on_done=self._on_parse_done,
+            on_error=lambda e: self._on_background_error("Fehler beim Parsen", e),
+        )
+        self._schedule_poll()
+
+    def _on_parse_done(self, contact: Contact):
+        self._set_busy(False)
+        self.current_contact = contact
+        self._populate_fields(contact)
+        self._set_buttons_state(parsed=True)
 
     def _populate_fields(self, contact: Contact):
         for f, var in self.field_vars.items():
@@ -206,25 +241,74 @@ class KontaktsplitterApp:
         # Übernehmen
         for f, var in self.field_vars.items():
             setattr(self.current_contact, f, var.get().strip())
-        # Busy
+        # Busy; der Worker bekommt eine Kopie, das Ergebnis wird im GUI-Thread übernommen
+        target = self.current_contact
+        work = copy.deepcopy(target)
         self._set_busy(True, "Erzeuge Anrede…")
+        self.runner.submit(
+            "contact",
+            self._regenerate,
+            work,
+            on_done=lambda anrede: self._on_regenerate_done(target, anrede),
+            on_error=lambda e: self._on_background_error("Fehler bei Anrede", e),
+        )
+        self._schedule_poll()
+
+    def _regenerate(self, contact: Contact) -> str:
+        self.service.regenerate_briefanrede(contact)
+        return contact.briefanrede
+
+    def _on_regenerate_done(self, contact: Contact, anrede: str):
+        self._set_busy(False)
+        contact.briefanrede = anrede
+        if contact is self.current_contact:
+            self.field_vars["briefanrede"].set(anrede)
+        # Kontakt aus dem Kontaktbuch: neue Anrede auch dort speichern
         try:
-            self.service.regenerate_briefanrede(self.current_contact)
-            self.field_vars["briefanrede"].set(self.current_contact.briefanrede)
-            self._refresh_history()
+            self.service.update_contact(contact)
         except Exception as e:
-            messagebox.showerror("Fehler bei Anrede", str(e))
-        finally:
+            messagebox.showerror("Fehler beim Speichern", str(e))
+        self._refresh_history()
+
+    def _on_background_error(self, title: str, error: BaseException):
+        self._set_busy(False)
+        messagebox.showerror(title, str(error))
+
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.root.after(50, self._poll_background)
+
+    def _poll_background(self):
+        self._poll_job = None
+        self.runner.poll()
+        if self.runner.is_busy():
+            self._schedule_poll()
+
+    def _cancel_background(self):
+        if self.runner.is_busy("contact"):
+            self.runner.cancel("contact")
             self._set_busy(False)
 
+    def close(self):
+        if self._poll_job is not None:
+            self.root.after_cancel(self._poll_job)
+            self._poll_job = None
+        self.runner.shutdown()
+
     def _set_busy(self, busy: bool, msg: str = ""):
+        # "Parsen" bleibt aktiv: erneutes Parsen verwirft den laufenden Auftrag
         state = "disabled" if busy else "normal"
-        self.parse_button.config(state=state)
         self.save_button.config(state=state if not busy else "disabled")
         self.regen_button.config(
             state=state if not busy and self.current_contact else "disabled"
         )
         self.status_var.set(msg if busy else "")
+        if busy:
+            self.progress.grid()
+            self.progress.start(10)
+        else:
+            self.progress.stop()
+            self.progress.grid_remove()
 
     def _set_buttons_state(self, parsed: bool):
         if parsed:
@@ -234,35 +318,51 @@ class KontaktsplitterApp:
             self.save_button.config(state="disabled")
             self.regen_button.config(state="disabled")
 
+    def _load_history(self) -> List[Contact]:
+        prefix = self.search_var.get().strip()
+        if prefix:
+            return self.service.search_history(prefix, limit=self.HISTORY_LIMIT)
+        offset = max(0, self.service.history_count() - self.HISTORY_LIMIT)
+        return self.service.get_history(offset, self.HISTORY_LIMIT)
+
     def _refresh_history(self):
-        self.tree.delete(*self.tree.get_children())
-        self._item_to_contact.clear()
-        for c in self.service.get_history():
-            vals = tuple(
-                getattr(c, col)
-                for col in (
-                    "anrede",
-                    "titel",
-                    "vorname",
-                    "nachname",
-                    "geschlecht",
-                    "sprache",
-                    "briefanrede",
-                )
-            )
-            iid = self.tree.insert("", "end", values=vals)
+        # Inkrementell abgleichen statt alle Zeilen neu aufzubauen:
+        # weggefallene Zeilen löschen, neue an ihrer Position einfügen
+        keyed = []
+        seen: Dict[tuple, int] = {}
+        for c in self._load_history():
+            vals = row_values(c)
+            n = seen.get(vals, 0)
+            seen[vals] = n + 1
+            keyed.append(((vals, n), c))
+        wanted = {key for key, _ in keyed}
+        for key in [k for k in self._key_to_item if k not in wanted]:
+            iid = self._key_to_item.pop(key)
+            self.tree.delete(iid)
+            del self._item_to_contact[iid]
+        inserted = False
+        for index, (key, c) in enumerate(keyed):
+            iid = self._key_to_item.get(key)
+            if iid is None:
+                iid = self.tree.insert("", index, values=key[0])
+                self._key_to_item[key] = iid
+                inserted = True
             self._item_to_contact[iid] = c
+        if inserted and self._sort_state is not None:
+            self._sort_by(*self._sort_state)
 
     def _on_tree_select(self, event):
         sel = self.tree.selection()
         if not sel:
             return
         c = self._item_to_contact[sel[0]]
+        self._cancel_background()
         self.current_contact = c
         self._populate_fields(c)
         self._set_buttons_state(parsed=True)
 
     def _sort_by(self, col: str, descending: bool):
+        self._sort_state = (col, descending)
         data = [(self.tree.set(k, col), k) for k in self.tree.get_children("")]
         try:
             data.sort(key=lambda t: t[0].lower(), reverse=descending)
@@ -272,6 +372,9 @@ class KontaktsplitterApp:
             self.tree.move(k, "", idx)
         self.tree.heading(col, command=lambda: self._sort_by(col, not descending))
 
+    def _open_bulk_import(self):
+        BulkImportWindow(self.root, self.service, on_saved=self._refresh_history)
+
     def _open_title_manager(self):
         dialog = TitleManagerDialog(self.root, self.title_repo)
         self.root.wait_window(dialog.top)
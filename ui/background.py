@@ -0,0 +1,146 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class BackgroundRunner:
+    """
+    Führt langsame Aufrufe (Parsing + KI-Anreicherung) in Worker-Threads aus.
+
+    Ergebnisse landen in einer Queue und werden erst durch poll() – im
+    GUI-Thread, z. B. per root.after – an die Callbacks ausgeliefert; die
+    Callbacks dürfen also Widgets anfassen. Pro Kanal (`key`) zählt nur der
+    jeweils letzte Auftrag: ältere werden abgebrochen, falls sie noch nicht
+    laufen, sonst wird ihr Ergebnis verworfen. submit_stream() liefert die
+    Elemente eines Iterators einzeln aus (z. B. Massenimport).
+
+    Enthält bewusst keinen Tk-Code und ist damit ohne Display testbar.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="kontaktsplitter"
+        )
+        # (key, Auftrags-ID, Art, Wert) mit Art "item" | "done" | "error"
+        self._results: "queue.Queue[Tuple[str, int, str, Any]]" = queue.Queue()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # key → (Auftrags-ID, Future, on_done, on_error, on_item)
+        self._current: Dict[
+            str, Tuple[int, Future, Callable, Optional[Callable], Optional[Callable]]
+        ] = {}
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_done: Callable[[Any], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> int:
+        """Startet fn(*args) im Hintergrund und ersetzt den laufenden Auftrag zu `key`."""
+
+        def run(request_id: int):
+            try:
+                self._results.put((key, request_id, "done", fn(*args)))
+            except BaseException as e:  # an den GUI-Thread weiterreichen
+                self._results.put((key, request_id, "error", e))
+
+        return self._start(key, run, on_done, on_error, None)
+
+    def submit_stream(
+        self,
+        key: str,
+        fn: Callable[..., Iterable[Any]],
+        *args: Any,
+        on_item: Callable[[Any], None],
+        on_done: Callable[[None], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> int:
+        """
+        Iteriert fn(*args) im Hintergrund; jedes Element geht per poll() an
+        on_item, zum Schluss wird on_done(None) gerufen. Wird der Auftrag
+        ersetzt oder abgebrochen, endet die Iteration beim nächsten Element.
+        """
+
+        def run(request_id: int):
+            try:
+                for item in fn(*args):
+                    if not self._is_current(key, request_id):
+                        return
+                    self._results.put((key, request_id, "item", item))
+                self._results.put((key, request_id, "done", None))
+            except BaseException as e:
+                self._results.put((key, request_id, "error", e))
+
+        return self._start(key, run, on_done, on_error, on_item)
+
+    def _start(self, key, run, on_done, on_error, on_item) -> int:
+        with self._lock:
+            self._cancel_locked(key)
+            request_id = next(self._ids)
+            future = self._executor.submit(run, request_id)
+            self._current[key] = (request_id, future, on_done, on_error, on_item)
+        return request_id
+
+    def _is_current(self, key: str, request_id: int) -> bool:
+        with self._lock:
+            entry = self._current.get(key)
+            return entry is not None and entry[0] == request_id
+
+    def cancel(self, key: str) -> None:
+        """Verwirft den aktuellen Auftrag zu `key` (falls vorhanden)."""
+        with self._lock:
+            self._cancel_locked(key)
+
+    def _cancel_locked(self, key: str) -> None:
+        entry = self._current.pop(key, None)
+        if entry is not None:
+            # Läuft der Auftrag schon, greift cancel() nicht; das Ergebnis
+            # wird dann in poll() anhand der ID verworfen.
+            entry[1].cancel()
+
+    def is_busy(self, key: Optional[str] = None) -> bool:
+        with self._lock:
+            if key is None:
+                return bool(self._current)
+            return key in self._current
+
+    def poll(self, max_items: Optional[int] = None) -> int:
+        """
+        Liefert fertige Ergebnisse an ihre Callbacks aus (im aufrufenden Thread).
+        :param max_items: Obergrenze pro Aufruf, damit die GUI bei großen
+            Streams reaktionsfähig bleibt (None = alles Vorhandene)
+        Rückgabe: Anzahl ausgelieferter (nicht veralteter) Ergebnisse.
+        """
+        delivered = 0
+        while max_items is None or delivered < max_items:
+            try:
+                key, request_id, kind, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                entry = self._current.get(key)
+                if entry is None or entry[0] != request_id:
+                    continue  # veraltet
+                if kind != "item":
+                    del self._current[key]
+            _, _, on_done, on_error, on_item = entry
+            delivered += 1
+            if kind == "item":
+                on_item(value)
+            elif kind == "done":
+                on_done(value)
+            elif on_error is not None:
+                on_error(value)
+            else:
+                raise value
+        return delivered
+
+    def shutdown(self) -> None:
+        """Beendet die Worker, ohne auf laufende KI-Aufrufe zu warten."""
+        with self._lock:
+            self._current.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
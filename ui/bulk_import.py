@@ -0,0 +1,250 @@
+import csv
+import os
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from typing import Callable, Iterator, List, Optional
+
+from application.interfaces import IContactService
+from domain.contact import Contact
+from ui.background import BackgroundRunner
+from ui.paged_view import COLUMNS, PagedView, row_values
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    """
+    Liest Namen zeilenweise (wird im Worker-Thread iteriert).
+    CSV: erste Spalte, Kopfzeile wird übersprungen.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if row and row[0].strip():
+                    yield row[0]
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.rstrip("\r\n")
+
+
+class BulkImportWindow:
+    """
+    Massenimport: Namen aus Datei oder Zwischenablage werden im Hintergrund
+    verarbeitet und laufend in eine virtualisierte Tabelle übernommen.
+    Die Tabelle besitzt nur so viele Zeilen wie sichtbar sind; beim Blättern
+    werden lediglich deren Werte ausgetauscht.
+    """
+
+    PAGE_SIZE = 25
+    POLL_MS = 50
+    ITEMS_PER_POLL = 500
+
+    def __init__(
+        self,
+        parent: tk.Tk,
+        contact_service: IContactService,
+        on_saved: Optional[Callable[[], None]] = None,
+    ):
+        """
+        :param on_saved: wird nach "Ins Kontaktbuch" aufgerufen (z. B. Tabelle neu laden)
+        """
+        self.service = contact_service
+        self.on_saved = on_saved
+        self.view = PagedView()
+        self.runner = BackgroundRunner(max_workers=1)
+        self.offset = 0
+        self._poll_job = None
+        self._rows: List[str] = []
+
+        self.win = tk.Toplevel(parent)
+        self.top = self.win  # für wait_window()
+        self.win.title("Massenimport")
+        self.win.geometry("900x600")
+        self.win.protocol("WM_DELETE_WINDOW", self._close)
+
+        self._build_ui()
+
+    def _build_ui(self):
+        # Eingabe: Datei oder eingefügter Text
+        input_frm = ttk.LabelFrame(self.win, text="Eingabe (ein Name pro Zeile)", padding=5)
+        input_frm.pack(fill=tk.X, padx=5, pady=5)
+        self.text = tk.Text(input_frm, height=6)
+        self.text.pack(fill=tk.X)
+
+        btn_frm = ttk.Frame(self.win)
+        btn_frm.pack(fill=tk.X, padx=5)
+        ttk.Button(btn_frm, text="Datei öffnen…", command=self._open_file).pack(side=tk.LEFT)
+        self.start_button = ttk.Button(btn_frm, text="Verarbeiten", command=self._start_text)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        self.stop_button = ttk.Button(
+            btn_frm, text="Abbrechen", command=self._stop, state="disabled"
+        )
+        self.stop_button.pack(side=tk.LEFT)
+        self.save_button = ttk.Button(
+            btn_frm, text="Ins Kontaktbuch", command=self._save_all, state="disabled"
+        )
+        self.save_button.pack(side=tk.LEFT, padx=5)
+        self.review_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            btn_frm,
+            text="Nur Prüfbedarf",
+            variable=self.review_var,
+            command=self._on_filter_change,
+        ).pack(side=tk.RIGHT)
+
+        # Virtualisierte Tabelle mit eigener Scrollbar
+        table_frm = ttk.Frame(self.win)
+        table_frm.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.tree = ttk.Treeview(
+            table_frm, columns=COLUMNS, show="headings", height=self.PAGE_SIZE
+        )
+        for c in COLUMNS:
+            self.tree.heading(c, text=c.capitalize())
+            self.tree.column(c, width=110, anchor="center")
+        self.tree.tag_configure("review", background="IndianRed1")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb = ttk.Scrollbar(table_frm, orient="vertical", command=self._on_scrollbar)
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        table_frm.columnconfigure(0, weight=1)
+        table_frm.rowconfigure(0, weight=1)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_to(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_to(self.offset + 3))
+
+        # Statuszeile
+        status_frm = ttk.Frame(self.win, relief="sunken")
+        status_frm.pack(fill=tk.X)
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(status_frm, textvariable=self.status_var, anchor="w").pack(
+            side=tk.LEFT, fill=tk.X, expand=True
+        )
+        self.progress = ttk.Progressbar(status_frm, mode="indeterminate", length=120)
+        self.progress.pack(side=tk.RIGHT, padx=5)
+
+        self._render()
+
+    # --- Verarbeitung -------------------------------------------------
+
+    def _open_file(self):
+        path = filedialog.askopenfilename(
+            parent=self.win,
+            filetypes=[("Text/CSV", "*.txt *.csv"), ("Alle Dateien", "*.*")],
+        )
+        if path:
+            self._start(_read_lines(path))
+
+    def _start_text(self):
+        lines = [l for l in self.text.get("1.0", tk.END).splitlines() if l.strip()]
+        if not lines:
+            messagebox.showwarning("Eingabe fehlt", "Bitte Namen eingeben.", parent=self.win)
+            return
+        self._start(iter(lines))
+
+    def _start(self, names: Iterator[str]):
+        self.view.clear()
+        self.offset = 0
+        self._set_running(True)
+        self.runner.submit_stream(
+            "bulk",
+            self._process,
+            names,
+            on_item=self.view.append,
+            on_done=lambda _: self._set_running(False),
+            on_error=self._on_error,
+        )
+        self._schedule_poll()
+
+    def _process(self, names: Iterator[str]) -> Iterator[Contact]:
+        return self.service.process_many(names, workers=1)
+
+    def _stop(self):
+        self.runner.cancel("bulk")
+        self._set_running(False)
+
+    def _on_error(self, error: BaseException):
+        self._set_running(False)
+        messagebox.showerror("Fehler beim Import", str(error), parent=self.win)
+
+    def _save_all(self):
+        try:
+            self.service.save_contacts(self.view.contacts())
+        except Exception as e:
+            messagebox.showerror("Fehler beim Speichern", str(e), parent=self.win)
+            return
+        self.save_button.config(state="disabled")
+        if self.on_saved is not None:
+            self.on_saved()
+
+    def _set_running(self, running: bool):
+        self.start_button.config(state="disabled" if running else "normal")
+        self.stop_button.config(state="normal" if running else "disabled")
+        self.save_button.config(
+            state="normal" if not running and self.view.total else "disabled"
+        )
+        if running:
+            self.progress.start(10)
+        else:
+            self.progress.stop()
+        self._render()
+
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.win.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        if self.runner.poll(max_items=self.ITEMS_PER_POLL):
+            self._render()
+        if self.runner.is_busy():
+            self._schedule_poll()
+
+    # --- Virtualisierte Anzeige ---------------------------------------
+
+    def _on_filter_change(self):
+        self.view.set_filter(self.review_var.get())
+        self.offset = 0
+        self._render()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self.view)))
+        elif args[0] == "scroll":
+            step = self.PAGE_SIZE if args[2] == "pages" else 1
+            self._scroll_to(self.offset + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        self._scroll_to(self.offset - int(event.delta / 120) * 3)
+
+    def _scroll_to(self, offset: int):
+        offset = self.view.clamp_offset(offset, self.PAGE_SIZE)
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self):
+        """Überträgt nur die sichtbare Seite in die (fest dimensionierte) Tabelle."""
+        page = self.view.page(self.offset, self.PAGE_SIZE)
+        while len(self._rows) < len(page):
+            self._rows.append(self.tree.insert("", "end"))
+        for iid, contact in zip(self._rows, page):
+            tags = ("review",) if contact.needs_review else ()
+            self.tree.item(iid, values=row_values(contact), tags=tags)
+        while len(self._rows) > len(page):
+            self.tree.delete(self._rows.pop())
+
+        total = len(self.view)
+        if total:
+            self.vsb.set(self.offset / total, min(1.0, (self.offset + self.PAGE_SIZE) / total))
+        else:
+            self.vsb.set(0.0, 1.0)
+        self.status_var.set(
+            f"{self.view.total} verarbeitet, {self.view.review_count} mit Prüfbedarf"
+        )
+
+    def _close(self):
+        if self._poll_job is not None:
+            self.win.after_cancel(self._poll_job)
+            self._poll_job = None
+        self.runner.shutdown()
+        self.win.destroy()
@@ -0,0 +1,82 @@
+from typing import List, Sequence, Tuple
+
+from domain.contact import Contact
+
+COLUMNS: Tuple[str, ...] = (
+    "anrede",
+    "titel",
+    "vorname",
+    "nachname",
+    "geschlecht",
+    "sprache",
+    "briefanrede",
+)
+
+
+def row_values(contact: Contact, columns: Sequence[str] = COLUMNS) -> Tuple[str, ...]:
+    return tuple(getattr(contact, col) for col in columns)
+
+
+class PagedView:
+    """
+    Datenmodell hinter der virtualisierten Ergebnistabelle.
+
+    Hält alle Kontakte, aber nur eine Indexliste der aktuell sichtbaren
+    (gefilterten) Einträge; die Tabelle fragt je Bildlauf nur die gerade
+    sichtbare Seite ab. Neue Kontakte werden inkrementell einsortiert,
+    ein Filterwechsel baut nur die Indexliste neu auf.
+    """
+
+    def __init__(self, needs_review_only: bool = False):
+        self._items: List[Contact] = []
+        self._visible: List[int] = []
+        self._review = 0
+        self.needs_review_only = needs_review_only
+
+    def _matches(self, contact: Contact) -> bool:
+        return contact.needs_review or not self.needs_review_only
+
+    def append(self, contact: Contact) -> bool:
+        """Fügt einen Kontakt an; True, wenn er unter dem Filter sichtbar ist."""
+        self._items.append(contact)
+        self._review += contact.needs_review
+        if self._matches(contact):
+            self._visible.append(len(self._items) - 1)
+            return True
+        return False
+
+    def set_filter(self, needs_review_only: bool) -> None:
+        if needs_review_only == self.needs_review_only:
+            return
+        self.needs_review_only = needs_review_only
+        self._visible = [i for i, c in enumerate(self._items) if self._matches(c)]
+
+    def page(self, offset: int, limit: int) -> List[Contact]:
+        """Sichtbare Kontakte [offset, offset+limit) unter dem aktuellen Filter."""
+        return [self._items[i] for i in self._visible[offset : offset + limit]]
+
+    def contacts(self) -> List[Contact]:
+        """Alle Kontakte in Einfügereihenfolge (ungefiltert)."""
+        return list(self._items)
+
+    def clamp_offset(self, offset: int, limit: int) -> int:
+        """Begrenzt einen Bildlauf-Offset auf den gültigen Bereich."""
+        return max(0, min(offset, len(self._visible) - limit))
+
+    @property
+    def total(self) -> int:
+        """Anzahl aller Kontakte (ungefiltert)."""
+        return len(self._items)
+
+    @property
+    def review_count(self) -> int:
+        """Anzahl der Kontakte mit Prüfbedarf."""
+        return self._review
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._visible.clear()
+        self._review = 0
+
+    def __len__(self) -> int:
+        return len(self._visible)